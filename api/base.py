@@ -1,5 +1,6 @@
+import hashlib
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Sequence
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -7,6 +8,9 @@ from urllib3.util.retry import Retry
 
 from utils.rate_limit import RateLimiter
 
+if TYPE_CHECKING:
+    from api.decoding import ProcessPoolDecoder
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +21,13 @@ class BaseClient:
         self.session = requests.Session()
         self._configure_retries()
         self.rate_limiter = rate_limiter
+        # (endpoint, filter, page) -> SHA-256 of that page's response body,
+        # for the pages fetched since the last ``reset_page_hashes``.
+        self.page_hashes: Dict[Hashable, str] = {}
+        # Set when a page (or page count) of this pass could not be fetched.
+        self.pages_failed = False
+        # Set to a ProcessPoolDecoder to decode list pages off-thread.
+        self.decoder: Optional["ProcessPoolDecoder"] = None
 
     def _configure_retries(self):
         """Configure automatic retries for the session."""
@@ -45,3 +56,49 @@ class BaseClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed: {e}")
             raise
+
+    def decode_json(
+        self,
+        response: requests.Response,
+        list_key: str,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Parse a list page, in the decoder's process pool when one is set
+        (records then keep only ``fields``). In-thread pages stay whole, so
+        debug dumps and the raw-data views see every field."""
+        if self.decoder is None:
+            return response.json()
+        return self.decoder.decode(response.content, list_key, fields)
+
+    def reset_page_hashes(self) -> None:
+        """Start a new fetch pass: forget earlier pages and failures."""
+        self.page_hashes = {}
+        self.pages_failed = False
+
+    def record_page(self, page_key: Hashable, body: bytes) -> None:
+        """Remember the content hash of one fetched page."""
+        self.page_hashes[page_key] = hashlib.sha256(body).hexdigest()
+
+    def record_page_failure(self, page_key: Optional[Hashable] = None) -> None:
+        """Mark this pass incomplete (dropping ``page_key``'s hash, if any)."""
+        if page_key is not None:
+            self.page_hashes.pop(page_key, None)
+        self.pages_failed = True
+
+    def content_hash(self) -> str:
+        """Stable hash over every page fetched in this pass.
+
+        Page hashes are combined in key order, so the result does not depend
+        on the order parallel page requests complete in. Empty when nothing
+        was fetched or any page of the pass failed (partial data must never
+        look unchanged).
+        """
+        if self.pages_failed or not self.page_hashes:
+            return ""
+        digest = hashlib.sha256()
+        for page_key, page_hash in sorted(
+            self.page_hashes.items(), key=lambda item: repr(item[0])
+        ):
+            digest.update(repr(page_key).encode())
+            digest.update(page_hash.encode())
+        return digest.hexdigest()
@@ -1,10 +1,11 @@
 import math
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence
 
 from requests.auth import HTTPBasicAuth
 
 from api.base import BaseClient
+from api.decoding import HUNTRESS_AGENT_FIELDS, SYNCRO_ASSET_FIELDS
 from const import (
     HUNTRESS_API_URL,
     HUNTRESS_ORGANIZATIONS_URL,
@@ -27,8 +28,18 @@ class SyncroClient(BaseClient):
         self.api_key = api_key
         self.base_url = SYNCRO_BASE_URL_TEMPLATE.format(subdomain=subdomain)
 
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """Make a request to the Syncro API."""
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        list_key: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict:
+        """Make a request to the Syncro API.
+
+        ``list_key`` names the page's record list, letting a configured
+        ``decoder`` decode it (keeping only ``fields``) in a worker process.
+        """
         url = f"{self.base_url}{endpoint}"
 
         if params is None:
@@ -38,8 +49,16 @@ class SyncroClient(BaseClient):
         response = self.request(
             "GET", url, params=params, headers={"Accept": "application/json"}
         )
+        if endpoint == "customer_assets":
+            self.record_page(
+                (endpoint, params.get("customer_id"), params.get("page")),
+                response.content,
+            )
         try:
-            data = response.json()
+            if list_key is not None:
+                data = self.decode_json(response, list_key, fields)
+            else:
+                data = response.json()
         except Exception as e:
             raise ValueError(f"Failed to parse JSON response: {e}")
         return data
@@ -53,38 +72,75 @@ class SyncroClient(BaseClient):
         data = self._make_request("tickets", params)
         return data.get("tickets", [])
 
-    def get_assets(self, page: int = 1) -> List[Dict]:
-        """Get Syncro assets for a single page."""
+    def get_customers(
+        self, business_name: Optional[str] = None, page: int = 1
+    ) -> List[Dict]:
+        """Get Syncro customers for a single page, optionally by business name."""
         params = {"page": page}
-        data = self._make_request("customer_assets", params)
+        if business_name:
+            params["business_name"] = business_name
+        data = self._make_request("customers", params)
+        return data.get("customers", [])
+
+    def get_assets(
+        self, page: int = 1, customer_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Get Syncro assets for a single page (optionally one customer's)."""
+        params = {"page": page}
+        if customer_id is not None:
+            params["customer_id"] = customer_id
+        data = self._make_request(
+            "customer_assets", params, list_key="assets", fields=SYNCRO_ASSET_FIELDS
+        )
         return data.get("assets", [])
 
-    def _get_total_pages(self) -> int:
+    def _get_total_pages(self, customer_id: Optional[int] = None) -> int:
         """Get total number of asset pages from API metadata."""
         try:
-            data = self._make_request("customer_assets", {"page": 1})
+            params = {"page": 1}
+            if customer_id is not None:
+                params["customer_id"] = customer_id
+            data = self._make_request("customer_assets", params)
             return data.get("meta", {}).get("total_pages", 1)
         except Exception:
+            self.record_page_failure()
             return 1
 
-    def get_all_assets(self, max_pages: int = 50) -> List[Dict]:
-        """Get all Syncro assets across multiple pages using parallel requests."""
-        total_pages = min(self._get_total_pages(), max_pages)
+    def get_all_assets(
+        self,
+        max_pages: int = 50,
+        customer_id: Optional[int] = None,
+        on_page: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """Get all Syncro assets across multiple pages using parallel requests.
+
+        ``customer_id`` limits the fetch to one customer (server-side filter).
+        ``on_page`` is called with each page's assets as soon as it arrives.
+        """
+        total_pages = min(self._get_total_pages(customer_id), max_pages)
 
         if total_pages <= 1:
-            return self.get_assets(page=1)
+            assets = self.get_assets(page=1, customer_id=customer_id)
+            if on_page is not None:
+                on_page(assets)
+            return assets
 
         assets = []
         with ThreadPoolExecutor(max_workers=min(total_pages, 10)) as executor:
             futures = {
-                executor.submit(self.get_assets, page): page
+                executor.submit(self.get_assets, page, customer_id): page
                 for page in range(1, total_pages + 1)
             }
             for future in as_completed(futures):
                 try:
                     result = future.result()
                     assets.extend(result)
+                    if on_page is not None:
+                        on_page(result)
                 except Exception as e:
+                    self.record_page_failure(
+                        ("customer_assets", customer_id, futures[future])
+                    )
                     # In a real app we might want to log this or handle it
                     print(f"Failed to fetch page: {e}")
 
@@ -99,13 +155,18 @@ class HuntressClient(BaseClient):
         super().__init__(rate_limiter=rate_limiter)
         self.auth = HTTPBasicAuth(api_key, secret_key)
 
-    def get_agents(self, page: int = 1, limit: int = 500) -> List[Dict]:
-        """Get Huntress agents for a single page."""
+    def get_agents(
+        self, page: int = 1, limit: int = 500, organization_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Get Huntress agents for a single page (optionally one organization's)."""
         params = {"page": page, "limit": limit}
+        if organization_id is not None:
+            params["organization_id"] = organization_id
 
         response = self.request("GET", HUNTRESS_API_URL, auth=self.auth, params=params)
+        self.record_page(("agents", organization_id, page), response.content)
         try:
-            data = response.json()
+            data = self.decode_json(response, "agents", HUNTRESS_AGENT_FIELDS)
         except Exception as e:
             raise ValueError(f"Failed to parse JSON response: {e}")
 
@@ -114,7 +175,9 @@ class HuntressClient(BaseClient):
 
         return data["agents"]
 
-    def _get_total_pages(self, limit: int = 500) -> int:
+    def _get_total_pages(
+        self, limit: int = 500, organization_id: Optional[int] = None
+    ) -> int:
         """Get total number of agent pages from API pagination metadata.
 
         The Huntress ``/v1/agents`` pagination object reports ``total_count``
@@ -123,6 +186,8 @@ class HuntressClient(BaseClient):
         """
         try:
             params = {"page": 1, "limit": limit}
+            if organization_id is not None:
+                params["organization_id"] = organization_id
             response = self.request(
                 "GET", HUNTRESS_API_URL, auth=self.auth, params=params
             )
@@ -133,26 +198,51 @@ class HuntressClient(BaseClient):
                 return 1
             return math.ceil(total_count / page_limit)
         except Exception:
+            self.record_page_failure()
             return 1
 
-    def get_all_agents(self, limit: int = 500, max_pages: int = 50) -> List[Dict]:
-        """Get all Huntress agents across multiple pages using parallel requests."""
-        total_pages = min(self._get_total_pages(limit=limit), max_pages)
+    def get_all_agents(
+        self,
+        limit: int = 500,
+        max_pages: int = 50,
+        organization_id: Optional[int] = None,
+        on_page: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """Get all Huntress agents across multiple pages using parallel requests.
+
+        ``organization_id`` limits the fetch to one organization (server-side
+        filter). ``on_page`` is called with each page's agents as soon as it
+        arrives.
+        """
+        total_pages = min(
+            self._get_total_pages(limit=limit, organization_id=organization_id),
+            max_pages,
+        )
 
         if total_pages <= 1:
-            return self.get_agents(page=1, limit=limit)
+            agents = self.get_agents(
+                page=1, limit=limit, organization_id=organization_id
+            )
+            if on_page is not None:
+                on_page(agents)
+            return agents
 
         agents = []
         with ThreadPoolExecutor(max_workers=min(total_pages, 10)) as executor:
             futures = {
-                executor.submit(self.get_agents, page, limit): page
+                executor.submit(self.get_agents, page, limit, organization_id): page
                 for page in range(1, total_pages + 1)
             }
             for future in as_completed(futures):
                 try:
                     result = future.result()
                     agents.extend(result)
+                    if on_page is not None:
+                        on_page(result)
                 except Exception as e:
+                    self.record_page_failure(
+                        ("agents", organization_id, futures[future])
+                    )
                     # In a real app we might want to log this or handle it
                     print(f"Failed to fetch page: {e}")
 
@@ -165,6 +255,7 @@ class HuntressClient(BaseClient):
         response = self.request(
             "GET", HUNTRESS_ORGANIZATIONS_URL, auth=self.auth, params=params
         )
+        self.record_page(("organizations", None, page), response.content)
         try:
             data = response.json()
         except Exception as e:
@@ -189,6 +280,7 @@ class HuntressClient(BaseClient):
                 return 1
             return math.ceil(total_count / page_limit)
         except Exception:
+            self.record_page_failure()
             return 1
 
     def get_all_organizations(
@@ -210,6 +302,7 @@ class HuntressClient(BaseClient):
                 try:
                     organizations.extend(future.result())
                 except Exception as e:
+                    self.record_page_failure(("organizations", None, futures[future]))
                     print(f"Failed to fetch page: {e}")
 
         return organizations
@@ -0,0 +1,72 @@
+"""Response decoding, optionally in a process pool."""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+# Record fields the comparison reads; a pool decoder keeps only these, so
+# every field the comparison needs must be listed.
+SYNCRO_ASSET_FIELDS = (
+    "id",
+    "name",
+    "customer_id",
+    "customer",
+    "customer_business_then_name",
+    "last_seen",
+    "updated_at",
+)
+HUNTRESS_AGENT_FIELDS = (
+    "id",
+    "hostname",
+    "organization_id",
+    "last_callback_at",
+    "last_survey_at",
+)
+
+
+def decode_page(
+    body: bytes, list_key: str, fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Decode one JSON page, keeping only ``fields`` of each ``list_key`` record.
+
+    Runs in the pool's worker processes, so it must stay importable and
+    picklable (a plain module-level function).
+    """
+    data = json.loads(body)
+    records = data.get(list_key) if isinstance(data, dict) else None
+    if fields and isinstance(records, list):
+        data[list_key] = [
+            {name: record[name] for name in fields if name in record}
+            for record in records
+            if isinstance(record, dict)
+        ]
+    return data
+
+
+class ProcessPoolDecoder:
+    """Decodes response bodies in a small pool of worker processes.
+
+    ``json.loads`` and the record dicts it builds hold the GIL, so with many
+    large pages arriving at once the client threads queue up on decoding.
+    Handing the raw bytes to worker processes moves that work off the GIL;
+    only the projected records (``SYNCRO_ASSET_FIELDS`` /
+    ``HUNTRESS_AGENT_FIELDS``) are pickled back. Hostnames are normalized in
+    the parent, where the memoized normalizer and interning apply.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    def decode(
+        self, body: bytes, list_key: str, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        return self._pool.submit(decode_page, body, list_key, fields).result()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def __enter__(self) -> "ProcessPoolDecoder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
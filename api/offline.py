@@ -0,0 +1,238 @@
+"""Offline stand-ins for the API clients, replaying saved payloads.
+
+``OfflineSyncroClient`` and ``OfflineHuntressClient`` answer the calls
+``ComparisonService`` makes (``get_all_assets``, ``get_customers``,
+``get_all_agents``, ``get_all_organizations``, ``content_hash``) from a debug
+dump run or a stored snapshot, so a comparison runs with no network. Records
+are streamed from disk and handed to ``on_page`` in pages, the way the live
+clients deliver them, so the service's pipelined indexing runs as it would
+against the APIs.
+"""
+
+import os
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.comparison import extract_org
+from services.snapshots import SnapshotStore
+from utils.dumps import iter_json_array, latest_dump, read_dump
+
+# Records per page handed to ``on_page``.
+OFFLINE_PAGE_SIZE = 1000
+# ``--from-dump`` values naming a stored snapshot: "snapshot:ID" or
+# "snapshot:latest".
+SNAPSHOT_PREFIX = "snapshot:"
+
+Records = Callable[[], Iterable[Dict]]
+
+
+def _paged(
+    records: Iterable[Dict],
+    page_size: int,
+    on_page: Optional[Callable[[List[Dict]], None]] = None,
+    keep: Optional[Callable[[Dict], bool]] = None,
+) -> List[Dict]:
+    """Collect ``records`` (those passing ``keep``), calling ``on_page`` with
+    every ``page_size`` of them."""
+    collected: List[Dict] = []
+    page: List[Dict] = []
+    for record in records:
+        if not isinstance(record, dict) or (keep is not None and not keep(record)):
+            continue
+        page.append(record)
+        if len(page) >= page_size:
+            collected.extend(page)
+            if on_page is not None:
+                on_page(page)
+            page = []
+    if page or not collected:
+        collected.extend(page)
+        if on_page is not None:
+            on_page(page)
+    return collected
+
+
+def _asset_customer(asset: Dict) -> Optional[Dict]:
+    """The Syncro customer record an asset belongs to (id and names)."""
+    customer = asset.get("customer")
+    cid = asset.get("customer_id")
+    if cid is None and isinstance(customer, dict):
+        cid = customer.get("id")
+    if cid is None:
+        return None
+    record = dict(customer) if isinstance(customer, dict) else {}
+    record["id"] = cid
+    record.setdefault("business_name", extract_org(asset))
+    return record
+
+
+class OfflineSyncroClient:
+    """Syncro client answering from saved asset records."""
+
+    def __init__(self, assets: Records, page_size: int = OFFLINE_PAGE_SIZE):
+        # Called for a fresh iterator on every request; nothing is cached.
+        self._assets = assets
+        self.page_size = page_size
+
+    def get_all_assets(
+        self,
+        max_pages: int = 50,
+        customer_id: Optional[int] = None,
+        on_page: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """Every saved asset (or one customer's). ``max_pages`` is ignored:
+        the dump already holds what the live fetch returned."""
+
+        def of_customer(asset: Dict) -> bool:
+            return (_asset_customer(asset) or {}).get("id") == customer_id
+
+        keep = of_customer if customer_id is not None else None
+        return _paged(self._assets(), self.page_size, on_page, keep)
+
+    def get_customers(
+        self, business_name: Optional[str] = None, page: int = 1
+    ) -> List[Dict]:
+        """Customers seen on the saved assets, optionally those whose name
+        contains ``business_name`` (case-insensitive). All on page 1."""
+        if page != 1:
+            return []
+        wanted = business_name.casefold() if business_name else None
+        customers: Dict[int, Dict] = {}
+        for asset in self._assets():
+            if not isinstance(asset, dict):
+                continue
+            customer = _asset_customer(asset)
+            if customer is None or customer["id"] in customers:
+                continue
+            if wanted is None or wanted in str(customer["business_name"]).casefold():
+                customers[customer["id"]] = customer
+        return list(customers.values())
+
+    def content_hash(self) -> str:
+        """Always empty: saved payloads never skip a rebuild."""
+        return ""
+
+
+class OfflineHuntressClient:
+    """Huntress client answering from saved agent and organization records."""
+
+    def __init__(
+        self,
+        agents: Records,
+        organizations: Optional[Records] = None,
+        page_size: int = OFFLINE_PAGE_SIZE,
+    ):
+        self._agents = agents
+        self._organizations = organizations
+        self.page_size = page_size
+
+    def get_all_agents(
+        self,
+        limit: int = 500,
+        max_pages: int = 50,
+        organization_id: Optional[int] = None,
+        on_page: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """Every saved agent (or one organization's)."""
+
+        def of_organization(agent: Dict) -> bool:
+            return agent.get("organization_id") == organization_id
+
+        keep = of_organization if organization_id is not None else None
+        return _paged(self._agents(), self.page_size, on_page, keep)
+
+    def get_all_organizations(
+        self, limit: int = 500, max_pages: int = 50
+    ) -> List[Dict]:
+        """Saved organizations; empty when none were saved."""
+        if self._organizations is None:
+            return []
+        return [o for o in self._organizations() if isinstance(o, dict)]
+
+    def content_hash(self) -> str:
+        """Always empty: saved payloads never skip a rebuild."""
+        return ""
+
+
+def clients_from_dump(
+    directory: str, page_size: int = OFFLINE_PAGE_SIZE
+) -> Tuple[OfflineSyncroClient, OfflineHuntressClient]:
+    """Offline clients over the newest dump run in ``directory``.
+
+    Raises ``ValueError`` when the directory holds no Syncro and Huntress
+    dumps. The organizations dump is optional (older runs lack it).
+    """
+    if not os.path.isdir(directory):
+        raise ValueError(f"Dump directory {directory!r} does not exist")
+    paths = latest_dump(directory)
+    missing = [source for source in ("syncro", "huntress") if source not in paths]
+    if missing:
+        raise ValueError(f"No {' or '.join(missing)} dump in {directory!r}")
+
+    def reader(source: str) -> Records:
+        return lambda: read_dump(paths[source])
+
+    return (
+        OfflineSyncroClient(reader("syncro"), page_size),
+        OfflineHuntressClient(
+            reader("huntress"),
+            reader("organizations") if "organizations" in paths else None,
+            page_size,
+        ),
+    )
+
+
+def clients_from_snapshot(
+    snapshot_db: str,
+    snapshot_id: Optional[int] = None,
+    page_size: int = OFFLINE_PAGE_SIZE,
+) -> Tuple[OfflineSyncroClient, OfflineHuntressClient]:
+    """Offline clients over a stored snapshot's payloads (the latest when
+    ``snapshot_id`` is None).
+
+    Snapshots do not store Huntress organizations, so Huntress-only rows
+    have no organization name.
+    """
+
+    def reader(source: str) -> Records:
+        def records():
+            with SnapshotStore(snapshot_db) as store:
+                chunks = store.payload_chunks(snapshot_id, source)
+                # An empty payload (none stored) reads as no records.
+                first = next(chunks, None)
+                if first is None:
+                    return
+                yield from iter_json_array(chain([first], chunks))
+
+        return records
+
+    # Fail now, not mid-comparison, on a missing snapshot.
+    with SnapshotStore(snapshot_db) as store:
+        if snapshot_id is None:
+            snapshot_id = store.latest_id()
+        if snapshot_id is None:
+            raise ValueError(f"No snapshots in {snapshot_db}")
+        store.info(snapshot_id)
+    return (
+        OfflineSyncroClient(reader("syncro"), page_size),
+        OfflineHuntressClient(reader("huntress"), None, page_size),
+    )
+
+
+def offline_clients(
+    spec: str, snapshot_db: str, page_size: int = OFFLINE_PAGE_SIZE
+) -> Tuple[OfflineSyncroClient, OfflineHuntressClient]:
+    """Offline clients for a ``--from-dump`` value: a dump directory, or
+    ``snapshot:ID`` / ``snapshot:latest`` from ``snapshot_db``."""
+    if spec.startswith(SNAPSHOT_PREFIX):
+        reference = spec[len(SNAPSHOT_PREFIX) :]
+        if reference == "latest":
+            return clients_from_snapshot(snapshot_db, None, page_size)
+        try:
+            snapshot_id = int(reference)
+        except ValueError:
+            raise ValueError(
+                f"Expected snapshot:ID or snapshot:latest, got {spec!r}"
+            ) from None
+        return clients_from_snapshot(snapshot_db, snapshot_id, page_size)
+    return clients_from_dump(spec, page_size)
@@ -12,10 +12,17 @@ class ConfigurationError(Exception):
     pass
 
 
-def load_settings(path: str = "settings.json") -> Dict[str, Any]:
+def load_settings(
+    path: str = "settings.json", require_credentials: bool = True
+) -> Dict[str, Any]:
     """
     Initialize and load settings from settings.json.
 
+    Args:
+        path: Settings file to read (created from defaults if missing).
+        require_credentials: Validate the API credential fields. Offline
+            modes (e.g. opening a saved snapshot) pass False.
+
     Returns:
         Dict containing the settings.
 
@@ -76,7 +83,7 @@ def load_settings(path: str = "settings.json") -> Dict[str, Any]:
 
     # Validate required fields
     missing_fields = []
-    for key in REQUIRED_SETTINGS:
+    for key in REQUIRED_SETTINGS if require_credentials else []:
         value = final_settings.get(key, "")
         if not isinstance(value, str) or not value.strip():
             missing_fields.append(key)
@@ -24,6 +24,21 @@ DEFAULT_SETTINGS = {
     "Debug": False,
     # Normalized (NetBIOS-truncated, lowercased) hostnames to treat as ignored.
     "IgnoredAssets": [],
+    # Glob patterns over the same keys ("kiosk-*", "*-test"), as strings or
+    # {"pattern": ..., "expires": "YYYY-MM-DD"} objects.
+    "IgnorePatterns": [],
+    # Flag rows whose newest check-in is older than this many days (0 = off).
+    "StaleAfterDays": 30,
+    # Match hosts per (organization, hostname) using the org mapping file.
+    "OrgScopedMatching": False,
+    # Unicode-aware hostname keys (NFKC + casefold, zero-width characters
+    # dropped) instead of plain lowercasing.
+    "UnicodeHostnames": False,
+    # Worker processes decoding API pages (0 = decode on the fetch threads).
+    "DecodeWorkers": 0,
+    # Debug dumps kept (runs) and their total size cap in MB (0 = no cap).
+    "DebugDumpKeep": 10,
+    "DebugDumpMaxMB": 500,
     # Organization (Syncro customer) names to hide from results.
     "ExcludedOrganizations": [],
 }
@@ -36,6 +51,12 @@ REQUIRED_SETTINGS = [
     "HuntressSecretKey",
 ]
 
+# Folder the Debug setting writes raw API payload dumps to.
+DEBUG_DUMP_DIR = "debug"
+
+# Local SQLite file holding saved comparison snapshots (run history).
+SNAPSHOT_DB_FILE = "snapshots.db"
+
 # Syncro Constants
 SYNCRO_BASE_URL_TEMPLATE = "https://{subdomain}.syncromsp.com/api/v1/"
 SYNCRO_RATE_LIMIT = 3.0  # requests per second
@@ -45,3 +66,7 @@ SYNCRO_BURST = 180.0
 HUNTRESS_API_URL = "https://api.huntress.io/v1/agents"
 HUNTRESS_ORGANIZATIONS_URL = "https://api.huntress.io/v1/organizations"
 HUNTRESS_RATE_LIMIT = 60.0  # requests per second
+
+# JSON file pairing Syncro customers with Huntress organizations (derived pairs
+# plus hand-edited overrides), used by org-scoped matching.
+ORG_MAPPING_FILE = "org_mapping.json"
@@ -108,12 +108,16 @@ class MainWindow(QMainWindow):
             return
         dialog = ExportDialog(
             self.comparison_widget.get_results(),
-            self.settings_model.get_ignored(),
+            self.settings_model.get_ignore_rules(),
             self,
         )
         dialog.exec()
 
     @Slot()
     def _show_debug_dialog(self):
-        dialog = DebugDialog(self.comparison_widget.get_raw_data(), self)
+        dialog = DebugDialog(
+            self.comparison_widget.get_raw_data(),
+            self,
+            settings=self.settings_model.get_all(),
+        )
         dialog.exec()
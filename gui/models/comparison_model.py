@@ -1,6 +1,6 @@
 """Table model for comparison results."""
 
-from typing import Dict, List, Optional, Set
+from typing import Container, Dict, Iterable, List, Optional, Set
 
 from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
 from PySide6.QtGui import QFont, QPixmap
@@ -8,13 +8,25 @@ from PySide6.QtGui import QFont, QPixmap
 from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
 from gui.theme import Theme
 from gui.theme.theme import dot_pixmap
-from services.comparison import ComparisonRow, row_key
+from services.columnar import ColumnarRows
+from services.comparison import (
+    ORDER_HOSTNAME,
+    ORDER_HUNTRESS,
+    ORDER_ORG,
+    ORDER_STATUS,
+    RowSequence,
+    describe_flags,
+    order_indexes,
+    row_key,
+)
+from services.filters import RowFilter, search_filter
 
 # Column indices (single source of truth for ordering).
 COL_ORG = 0
 COL_SYNCRO = 1
 COL_HUNTRESS = 2
 COL_STATUS = 3
+COL_NOTES = 4
 
 # Status -> theme token for the status dot drawn in the Status column.
 STATUS_TOKENS = {
@@ -23,11 +35,20 @@ STATUS_TOKENS = {
     STATUS_MISSING_SYNCRO: "status_missing_syncro",
 }
 
+# Column -> row ordering used when the user sorts by that column header.
+COLUMN_ORDERINGS = {
+    COL_ORG: ORDER_ORG,
+    COL_SYNCRO: ORDER_HOSTNAME,
+    COL_HUNTRESS: ORDER_HUNTRESS,
+    COL_STATUS: ORDER_STATUS,
+}
+
 __all__ = [
     "COL_ORG",
     "COL_SYNCRO",
     "COL_HUNTRESS",
     "COL_STATUS",
+    "COL_NOTES",
     "row_key",
     "ComparisonTableModel",
     "ComparisonFilterProxyModel",
@@ -37,13 +58,18 @@ __all__ = [
 class ComparisonTableModel(QAbstractTableModel):
     """Table model for displaying comparison results."""
 
-    HEADERS = ["Organization", "Syncro Asset", "Huntress Asset", "Status"]
+    HEADERS = ["Organization", "Syncro Asset", "Huntress Asset", "Status", "Notes"]
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._data: List[ComparisonRow] = []
-        self._ignored: Set[str] = set()
+        # Rows are held column-wise; cells read straight from the columns.
+        self._data = ColumnarRows()
+        self._ignored: Container[str] = frozenset()
         self._dots: Dict[str, QPixmap] = {}
+        # Ordering name -> rank of each source row, built once per data set.
+        self._ranks: Dict[str, List[int]] = {}
+        # Row key -> source rows, built on first use per data set.
+        self._key_rows: Optional[Dict[str, List[int]]] = None
         # Repaint status dots / ignored dimming when the OS theme flips.
         Theme.instance().changed.connect(self._on_theme_changed)
 
@@ -69,27 +95,30 @@ class ComparisonTableModel(QAbstractTableModel):
     def columnCount(self, parent=QModelIndex()):
         return len(self.HEADERS)
 
-    def _cell(self, row: ComparisonRow, col: int) -> str:
+    def _cell(self, row: int, col: int) -> str:
+        data = self._data
         if col == COL_ORG:
-            return row.organization
+            return data.organization(row)
         if col == COL_SYNCRO:
-            return row.syncro_name
+            return data.syncro_names[row]
         if col == COL_HUNTRESS:
-            return row.huntress_name
-        return row.status
+            return data.huntress_names[row]
+        if col == COL_NOTES:
+            return describe_flags(data.flags[row])
+        return data.status(row)
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid() or index.row() >= len(self._data):
             return None
 
-        row = self._data[index.row()]
-        ignored = row_key(row) in self._ignored
+        row = index.row()
+        ignored = self._data.is_ignored(row)
 
         if role == Qt.DisplayRole:
             return self._cell(row, index.column())
 
         if role == Qt.DecorationRole and index.column() == COL_STATUS and not ignored:
-            return self._dot_for(row.status)
+            return self._dot_for(self._data.status(row))
 
         if role == Qt.ForegroundRole and ignored:
             # Dim ignored rows; normal rows inherit the palette text color.
@@ -108,27 +137,77 @@ class ComparisonTableModel(QAbstractTableModel):
             return self.HEADERS[section]
         return None
 
-    def setData(self, rows: List[ComparisonRow]):
-        """Replace all data."""
+    def setData(self, rows: RowSequence):
+        """Replace all data (a row list or a ``ColumnarRows`` store)."""
         self.beginResetModel()
-        self._data = list(rows)
+        self._data = ColumnarRows.from_rows(rows)
+        if self._data.ignored is None:
+            self._data.mark_ignored(self._ignored)
+        self._ranks = {}
+        self._key_rows = None
         self.endResetModel()
 
     def clear(self):
         """Clear all data."""
         self.beginResetModel()
-        self._data = []
+        self._data = ColumnarRows()
+        self._ranks = {}
+        self._key_rows = None
         self.endResetModel()
 
-    def get_all_data(self) -> List[ComparisonRow]:
-        """Get all data rows."""
-        return self._data.copy()
+    def sort_rank(self, column: int) -> List[int]:
+        """Return each source row's position in the ordering for ``column``."""
+        if column == COL_NOTES:
+            return self._notes_rank()
+        ordering = COLUMN_ORDERINGS.get(column, ORDER_STATUS)
+        if ordering not in self._ranks:
+            ranks = [0] * len(self._data)
+            for position, index in enumerate(order_indexes(self._data, ordering)):
+                ranks[index] = position
+            self._ranks[ordering] = ranks
+        return self._ranks[ordering]
+
+    def _notes_rank(self) -> List[int]:
+        """Ranks for the Notes column: flagged rows first, then status order."""
+        if "notes" not in self._ranks:
+            status_ranks = self.sort_rank(COL_STATUS)
+            flags = self._data.flags
+            order = sorted(
+                range(len(flags)), key=lambda i: (-flags[i], status_ranks[i])
+            )
+            ranks = [0] * len(order)
+            for position, index in enumerate(order):
+                ranks[index] = position
+            self._ranks["notes"] = ranks
+        return self._ranks["notes"]
+
+    def get_all_data(self) -> ColumnarRows:
+        """Get all data rows (a copy of the column store)."""
+        return self._data[:]
 
     # --- Ignore support ---
 
-    def set_ignored(self, keys: Set[str]):
-        """Set the ignored-key set and refresh the view."""
-        self._ignored = set(keys)
+    def set_ignored(
+        self, keys: Container[str], changed: Optional[Iterable[str]] = None
+    ):
+        """Set the ignore matcher (keys or ``IgnoreRules``) and refresh the view.
+
+        The rows' ignored bitmap is recomputed once here so ``data`` never
+        matches keys. With ``changed`` only the rows for those keys are
+        re-checked.
+        """
+        self._ignored = keys
+        if changed is not None and self._data.ignored is not None:
+            flags = self._data.ignored
+            for key in changed:
+                for source_row in self.rows_for_key(key):
+                    flags[source_row] = key in keys
+                    self.dataChanged.emit(
+                        self.index(source_row, 0),
+                        self.index(source_row, self.columnCount() - 1),
+                    )
+            return
+        self._data.mark_ignored(keys)
         if self._data:
             top = self.index(0, 0)
             bottom = self.index(len(self._data) - 1, self.columnCount() - 1)
@@ -137,17 +216,47 @@ class ComparisonTableModel(QAbstractTableModel):
     def key_for_source_row(self, source_row: int) -> Optional[str]:
         """Return the ignore key for a source-model row index."""
         if 0 <= source_row < len(self._data):
-            return row_key(self._data[source_row])
+            return self._data.keys[source_row]
         return None
 
+    def rows_for_key(self, key: str) -> List[int]:
+        """Source rows sharing ignore key ``key``."""
+        if self._key_rows is None:
+            self._key_rows = {}
+            for index, candidate in enumerate(self._data.keys):
+                self._key_rows.setdefault(candidate, []).append(index)
+        return self._key_rows.get(key, [])
+
+    def status_for_source_row(self, source_row: int) -> str:
+        """Return the status for a source-model row index."""
+        if 0 <= source_row < len(self._data):
+            return self._data.status(source_row)
+        return ""
+
     def is_source_row_ignored(self, source_row: int) -> bool:
-        key = self.key_for_source_row(source_row)
-        return key is not None and key in self._ignored
+        return 0 <= source_row < len(self._data) and self._data.is_ignored(source_row)
+
+    def is_source_row_flagged(self, source_row: int) -> bool:
+        """True when the row is a duplicate or stale entry."""
+        return 0 <= source_row < len(self._data) and bool(self._data.flags[source_row])
+
+    def filter_record(self, source_row: int) -> tuple:
+        """The ``services.filters`` record for a source-model row."""
+        data = self._data
+        return (
+            *data.values(source_row),
+            data.keys[source_row],
+            data.flags[source_row],
+            data.is_ignored(source_row),
+        )
+
+    def flagged_count(self) -> int:
+        return sum(1 for flags in self._data.flags if flags)
 
     def org_for_source_row(self, source_row: int) -> str:
         """Return the organization for a source-model row index."""
         if 0 <= source_row < len(self._data):
-            return self._data[source_row].organization
+            return self._data.organization(source_row)
         return ""
 
 
@@ -158,8 +267,10 @@ class ComparisonFilterProxyModel(QSortFilterProxyModel):
         super().__init__(parent)
         self._statuses: Set[str] = set()  # Empty means show every status
         self._search_text = ""
+        self._search_filter: Optional[RowFilter] = None
         self._excluded_orgs: Set[str] = set()
         self._only_ignored = False
+        self._only_flagged = False
 
     def set_status_filter(self, statuses):
         """Show only rows whose status is in ``statuses`` (an iterable of status
@@ -172,9 +283,20 @@ class ComparisonFilterProxyModel(QSortFilterProxyModel):
         self._only_ignored = only_ignored
         self.invalidateFilter()
 
+    def set_only_flagged(self, only_flagged: bool):
+        """When True, show only duplicate / stale rows."""
+        self._only_flagged = only_flagged
+        self.invalidateFilter()
+
     def set_search_text(self, text: str):
-        """Set the search text filter."""
-        self._search_text = text.lower()
+        """Set the search text filter.
+
+        Text with a comparison (``status != "OK!" and org ~ dental``) is
+        compiled as a ``services.filters`` expression; anything else is a
+        substring search.
+        """
+        self._search_filter = search_filter(text)
+        self._search_text = "" if self._search_filter else text.lower()
         self.invalidateFilter()
 
     def set_excluded_orgs(self, orgs: Set[str]):
@@ -182,6 +304,11 @@ class ComparisonFilterProxyModel(QSortFilterProxyModel):
         self._excluded_orgs = set(orgs)
         self.invalidateFilter()
 
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        # Compare precomputed ranks instead of display strings.
+        ranks = self.sourceModel().sort_rank(left.column())
+        return ranks[left.row()] < ranks[right.row()]
+
     def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
         model = self.sourceModel()
 
@@ -202,10 +329,16 @@ class ComparisonFilterProxyModel(QSortFilterProxyModel):
             if not model.is_source_row_ignored(source_row):
                 return False
 
+        if self._only_flagged and not model.is_source_row_flagged(source_row):
+            return False
+
         # Check status filter (union of selected statuses; empty = show all).
         if self._statuses and status not in self._statuses:
             return False
 
+        if self._search_filter is not None:
+            return self._search_filter.predicate(model.filter_record(source_row))
+
         # Check search text (org, syncro and huntress names)
         if self._search_text:
             combined = f"{org} {syncro} {huntress}".lower()
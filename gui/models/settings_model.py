@@ -8,6 +8,7 @@ from typing import Dict, List, Set, Tuple
 from PySide6.QtCore import QObject, Signal
 
 from const import DEFAULT_SETTINGS, REQUIRED_SETTINGS
+from services.ignore_rules import IgnoreRules
 
 
 class SettingsModel(QObject):
@@ -84,6 +85,10 @@ class SettingsModel(QObject):
         """Return the set of ignored asset keys."""
         return set(self._settings.get("IgnoredAssets", []))
 
+    def get_ignore_rules(self) -> IgnoreRules:
+        """Compile the ignored keys and ``IgnorePatterns`` into one matcher."""
+        return IgnoreRules.from_settings(self._settings)
+
     def add_ignored(self, key: str) -> None:
         """Mark an asset key as ignored and persist."""
         ignored = self.get_ignored()
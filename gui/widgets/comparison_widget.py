@@ -24,7 +24,6 @@ from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
 from gui.models.comparison_model import (
     ComparisonFilterProxyModel,
     ComparisonTableModel,
-    row_key,
 )
 from gui.models.settings_model import SettingsModel
 from gui.theme.theme import Theme, dot_pixmap
@@ -32,7 +31,9 @@ from gui.widgets.org_filter_dialog import OrgFilterDialog
 from gui.widgets.spinner import Spinner
 from gui.widgets.stat_card import StatCard
 from gui.workers.comparison_worker import ComparisonWorker
-from services.comparison import ComparisonRow
+from services.aggregates import OrgAggregates
+from services.columnar import ColumnarRows
+from services.comparison import ComparisonResult, RowSequence
 
 # Stacked-widget page indices.
 PAGE_EMPTY = 0
@@ -82,6 +83,15 @@ class ComparisonWidget(QWidget):
         self._selected: set = set(DEFAULT_SELECTION)
         self._only_ignored = False
         self._ignored_count = 0
+        # Duplicate / stale rows view, toggled by the quiet flagged link.
+        self._only_flagged = False
+        # Per-org counts behind the stat cards; updated in place on ignore /
+        # org-exclusion changes instead of rescanning rows.
+        self._aggregates = OrgAggregates()
+        # Aggregates from the worker's ComparisonResult, consumed by _on_result.
+        self._pending_aggregates: Optional[OrgAggregates] = None
+        # Latest full result, the base for single-organization refreshes.
+        self._result: Optional[ComparisonResult] = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -248,6 +258,10 @@ class ComparisonWidget(QWidget):
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Search…")
         self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setToolTip(
+            'Text to search for, or a filter such as status != "OK!" and '
+            "org ~ dental"
+        )
         self.search_edit.setMaximumWidth(220)
         self.search_edit.textChanged.connect(self._on_search_changed)
         bar.addWidget(self.search_edit)
@@ -296,7 +310,10 @@ class ComparisonWidget(QWidget):
         self.table_view.setAlternatingRowColors(True)
         self.table_view.setShowGrid(False)
         self.table_view.verticalHeader().setVisible(False)
-        self.table_view.setSortingEnabled(False)  # Preserve custom sort order
+        # Column sorting uses the model's precomputed ranks. No sort indicator
+        # until a header is clicked, so the engine's problems-first order shows.
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
         self.table_view.setSelectionBehavior(QTableView.SelectRows)
         self.table_view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table_view.customContextMenuRequested.connect(self._on_table_context_menu)
@@ -306,6 +323,7 @@ class ComparisonWidget(QWidget):
         header.setSectionResizeMode(1, QHeaderView.Stretch)  # Syncro
         header.setSectionResizeMode(2, QHeaderView.Stretch)  # Huntress
         header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Status
+        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Notes
         return self.table_view
 
     def _build_status_strip(self) -> QHBoxLayout:
@@ -332,6 +350,14 @@ class ComparisonWidget(QWidget):
         self.ignored_btn.clicked.connect(self._toggle_ignored_view)
         strip.addWidget(self.ignored_btn)
 
+        # Same treatment for duplicate / stale rows.
+        self.flagged_btn = QToolButton()
+        self.flagged_btn.setProperty("variant", "link")
+        self.flagged_btn.setCursor(Qt.PointingHandCursor)
+        self.flagged_btn.setVisible(False)
+        self.flagged_btn.clicked.connect(self._toggle_flagged_view)
+        strip.addWidget(self.flagged_btn)
+
         export_btn = QToolButton()
         export_btn.setText("Export")
         export_btn.clicked.connect(self.export_requested)
@@ -362,6 +388,16 @@ class ComparisonWidget(QWidget):
 
     @Slot()
     def run_comparison(self):
+        self._start_worker()
+
+    def refresh_organization(self, org: str):
+        """Re-fetch just ``org`` and splice it into the current results."""
+        if self._result is None:
+            self._start_worker()
+            return
+        self._start_worker(organization=org)
+
+    def _start_worker(self, organization: Optional[str] = None):
         if self._worker is not None and self._worker.isRunning():
             return
 
@@ -376,11 +412,17 @@ class ComparisonWidget(QWidget):
         self.comparison_started.emit()
 
         settings = self.settings_model.get_all()
-        self._worker = ComparisonWorker(settings)
+        self._worker = ComparisonWorker(
+            settings,
+            previous=self._result,
+            organization=organization,
+        )
         self._worker.progress.connect(self._on_progress)
         self._worker.error.connect(self._on_error)
+        self._worker.comparison.connect(self._on_comparison)
         self._worker.result.connect(self._on_result)
         self._worker.raw_data.connect(self._on_raw_data)
+        self._worker.unchanged.connect(self._on_unchanged)
         self._worker.finished_work.connect(self._on_finished)
         self._worker.start()
 
@@ -395,20 +437,36 @@ class ComparisonWidget(QWidget):
         self._raw_data = data
         self.raw_data_received.emit(data)
 
-    @Slot(list)
-    def _on_result(self, rows: List[ComparisonRow]):
+    @Slot(object)
+    def _on_comparison(self, result: ComparisonResult):
+        self._result = result
+        self._pending_aggregates = result.aggregates
+
+    @Slot(object)
+    def _on_result(self, rows: RowSequence):
+        excluded = self.settings_model.get_excluded_orgs()
+        rules = self.settings_model.get_ignore_rules()
+        self.model.set_ignored(rules)
         self.model.setData(rows)
-        self.model.set_ignored(self.settings_model.get_ignored())
 
-        self._all_orgs = sorted({r.organization for r in rows if r.organization})
-        self.proxy_model.set_excluded_orgs(self.settings_model.get_excluded_orgs())
+        self._aggregates = self._pending_aggregates or OrgAggregates.build(rows, rules)
+        self._pending_aggregates = None
+        self._aggregates.set_excluded(excluded)
+        self._all_orgs = self._aggregates.organizations()
+        self.proxy_model.set_excluded_orgs(excluded)
         self._update_org_button_label()
 
-        self._update_summary(rows)
+        self._update_summary()
+        self._update_flagged_toggle()
         self._reset_filter()
         self.set_last_run(f"last run {datetime.now():%H:%M}")
         self.stack.setCurrentIndex(PAGE_RESULTS)
 
+    @Slot()
+    def _on_unchanged(self):
+        """Same data as the last run: keep the model (no reset) and its view."""
+        self.set_last_run(f"last run {datetime.now():%H:%M} (unchanged)")
+
     @Slot(str)
     def _on_error(self, message: str):
         self._set_run_enabled(True)
@@ -433,6 +491,7 @@ class ComparisonWidget(QWidget):
         """Total clears the selection (show all); the status cards toggle, and
         the table shows the union of whatever is selected."""
         self._only_ignored = False
+        self._only_flagged = False
         if key == "total":
             self._selected = set()
         else:
@@ -447,27 +506,39 @@ class ComparisonWidget(QWidget):
             self._only_ignored = False
         else:
             self._only_ignored = True
+            self._only_flagged = False
+        self._apply_selection()
+
+    @Slot()
+    def _toggle_flagged_view(self):
+        """Flip the flagged link between the duplicate / stale view (every
+        status) and the previous status selection."""
+        self._only_flagged = not self._only_flagged
+        if self._only_flagged:
+            self._only_ignored = False
         self._apply_selection()
 
     def _reset_filter(self):
         """Return to the problems-first default view."""
         self._selected = set(DEFAULT_SELECTION)
         self._only_ignored = False
+        self._only_flagged = False
         self._apply_selection()
 
     def _apply_selection(self):
         """Push the current selection to the proxy and sync card/link highlights."""
         statuses = {STATUS_CARD_KEYS[k] for k in self._selected}
-        self.proxy_model.set_status_filter(statuses)
+        self.proxy_model.set_status_filter(set() if self._only_flagged else statuses)
         self.proxy_model.set_only_ignored(self._only_ignored)
+        self.proxy_model.set_only_flagged(self._only_flagged)
 
         # Total is "active" when showing everything (no status filter, not ignored).
-        self._cards["total"].set_active(not self._only_ignored and not self._selected)
+        link_view = self._only_ignored or self._only_flagged
+        self._cards["total"].set_active(not link_view and not self._selected)
         for key in STATUS_CARD_KEYS:
-            self._cards[key].set_active(
-                not self._only_ignored and key in self._selected
-            )
+            self._cards[key].set_active(not link_view and key in self._selected)
         self._set_link_active(self.ignored_btn, self._only_ignored)
+        self._set_link_active(self.flagged_btn, self._only_flagged)
         self._update_strip()
 
     @staticmethod
@@ -491,7 +562,9 @@ class ComparisonWidget(QWidget):
             excluded = dialog.excluded_orgs()
             self.settings_model.set_excluded_orgs(excluded)
             self.proxy_model.set_excluded_orgs(excluded)
+            self._aggregates.set_excluded(excluded)
             self._update_org_button_label()
+            self._update_summary()
             self._update_strip()
 
     def _exclude_org(self, org: str):
@@ -503,7 +576,9 @@ class ComparisonWidget(QWidget):
         excluded.add(org)
         self.settings_model.set_excluded_orgs(excluded)
         self.proxy_model.set_excluded_orgs(excluded)
+        self._aggregates.set_excluded(excluded)
         self._update_org_button_label()
+        self._update_summary()
         self._update_strip()
 
     def _update_org_button_label(self):
@@ -533,9 +608,10 @@ class ComparisonWidget(QWidget):
 
         menu = QMenu(self)
         ignore_action = menu.addAction("Un-ignore asset" if ignored else "Ignore asset")
-        exclude_org_action = None
+        exclude_org_action = refresh_org_action = None
         if org:
             menu.addSeparator()
+            refresh_org_action = menu.addAction(f"Refresh organization “{org}”")
             exclude_org_action = menu.addAction(f"Filter out organization “{org}”")
 
         chosen = menu.exec(self.table_view.viewport().mapToGlobal(pos))
@@ -543,6 +619,8 @@ class ComparisonWidget(QWidget):
             return
         if chosen == ignore_action:
             self._toggle_ignore(key, not ignored)
+        elif chosen == refresh_org_action:
+            self.refresh_organization(org)
         elif chosen == exclude_org_action:
             self._exclude_org(org)
 
@@ -551,30 +629,32 @@ class ComparisonWidget(QWidget):
             self.settings_model.add_ignored(key)
         else:
             self.settings_model.remove_ignored(key)
-        self.model.set_ignored(self.settings_model.get_ignored())
-        self._update_summary(self.model.get_all_data())
+        rules = self.settings_model.get_ignore_rules()
+        # A pattern may still cover the key after its exact entry is removed.
+        if (key in rules) != any(
+            self.model.is_source_row_ignored(r) for r in self.model.rows_for_key(key)
+        ):
+            for source_row in self.model.rows_for_key(key):
+                self._aggregates.set_ignored(
+                    self.model.org_for_source_row(source_row),
+                    self.model.status_for_source_row(source_row),
+                    key in rules,
+                )
+        self.model.set_ignored(rules, changed=[key])
+        self._update_summary()
         self.proxy_model.invalidateFilter()
         self._update_strip()
 
     # ----- Summary / status strip -----
 
-    def _update_summary(self, rows: List[ComparisonRow]):
-        ignored = self.settings_model.get_ignored()
-        active = [r for r in rows if row_key(r) not in ignored]
-
-        counts = {
-            "total": len(active),
-            "ok": sum(1 for r in active if r.status == STATUS_OK),
-            "missing_huntress": sum(
-                1 for r in active if r.status == STATUS_MISSING_HUNTRESS
-            ),
-            "missing_syncro": sum(
-                1 for r in active if r.status == STATUS_MISSING_SYNCRO
-            ),
-        }
+    def _update_summary(self):
+        # Summed from the per-org aggregates (excluded orgs left out).
+        totals = self._aggregates.totals()
+        counts = {key: getattr(totals, key) for key in STATUS_CARD_KEYS}
+        counts["total"] = totals.total
         for key, card in self._cards.items():
             card.set_count(counts[key])
-        self._update_ignored_toggle(len(rows) - len(active))
+        self._update_ignored_toggle(totals.ignored)
 
     def _update_ignored_toggle(self, count: int):
         """Refresh the quiet ignored link. Hidden when nothing is ignored; if the
@@ -588,9 +668,19 @@ class ComparisonWidget(QWidget):
         self.ignored_btn.setVisible(True)
         self.ignored_btn.setText(f"{count} ignored")
 
+    def _update_flagged_toggle(self):
+        """Show the flagged link with the duplicate / stale row count."""
+        count = self.model.flagged_count()
+        self.flagged_btn.setVisible(count > 0)
+        self.flagged_btn.setText(f"{count} flagged")
+        if count == 0 and self._only_flagged:
+            self._reset_filter()
+
     def _selection_label(self) -> str:
         if self._only_ignored:
             return "ignored"
+        if self._only_flagged:
+            return "duplicates / stale"
         if not self._selected:
             return "all"
         if self._selected == set(DEFAULT_SELECTION):
@@ -614,7 +704,7 @@ class ComparisonWidget(QWidget):
     def has_results(self) -> bool:
         return self.model.rowCount() > 0
 
-    def get_results(self) -> List[ComparisonRow]:
+    def get_results(self) -> ColumnarRows:
         return self.model.get_all_data()
 
     def get_raw_data(self) -> dict:
@@ -622,8 +712,11 @@ class ComparisonWidget(QWidget):
 
     def clear_results(self):
         self.model.clear()
+        self._result = None
+        self._aggregates = OrgAggregates()
         self._all_orgs = []
         self._raw_data = {}
         self._update_org_button_label()
-        self._update_summary([])
+        self._update_summary()
+        self._update_flagged_toggle()
         self.stack.setCurrentIndex(PAGE_EMPTY)
@@ -1,8 +1,11 @@
 """Modal dialog for inspecting and saving raw API response data."""
 
 import json
+import os
+from concurrent.futures import Future
+from typing import Dict, Optional
 
-from PySide6.QtCore import Slot
+from PySide6.QtCore import QCoreApplication, QObject, Signal, Slot
 from PySide6.QtWidgets import (
     QDialog,
     QFileDialog,
@@ -14,13 +17,36 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
+from const import DEBUG_DUMP_DIR
+from utils.dumps import DumpWriter
+
+
+class _DumpRelay(QObject):
+    """Carries a finished dump's Future from the dump thread to the GUI thread.
+
+    Owned by the application rather than the dialog, so a dump finishing
+    after the dialog has closed emits into a live object with nothing
+    connected. Qt (not Python) deletes it, on the GUI thread.
+    """
+
+    # Emitted (from the dump thread) with the finished dump's Future.
+    finished = Signal(object)
+
+    def forward(self, future: Future):
+        # Runs on the dump thread. deleteLater is queued behind the signal,
+        # so the relay is deleted on the GUI thread once it has been handled.
+        self.finished.emit(future)
+        self.deleteLater()
+
 
 class DebugDialog(QDialog):
     """Show the raw Syncro/Huntress payloads from the last comparison run."""
 
-    def __init__(self, raw_data: dict, parent=None):
+    def __init__(self, raw_data: dict, parent=None, settings: Optional[Dict] = None):
         super().__init__(parent)
         self._raw_data = raw_data or {}
+        self._settings = settings or {}
+        self._relay: Optional[_DumpRelay] = None
         self.setWindowTitle("Debug data")
         self.setMinimumSize(640, 480)
         self._setup_ui()
@@ -67,15 +93,45 @@ class DebugDialog(QDialog):
         folder = QFileDialog.getExistingDirectory(self, "Select folder for debug files")
         if not folder:
             return
+        # Serialized on the dump thread; the result comes back through the
+        # relay's (queued) finished signal. Old runs are rotated out only in
+        # the app's own dump folder, never in one the user picked.
+        self.save_btn.setEnabled(False)
+        self.save_btn.setText("Saving…")
+        rotate = os.path.realpath(folder) == os.path.realpath(DEBUG_DUMP_DIR)
+        writer = DumpWriter.from_settings(self._settings, folder, rotate=rotate)
+        relay = self._relay = _DumpRelay(QCoreApplication.instance())
+        relay.finished.connect(self._on_dump_finished)
+        future = writer.submit(
+            {
+                "syncro": self._raw_data.get("syncro", []),
+                "huntress": self._raw_data.get("huntress", []),
+                "organizations": self._raw_data.get("organizations", []),
+            }
+        )
+        # The callback must not reference the dialog: the dump thread may
+        # drop the last reference to it, and widgets die on the GUI thread.
+        future.add_done_callback(relay.forward)
+        writer.close(wait=False)
+
+    def done(self, result: int):
+        # accept, reject and the window's close button all end here: stop
+        # listening for a dump still being written.
+        if self._relay is not None:
+            self._relay.finished.disconnect(self._on_dump_finished)
+            self._relay = None
+        super().done(result)
+
+    @Slot(object)
+    def _on_dump_finished(self, future: Future):
+        self._relay = None
+        self.save_btn.setEnabled(True)
+        self.save_btn.setText("Save to folder…")
         try:
-            syncro_path = f"{folder}/debug_syncro.json"
-            with open(syncro_path, "w") as f:
-                json.dump(self._raw_data.get("syncro", []), f, indent=2, default=str)
-            huntress_path = f"{folder}/debug_huntress.json"
-            with open(huntress_path, "w") as f:
-                json.dump(self._raw_data.get("huntress", []), f, indent=2, default=str)
-            QMessageBox.information(
-                self, "Saved", f"Debug data saved to:\n{syncro_path}\n{huntress_path}"
-            )
-        except IOError as e:
+            paths = future.result()
+        except (IOError, ValueError) as e:
             QMessageBox.critical(self, "Error", f"Failed to save debug data: {e}")
+            return
+        QMessageBox.information(
+            self, "Saved", "Debug data saved to:\n" + "\n".join(paths)
+        )
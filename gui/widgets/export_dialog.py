@@ -1,6 +1,6 @@
 """Export dialog for saving comparison results."""
 
-from typing import List, Optional, Set
+from typing import Container, Optional
 
 from PySide6.QtCore import Slot
 from PySide6.QtWidgets import (
@@ -18,8 +18,18 @@ from PySide6.QtWidgets import (
 )
 
 from const import STATUS_OK
-from services.comparison import ComparisonRow
-from utils.output import write_ascii_table, write_csv
+from services.columnar import ColumnarRows
+from services.comparison import RowSequence
+from utils.output import export_rows, write_ascii_table
+
+# Combo text -> (writer format, file dialog filter, default extension).
+EXPORT_FORMATS = {
+    "CSV": ("csv", "CSV Files (*.csv);;All Files (*)", ".csv"),
+    "JSON Lines": ("jsonl", "JSON Lines Files (*.jsonl);;All Files (*)", ".jsonl"),
+    "Parquet": ("parquet", "Parquet Files (*.parquet);;All Files (*)", ".parquet"),
+    "HTML Report": ("html", "HTML Files (*.html);;All Files (*)", ".html"),
+    "ASCII Table": ("ascii", "Text Files (*.txt);;All Files (*)", ".txt"),
+}
 
 
 class ExportDialog(QDialog):
@@ -27,12 +37,12 @@ class ExportDialog(QDialog):
 
     def __init__(
         self,
-        results: List[ComparisonRow],
-        ignored_keys: Optional[Set[str]] = None,
+        results: RowSequence,
+        ignored_keys: Optional[Container[str]] = None,
         parent=None,
     ):
         super().__init__(parent)
-        self.results = results
+        self.results = ColumnarRows.from_rows(results)
         self.ignored_keys = ignored_keys or set()
         self.setWindowTitle("Export Results")
         self.setMinimumWidth(400)
@@ -47,7 +57,7 @@ class ExportDialog(QDialog):
         format_layout = QFormLayout(format_group)
 
         self.format_combo = QComboBox()
-        self.format_combo.addItems(["CSV", "ASCII Table"])
+        self.format_combo.addItems(list(EXPORT_FORMATS))
         format_layout.addRow("Format:", self.format_combo)
 
         layout.addWidget(format_group)
@@ -77,7 +87,7 @@ class ExportDialog(QDialog):
 
         # Summary
         total = len(self.results)
-        issues = sum(1 for r in self.results if r.status != STATUS_OK)
+        issues = total - self.results.status_counts()[0][STATUS_OK]
         self.summary_label = QPushButton(
             f"Ready to export {total} rows ({issues} issues)"
         )
@@ -102,13 +112,7 @@ class ExportDialog(QDialog):
     @Slot()
     def _browse_file(self):
         """Open file browser dialog."""
-        format_text = self.format_combo.currentText()
-        if format_text == "CSV":
-            filter_str = "CSV Files (*.csv);;All Files (*)"
-            default_ext = ".csv"
-        else:
-            filter_str = "Text Files (*.txt);;All Files (*)"
-            default_ext = ".txt"
+        _, filter_str, default_ext = EXPORT_FORMATS[self.format_combo.currentText()]
 
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save Export File", "", filter_str
@@ -132,7 +136,7 @@ class ExportDialog(QDialog):
         # Filter results if needed
         results = self.results
         if self.only_issues_checkbox.isChecked():
-            results = [r for r in results if r.status != STATUS_OK]
+            results = results.exclude_status(STATUS_OK)
 
         if not results:
             QMessageBox.warning(
@@ -141,11 +145,12 @@ class ExportDialog(QDialog):
             return
 
         try:
-            format_text = self.format_combo.currentText()
-            if format_text == "CSV":
-                write_csv(file_path, results, self.ignored_keys)
-            else:
+            fmt, _, _ = EXPORT_FORMATS[self.format_combo.currentText()]
+            if fmt == "ascii":
                 write_ascii_table(file_path, results, ignored_keys=self.ignored_keys)
+            else:
+                # Errors propagate (unlike write_csv); .gz / .zst are compressed.
+                export_rows(fmt, file_path, results, self.ignored_keys)
 
             QMessageBox.information(
                 self,
@@ -154,5 +159,5 @@ class ExportDialog(QDialog):
             )
             self.accept()
 
-        except IOError as e:
+        except (IOError, ValueError) as e:
             QMessageBox.critical(self, "Error", f"Failed to export: {e}")
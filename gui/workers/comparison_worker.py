@@ -1,11 +1,15 @@
 """Worker thread for running comparison operations."""
 
-from typing import Dict
+from typing import Dict, Optional
 
 from PySide6.QtCore import QThread, Signal
 
 from api.client import HuntressClient, SyncroClient
-from services.comparison import ComparisonService
+from api.decoding import ProcessPoolDecoder
+from services import normalization
+from services.comparison import ComparisonResult, ComparisonService
+from services.ignore_rules import IgnoreRules
+from services.org_mapping import OrgMapping
 
 
 class ComparisonWorker(QThread):
@@ -13,13 +17,27 @@ class ComparisonWorker(QThread):
 
     progress = Signal(str)
     error = Signal(str)
-    result = Signal(list)  # List of (syncro, huntress, status) tuples
-    raw_data = Signal(dict)  # {"syncro": [...], "huntress": [...]}
+    result = Signal(object)  # ColumnarRows (or a row list)
+    comparison = Signal(object)  # The full ComparisonResult (emitted first)
+    raw_data = Signal(dict)  # {"syncro", "huntress", "organizations"} -> [...]
+    unchanged = Signal()  # Fetched data matched ``previous``; nothing rebuilt
     finished_work = Signal()
 
-    def __init__(self, settings: Dict, parent=None):
+    def __init__(
+        self,
+        settings: Dict,
+        parent=None,
+        previous: Optional[ComparisonResult] = None,
+        organization: Optional[str] = None,
+    ):
+        """With ``previous`` and ``organization`` only that organization is
+        re-fetched and spliced into ``previous`` (``refresh_org``). A full run
+        with ``previous`` emits ``unchanged`` (instead of the result signals)
+        when the fetched data hashes the same."""
         super().__init__(parent)
         self.settings = settings
+        self.previous = previous
+        self.organization = organization
         self._is_cancelled = False
 
     def cancel(self):
@@ -28,6 +46,7 @@ class ComparisonWorker(QThread):
 
     def run(self):
         """Execute the comparison operation."""
+        decoder = None
         try:
             self.progress.emit("Initializing clients...")
 
@@ -39,16 +58,45 @@ class ComparisonWorker(QThread):
                 api_key=self.settings["HuntressAPIKey"],
                 secret_key=self.settings["HuntressSecretKey"],
             )
+            if self.settings.get("DecodeWorkers"):
+                decoder = ProcessPoolDecoder(int(self.settings["DecodeWorkers"]))
+                syncro_client.decoder = huntress_client.decoder = decoder
 
+            normalization.configure(unicode=bool(self.settings.get("UnicodeHostnames")))
             service = ComparisonService(syncro_client, huntress_client)
 
             if self._is_cancelled:
                 return
 
-            self.progress.emit("Fetching and comparing data...")
-            # the ThreadPoolExecutor. For now, we wait for the service
-            # to return the full result.
-            comparison_result = service.fetch_and_compare(mismatches_first=True)
+            org_mapping = None
+            if self.settings.get("OrgScopedMatching"):
+                org_mapping = OrgMapping.load()
+
+            options = dict(
+                mismatches_first=True,
+                ignored_keys=IgnoreRules.from_settings(self.settings),
+                stale_after_days=self.settings.get("StaleAfterDays"),
+                org_mapping=org_mapping,
+            )
+            if self.organization and self.previous is not None:
+                self.progress.emit(f"Refreshing {self.organization}...")
+                comparison_result = service.refresh_org(
+                    self.previous, self.organization, **options
+                )
+            else:
+                self.progress.emit("Fetching and comparing data...")
+                # the ThreadPoolExecutor. For now, we wait for the service
+                # to return the full result.
+                comparison_result = service.fetch_and_compare(
+                    columnar=True, previous=self.previous, **options
+                )
+                if self.previous is not None and comparison_result is self.previous:
+                    self.unchanged.emit()
+                    self.progress.emit("No changes since the last run")
+                    self.finished_work.emit()
+                    return
+                if org_mapping is not None:
+                    org_mapping.save()
 
             if self._is_cancelled:
                 return
@@ -58,15 +106,20 @@ class ComparisonWorker(QThread):
                 {
                     "syncro": comparison_result.syncro_assets,
                     "huntress": comparison_result.huntress_agents,
+                    "organizations": service.organizations(),
                 }
             )
 
             if self._is_cancelled:
                 return
 
+            self.comparison.emit(comparison_result)
             self.result.emit(comparison_result.rows)
             self.progress.emit("Comparison complete")
             self.finished_work.emit()
 
         except Exception as e:
             self.error.emit(str(e))
+        finally:
+            if decoder is not None:
+                decoder.close()
@@ -1,16 +1,69 @@
 import argparse
-import json
-import os
 import sys
+from itertools import repeat
 
 from rich.console import Console
+from rich.table import Table
 
 from api.client import HuntressClient, SyncroClient
+from api.decoding import ProcessPoolDecoder
+from api.offline import offline_clients
 from config import ConfigurationError, load_settings
-from services.comparison import ComparisonService
-from utils.output import RichSpinner, print_colored_table, write_ascii_table, write_csv
+from const import ORG_MAPPING_FILE, SNAPSHOT_DB_FILE
+from services import normalization
+from services.aggregates import OrgAggregates
+from services.columnar import ColumnarRows
+from services.comparison import (
+    FLAG_DUPLICATE,
+    FLAG_STALE,
+    ORDER_MISMATCHES_FIRST,
+    ORDER_OK_FIRST,
+    ORDERINGS,
+    ComparisonService,
+)
+from services.diff import diff_rows
+from services.filters import FilterError, RowFilter, compile_filter, iter_records
+from services.ignore_rules import IgnoreRules
+from services.org_mapping import OrgMapping
+from services.snapshots import SnapshotError, SnapshotStore
+from services.sources import parse_source_spec
+from utils.dumps import DumpWriter
+from utils.org_export import INDEX_FILENAME, export_by_org
+from utils.output import (
+    EXPORT_WRITERS,
+    RichSpinner,
+    export_rows,
+    print_colored_table,
+    print_diff_table,
+    print_duplicates,
+    print_ignore_hits,
+    print_org_summary,
+    print_presence_table,
+    print_run_stats,
+    read_csv,
+    stream_ascii_table,
+    write_diff_csv,
+    write_diff_json,
+    write_presence_csv,
+)
+from utils.sqlite_export import export_sqlite
 
 console = Console()
+err_console = Console(stderr=True)
+
+
+def _where_filter(value: str) -> RowFilter:
+    try:
+        return compile_filter(value)
+    except FilterError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _row_limit(value: str) -> int:
+    limit = int(value)
+    if limit < 0:
+        raise argparse.ArgumentTypeError("must be zero or more")
+    return limit
 
 
 def create_parser():
@@ -22,17 +75,67 @@ def create_parser():
         action="store_true",
         help="Compare Syncro and Huntress agents",
     )
-    parser.add_argument("-o", "--output", metavar="FILE", help="Output results to file")
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="Output results to file ('-' writes CSV, JSON Lines or ASCII to "
+        "stdout; .gz and .zst files are compressed)",
+    )
+    parser.add_argument(
+        "--sqlite",
+        metavar="FILE",
+        help="Append the run (every row, the source assets and agents, and run "
+        "metadata) to an indexed SQLite database for ad-hoc queries",
+    )
+    parser.add_argument(
+        "--split-by-org",
+        metavar="DIR",
+        help="Write one --format file per organization into DIR, plus an "
+        "index.csv of per-organization counts",
+    )
     parser.add_argument(
         "-f",
         "--format",
-        choices=["csv", "ascii"],
+        choices=["csv", "jsonl", "parquet", "html", "ascii"],
         default="csv",
         help="Output file format (default: csv)",
     )
+    parser.add_argument(
+        "--compress",
+        choices=["gzip", "zstd"],
+        default=None,
+        help="Compress CSV / JSON Lines / ASCII output (default: by file "
+        "extension); for Parquet, the column codec",
+    )
+    parser.add_argument(
+        "--max-width",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Cap ASCII table columns at N characters, truncating longer cells",
+    )
     parser.add_argument(
         "--no-color", action="store_true", help="Disable colored output"
     )
+    parser.add_argument(
+        "--limit",
+        type=_row_limit,
+        default=None,
+        metavar="N",
+        help="Print at most N rows to the console (files get every row)",
+    )
+    parser.add_argument(
+        "--pager",
+        action="store_true",
+        help="Page the console table through $PAGER (default: less -R)",
+    )
+    parser.add_argument(
+        "--sort",
+        choices=ORDERINGS,
+        default=None,
+        help="Row order for console and file output (default: OK first)",
+    )
     parser.add_argument(
         "--org",
         metavar="NAME",
@@ -47,115 +150,534 @@ def create_parser():
         default=[],
         help="Hide this organization (repeatable)",
     )
+    parser.add_argument(
+        "--where",
+        type=_where_filter,
+        metavar="EXPR",
+        help='Show only rows matching EXPR, e.g. \'status != "OK!" and '
+        'org ~ "dental" and syncro ~ "^srv"\' (fields: org, syncro, huntress, '
+        "host, status, key, notes; flags: ignored, flagged, duplicate, stale, "
+        "matched)",
+    )
     parser.add_argument(
         "--show-ignored",
         action="store_true",
         help="Include ignored assets in the output",
     )
+    parser.add_argument(
+        "--org-scoped",
+        action="store_true",
+        help="Match hosts per organization (Syncro customer paired with a "
+        "Huntress organization) instead of by hostname alone",
+    )
+    parser.add_argument(
+        "--org-mapping",
+        metavar="FILE",
+        default=ORG_MAPPING_FILE,
+        help=f"Organization mapping file (default: {ORG_MAPPING_FILE})",
+    )
+    parser.add_argument(
+        "--source",
+        metavar="NAME=CSV",
+        action="append",
+        default=[],
+        help="Also reconcile a CSV inventory (AV console export, AD computer "
+        "list) against Syncro and Huntress (repeatable)",
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="Show only hostnames held by more than one record in a source",
+    )
+    parser.add_argument(
+        "--stale",
+        action="store_true",
+        help="Show only rows not checked in within StaleAfterDays",
+    )
+    parser.add_argument(
+        "--by-org",
+        action="store_true",
+        help="Print per-organization counts instead of the full table",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Save the comparison result to the snapshot database",
+    )
+    parser.add_argument(
+        "--list-snapshots",
+        action="store_true",
+        help="List saved snapshots and exit",
+    )
+    parser.add_argument(
+        "--open-snapshot",
+        metavar="ID",
+        help="Show a saved snapshot (an id or 'latest') instead of fetching",
+    )
+    parser.add_argument(
+        "--snapshot-db",
+        metavar="FILE",
+        default=SNAPSHOT_DB_FILE,
+        help=f"Snapshot database file (default: {SNAPSHOT_DB_FILE})",
+    )
+    parser.add_argument(
+        "--from-dump",
+        metavar="DIR",
+        help="Compare the newest debug dump run in DIR (or a stored snapshot's "
+        "payloads: snapshot:ID or snapshot:latest) instead of calling the APIs",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Report rows that changed between two results. Each side is a "
+        "snapshot id, 'latest', 'previous', or a CSV export",
+    )
 
     return parser
 
 
-def _apply_filters(rows, args, settings):
-    """Apply org include/exclude and ignore filters to comparison rows."""
+def _apply_filters(rows, args, settings, keep_ignored=False):
+    """Apply org include/exclude and ignore filters to comparison rows.
+
+    Accepts a row list or a ``ColumnarRows`` store and returns the same kind,
+    plus the compiled ``IgnoreRules``. Columnar rows are matched against the
+    rules at most once (their ``ignored`` bitmap is reused when present).
+    ``keep_ignored`` keeps ignored rows as if ``--show-ignored`` were given.
+    """
     from services.comparison import row_key
 
     include = {o for o in args.org}
     exclude = {o for o in args.exclude_org} | set(
         settings.get("ExcludedOrganizations", [])
     )
-    ignored_keys = set(settings.get("IgnoredAssets", []))
+    ignore_rules = IgnoreRules.from_settings(settings)
+    flag_mask = (FLAG_DUPLICATE if args.duplicates else 0) | (
+        FLAG_STALE if args.stale else 0
+    )
+
+    where = args.where
+    show_ignored = args.show_ignored or keep_ignored
+
+    columnar = isinstance(rows, ColumnarRows)
+    if columnar and rows.ignored is None:
+        rows.mark_ignored(ignore_rules)
+    if where is not None:
+        # Full records for the --where predicate, read in the same pass.
+        fields = (
+            (record[0], record[6], record[5], record)
+            for record in iter_records(rows, ignore_rules)
+        )
+    elif columnar:
+        fields = zip(rows.iter_orgs(), rows.ignored, rows.flags, repeat(None))
+    else:
+        fields = (
+            (row.organization, row_key(row) in ignore_rules, row.flags, None)
+            for row in rows
+        )
 
-    filtered = []
-    for row in rows:
-        if include and row.organization not in include:
+    kept = []
+    for index, (organization, ignored, flags, record) in enumerate(fields):
+        if include and organization not in include:
             continue
-        if row.organization in exclude:
+        if organization in exclude:
             continue
-        if not args.show_ignored and row_key(row) in ignored_keys:
+        if not show_ignored and ignored:
             continue
-        filtered.append(row)
+        if flag_mask and not flags & flag_mask:
+            continue
+        if where is not None and not where.predicate(record):
+            continue
+        kept.append(index)
+
+    filtered = rows.take(kept) if columnar else [rows[i] for i in kept]
+    return filtered, ignore_rules
+
+
+def _print_by_org(result, args, settings):
+    """Print the per-organization aggregates, honoring the org filters.
+
+    When ``--where``, ``--duplicates`` or ``--stale`` narrow the rows, the
+    counts are rebuilt from the filtered rows (ignored ones kept and counted
+    as ignored) so they agree with the table those flags would print.
+    """
+    if args.where is not None or args.duplicates or args.stale:
+        rows, ignore_rules = _apply_filters(
+            result.rows, args, settings, keep_ignored=True
+        )
+        aggregates = OrgAggregates.build(rows, ignore_rules)
+    else:
+        aggregates = result.aggregates or OrgAggregates.build(
+            result.rows, IgnoreRules.from_settings(settings)
+        )
+    aggregates.set_excluded(
+        set(args.exclude_org) | set(settings.get("ExcludedOrganizations", []))
+    )
+    print_org_summary(aggregates, not args.no_color, include=set(args.org))
 
-    return filtered, ignored_keys
+
+def _export_sqlite(result, args, settings):
+    """Append the unfiltered result to the ``--sqlite`` database."""
+    try:
+        counts = export_sqlite(args.sqlite, result, IgnoreRules.from_settings(settings))
+        console.print(
+            f"[green]Exported run {counts['run_id']} to {args.sqlite} "
+            f"({counts['rows']} rows)[/green]"
+        )
+    except Exception as e:
+        console.print(f"[red]Failed to export to {args.sqlite}: {e}[/red]")
+
+
+def _emit_result(result, args, settings):
+    """Filter a comparison result and write it to the file and/or console."""
+    if args.sqlite:
+        _export_sqlite(result, args, settings)
+    if args.by_org:
+        _print_by_org(result, args, settings)
+        return
+
+    # Apply org/ignore filters
+    rows, ignored_keys = _apply_filters(result.ordered(args.sort), args, settings)
+
+    # Output Results. Status messages go to stderr when rows go to stdout.
+    status_console = err_console if args.output == "-" else console
+    if args.split_by_org:
+        try:
+            exports = export_by_org(
+                args.split_by_org, args.format, rows, ignored_keys, args.compress
+            )
+            status_console.print(
+                f"[green]Wrote {len(exports)} organization files to "
+                f"{args.split_by_org} (index: {INDEX_FILENAME})[/green]"
+            )
+        except Exception as e:
+            status_console.print(
+                f"[red]Failed to split results into {args.split_by_org}: {e}[/red]"
+            )
+    if args.output == "-":
+        # Rows on stdout for piping; status goes to stderr, no console table.
+        if args.format == "parquet":
+            err_console.print("[red]Parquet output cannot be written to stdout[/red]")
+            return
+        if args.format == "ascii":
+            count, size = stream_ascii_table(
+                "-",
+                rows,
+                result.syncro_count,
+                result.huntress_count,
+                ignored_keys=ignored_keys,
+                max_width=args.max_width,
+                compression=args.compress,
+            )
+        else:
+            count, size = export_rows(
+                args.format, "-", rows, ignored_keys, args.compress
+            )
+        err_console.print(f"Wrote {count} rows ({size:,} bytes) to stdout")
+        return
+    if args.output:
+        try:
+            if args.format in EXPORT_WRITERS:
+                count, size = export_rows(
+                    args.format, args.output, rows, ignored_keys, args.compress
+                )
+                console.print(
+                    f"[green]Results written to {args.output} "
+                    f"({count} rows, {size:,} bytes)[/green]"
+                )
+            elif args.format == "ascii":
+                count, size = stream_ascii_table(
+                    args.output,
+                    rows,
+                    result.syncro_count,
+                    result.huntress_count,
+                    ignored_keys=ignored_keys,
+                    max_width=args.max_width,
+                    compression=args.compress,
+                )
+                console.print(
+                    f"[green]Results written to {args.output} "
+                    f"({count} rows, {size:,} bytes)[/green]"
+                )
+        except Exception as e:
+            console.print(
+                f"[red]Failed to write {args.format.upper()} "
+                f"{args.output}: {e}[/red]"
+            )
+
+    # Print to console
+    print_colored_table(
+        rows,
+        not args.no_color,
+        result.syncro_count,
+        result.huntress_count,
+        ignored_keys=ignored_keys,
+        limit=args.limit,
+        pager=args.pager,
+    )
+    if args.duplicates and result.duplicates:
+        print_duplicates(result.duplicates)
+
+
+def _unsupported_with_sources(args):
+    """Options the N-way ``--source`` comparison cannot honor (its rows are
+    per-source presence rows, not Syncro/Huntress pairs, written only as a
+    console table and a ``-o`` CSV file)."""
+    unsupported = []
+    if args.where is not None:
+        unsupported.append("--where")
+    if args.sort not in (None, ORDER_MISMATCHES_FIRST, ORDER_OK_FIRST):
+        unsupported.append(f"--sort {args.sort}")
+    if args.format != "csv":
+        unsupported.append(f"--format {args.format}")
+    if args.output == "-":
+        unsupported.append("--output -")
+    for flag in (
+        "duplicates",
+        "stale",
+        "by_org",
+        "split_by_org",
+        "sqlite",
+        "snapshot",
+        "open_snapshot",
+        "limit",
+        "pager",
+        "org_scoped",
+        "compress",
+        "max_width",
+    ):
+        if getattr(args, flag):
+            unsupported.append("--" + flag.replace("_", "-"))
+    return unsupported
+
+
+def _run_sources(service, args, settings):
+    """N-way comparison of Syncro, Huntress and the ``--source`` CSV files."""
+    sources = service.default_sources() + [
+        parse_source_spec(spec) for spec in args.source
+    ]
+    with RichSpinner("Fetching and comparing inventories..."):
+        comparison = service.compare_sources(
+            sources, mismatches_first=args.sort == ORDER_MISMATCHES_FIRST
+        )
+
+    include = set(args.org)
+    exclude = set(args.exclude_org) | set(settings.get("ExcludedOrganizations", []))
+    ignore_rules = IgnoreRules.from_settings(settings)
+    rows = [
+        row
+        for row in comparison.rows
+        if (not include or row.organization in include)
+        and row.organization not in exclude
+        and (args.show_ignored or row.key not in ignore_rules)
+    ]
+
+    if args.output:
+        write_presence_csv(args.output, comparison, rows)
+        console.print(f"[green]Results written to {args.output}[/green]")
+    print_presence_table(comparison, rows, not args.no_color)
+
+
+def _list_snapshots(args):
+    with SnapshotStore(args.snapshot_db) as store:
+        snapshots = store.list_snapshots()
+    if not snapshots:
+        console.print(f"No snapshots in {args.snapshot_db}")
+        return
+    table = Table(show_header=True, header_style="bold")
+    for header in ("ID", "Taken (UTC)", "Label", "Syncro", "Huntress", "Rows"):
+        table.add_column(header)
+    for info in snapshots:
+        table.add_row(
+            str(info.id),
+            info.created_at,
+            info.label or "",
+            str(info.syncro_count),
+            str(info.huntress_count),
+            str(info.row_count),
+        )
+    console.print(table)
+
+
+def _open_snapshot(args, settings):
+    snapshot_id = None if args.open_snapshot == "latest" else int(args.open_snapshot)
+    with SnapshotStore(args.snapshot_db) as store:
+        result = store.load(snapshot_id)
+    console.print(f"[bold]Snapshot taken {result.created_at}[/bold]")
+    _emit_result(result, args, settings)
+
+
+def _load_diff_source(source: str, snapshot_db: str):
+    """Rows for one side of ``--diff``: a snapshot reference or a CSV export."""
+    if source.isdigit() or source in ("latest", "previous"):
+        with SnapshotStore(snapshot_db) as store:
+            if source.isdigit():
+                snapshot_id = int(source)
+            else:
+                ids = [info.id for info in store.list_snapshots(limit=2)]
+                position = 0 if source == "latest" else 1
+                if len(ids) <= position:
+                    raise SnapshotError(f"No '{source}' snapshot in {snapshot_db}")
+                snapshot_id = ids[position]
+            return store.load(snapshot_id).rows
+    return read_csv(source)
+
+
+def _run_diff(args):
+    old_source, new_source = args.diff
+    report = diff_rows(
+        _load_diff_source(old_source, args.snapshot_db),
+        _load_diff_source(new_source, args.snapshot_db),
+    )
+    if args.output:
+        if args.output.lower().endswith(".json"):
+            write_diff_json(args.output, report)
+        else:
+            write_diff_csv(args.output, report)
+        console.print(f"[green]Changes written to {args.output}[/green]")
+    print_diff_table(report, not args.no_color)
 
 
 def main():
     parser = create_parser()
     args = parser.parse_args()
 
+    if args.list_snapshots:
+        try:
+            _list_snapshots(args)
+        except SnapshotError as e:
+            console.print(f"[bold red]Snapshot Error:[/bold red] {e}")
+            sys.exit(1)
+        return
+
+    if args.diff:
+        try:
+            _run_diff(args)
+        except (SnapshotError, ValueError, OSError) as e:
+            console.print(f"[bold red]Diff Error:[/bold red] {e}")
+            sys.exit(1)
+        return
+
+    if not (args.compare or args.open_snapshot or args.from_dump):
+        parser.print_help()
+        return
+
+    if args.source:
+        unsupported = _unsupported_with_sources(args)
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --source")
+
     try:
-        settings = load_settings()
+        # Opening a snapshot or comparing saved dumps never talks to the APIs,
+        # so credentials are optional.
+        settings = load_settings(
+            require_credentials=bool(args.compare and not args.from_dump)
+        )
     except ConfigurationError as e:
         console.print(f"[bold red]Configuration Error:[/bold red] {e}")
         sys.exit(1)
 
-    if args.compare:
+    normalization.configure(unicode=bool(settings.get("UnicodeHostnames")))
+
+    if args.open_snapshot:
         try:
-            # Initialize Clients
+            _open_snapshot(args, settings)
+        except (SnapshotError, ValueError) as e:
+            console.print(f"[bold red]Snapshot Error:[/bold red] {e}")
+            sys.exit(1)
+        return
+
+    decoder = None
+    dumps = dump_future = None
+    try:
+        # Initialize Clients
+        if args.from_dump:
+            # Replay saved payloads: no network, no rate limits.
+            syncro_client, huntress_client = offline_clients(
+                args.from_dump, args.snapshot_db
+            )
+        else:
             syncro_client = SyncroClient(
-                api_key=settings["SyncroAPIKey"], subdomain=settings["SyncroSubDomain"]
+                api_key=settings["SyncroAPIKey"],
+                subdomain=settings["SyncroSubDomain"],
             )
             huntress_client = HuntressClient(
                 api_key=settings["HuntressAPIKey"],
                 secret_key=settings["HuntressSecretKey"],
             )
+        if settings.get("DecodeWorkers") and not args.from_dump:
+            # Decode large pages in worker processes instead of client threads.
+            decoder = ProcessPoolDecoder(int(settings["DecodeWorkers"]))
+            syncro_client.decoder = huntress_client.decoder = decoder
 
-            # Initialize Service
-            service = ComparisonService(syncro_client, huntress_client)
-
-            # Fetch and Compare
-            with RichSpinner("Fetching and comparing agents..."):
-                result = service.fetch_and_compare(mismatches_first=False)
-
-            # Debug Output
-            if settings.get("Debug"):
-                os.makedirs("debug", exist_ok=True)
-                with open("debug/agentDumpSyncro.json", "w") as f:
-                    json.dump(result.syncro_assets, f, indent=4)
-                with open("debug/agentDumpHuntress.json", "w") as f:
-                    json.dump(result.huntress_agents, f, indent=4)
-
-            # Apply org/ignore filters
-            rows, ignored_keys = _apply_filters(result.rows, args, settings)
-
-            # Output Results
-            if args.output:
-                try:
-                    if args.format == "csv":
-                        write_csv(args.output, rows, ignored_keys)
-                    elif args.format == "ascii":
-                        write_ascii_table(
-                            args.output,
-                            rows,
-                            result.syncro_count,
-                            result.huntress_count,
-                            ignored_keys=ignored_keys,
-                        )
-                    console.print(f"[green]Results written to {args.output}[/green]")
-                except Exception as e:
-                    console.print(
-                        f"[red]Failed to write {args.format.upper()} "
-                        f"{args.output}: {e}[/red]"
-                    )
-
-            # Print to console
-            print_colored_table(
-                rows,
-                not args.no_color,
-                result.syncro_count,
-                result.huntress_count,
-                ignored_keys=ignored_keys,
-            )
+        # Initialize Service
+        service = ComparisonService(syncro_client, huntress_client)
 
-        except Exception as e:
-            console.print(
-                f"[bold red]An error occurred during comparison:[/bold red] {e}"
+        if args.source:
+            _run_sources(service, args, settings)
+            return
+
+        # Fetch and Compare
+        ignore_rules = IgnoreRules.from_settings(settings)
+        org_mapping = name_mapping = None
+        if args.org_scoped or settings.get("OrgScopedMatching"):
+            org_mapping = OrgMapping.load(args.org_mapping)
+        elif args.org:
+            # Only pairs --org names across the two APIs; matching stays by host.
+            name_mapping = OrgMapping.load(args.org_mapping)
+        with RichSpinner("Fetching and comparing agents..."):
+            result = service.fetch_and_compare(
+                mismatches_first=False,
+                columnar=True,
+                ignored_keys=ignore_rules,
+                stale_after_days=settings.get("StaleAfterDays"),
+                org_mapping=org_mapping,
+                # Only fetch the requested organizations' records.
+                organizations=args.org or None,
+                name_mapping=name_mapping,
             )
-            if settings.get("Debug"):
-                console.print_exception()
-            sys.exit(1)
-    else:
-        parser.print_help()
+        if org_mapping is not None and not args.org:
+            # Keep the refreshed derived pairs (and the overrides) for next time.
+            org_mapping.save(args.org_mapping)
+
+        # Debug Output: payload dumps are written in the background.
+        if settings.get("Debug"):
+            if not args.from_dump:
+                dumps = DumpWriter.from_settings(settings)
+                dump_future = dumps.submit(
+                    {
+                        "syncro": result.syncro_assets,
+                        "huntress": result.huntress_agents,
+                        "organizations": service.organizations(),
+                    }
+                )
+            print_ignore_hits(ignore_rules)
+            print_run_stats(result.stats)
+
+        if args.snapshot:
+            with SnapshotStore(args.snapshot_db) as store:
+                snapshot_id = store.save(result)
+            console.print(f"[green]Saved snapshot {snapshot_id}[/green]")
+
+        _emit_result(result, args, settings)
+
+        if dump_future is not None:
+            try:
+                paths = dump_future.result()
+                console.print(f"Debug dumps written: {', '.join(paths)}")
+            except Exception as e:
+                console.print(f"[yellow]Failed to write debug dumps: {e}[/yellow]")
+
+    except Exception as e:
+        console.print(f"[bold red]An error occurred during comparison:[/bold red] {e}")
+        if settings.get("Debug"):
+            console.print_exception()
+        sys.exit(1)
+    finally:
+        if decoder is not None:
+            decoder.close()
+        if dumps is not None:
+            dumps.close()
 
 
 if __name__ == "__main__":
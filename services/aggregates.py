@@ -0,0 +1,120 @@
+"""Per-organization status counts for a comparison result."""
+
+from dataclasses import dataclass, fields, replace
+from typing import Container, Dict, Iterable, List, Optional, Set
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import RowSequence, row_key
+
+# Status string -> OrgCounts field it is tallied under.
+STATUS_FIELDS: Dict[str, str] = {
+    STATUS_OK: "ok",
+    STATUS_MISSING_HUNTRESS: "missing_huntress",
+    STATUS_MISSING_SYNCRO: "missing_syncro",
+}
+
+
+@dataclass
+class OrgCounts:
+    """Row counts for one organization. Ignored rows only count as ``ignored``."""
+
+    ok: int = 0
+    missing_huntress: int = 0
+    missing_syncro: int = 0
+    ignored: int = 0
+
+    @property
+    def total(self) -> int:
+        """Non-ignored rows."""
+        return self.ok + self.missing_huntress + self.missing_syncro
+
+    def add(self, other: "OrgCounts") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+class OrgAggregates:
+    """Status counts per organization, plus totals over the shown orgs.
+
+    Built in the same pass that emits the rows. Ignoring a row or excluding
+    an organization updates the counts in place (``set_ignored`` /
+    ``set_excluded``) instead of rescanning the rows; totals are summed over
+    organizations, not rows.
+    """
+
+    def __init__(self):
+        self.by_org: Dict[str, OrgCounts] = {}
+        self.excluded: Set[str] = set()
+
+    @classmethod
+    def build(
+        cls, rows: RowSequence, ignored_keys: Optional[Container[str]] = None
+    ) -> "OrgAggregates":
+        """Aggregate existing rows (results that did not come from the engine).
+
+        A columnar store's ``ignored`` bitmap is used when present.
+        """
+        aggregates = cls()
+        ignored_keys = ignored_keys or set()
+        if isinstance(rows, ColumnarRows):
+            flags = rows.ignored
+            if flags is None:
+                flags = (key in ignored_keys for key in rows.keys)
+            records = zip(rows.iter_orgs(), rows.iter_statuses(), flags)
+        else:
+            records = (
+                (r.organization, r.status, row_key(r) in ignored_keys) for r in rows
+            )
+        for organization, status, ignored in records:
+            aggregates.add(organization, status, bool(ignored))
+        return aggregates
+
+    def copy(self) -> "OrgAggregates":
+        """An independent copy: changing it never touches this one."""
+        other = OrgAggregates()
+        other.by_org = {org: replace(counts) for org, counts in self.by_org.items()}
+        other.excluded = set(self.excluded)
+        return other
+
+    def add(self, organization: str, status: str, ignored: bool = False) -> None:
+        """Count one row."""
+        counts = self.by_org.get(organization)
+        if counts is None:
+            counts = self.by_org[organization] = OrgCounts()
+        if ignored:
+            counts.ignored += 1
+        else:
+            name = STATUS_FIELDS[status]
+            setattr(counts, name, getattr(counts, name) + 1)
+
+    def set_ignored(self, organization: str, status: str, ignored: bool) -> None:
+        """Move one row between its status count and the ignored count."""
+        counts = self.by_org[organization]
+        name = STATUS_FIELDS[status]
+        step = -1 if ignored else 1
+        setattr(counts, name, getattr(counts, name) + step)
+        counts.ignored -= step
+
+    def set_excluded(self, organizations: Iterable[str]) -> None:
+        """Replace the set of organizations left out of ``totals``."""
+        self.excluded = set(organizations)
+
+    def organizations(self) -> List[str]:
+        """Sorted, non-empty organization names."""
+        return sorted(org for org in self.by_org if org)
+
+    def totals(self, include: Optional[Set[str]] = None) -> OrgCounts:
+        """Counts summed over shown organizations.
+
+        ``include`` (when given) limits the sum to those organizations;
+        excluded organizations are always left out.
+        """
+        total = OrgCounts()
+        for organization, counts in self.by_org.items():
+            if organization in self.excluded:
+                continue
+            if include and organization not in include:
+                continue
+            total.add(counts)
+        return total
@@ -0,0 +1,298 @@
+"""Compact column store for comparison rows."""
+
+from array import array
+from typing import Container, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.comparison import ComparisonRow, RowSortKey, make_sort_key, names_key
+
+# Status code -> status string. ``status_codes`` entries index this tuple.
+STATUS_CODES = (STATUS_OK, STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO)
+STATUS_TO_CODE = {status: code for code, status in enumerate(STATUS_CODES)}
+
+
+class ColumnarRows:
+    """Comparison rows stored column-wise.
+
+    Organization names are interned into ``orgs`` and referenced by position
+    from ``org_codes``; statuses are byte codes into ``STATUS_CODES``. Names and
+    normalized row keys are plain string lists. Indexing or iterating yields
+    ``ComparisonRow`` views built on demand, while ``iter_values`` and the
+    column attributes let writers and filters walk the rows without building
+    any row objects.
+
+    ``ignored`` is an optional bitmap (one byte per row, 1 = ignored) filled
+    by the engine or ``mark_ignored`` so consumers can read the ignore state
+    instead of matching every key again. It is None until computed.
+
+    ``sort_keys`` holds each row's ``RowSortKey``, computed once on append,
+    so ``order_indexes`` never re-casefolds names.
+    """
+
+    def __init__(self):
+        self.orgs: List[str] = []
+        self._org_lookup: Dict[str, int] = {}
+        self.org_codes = array("I")
+        self.status_codes = array("B")
+        self.syncro_names: List[str] = []
+        self.huntress_names: List[str] = []
+        self.keys: List[str] = []
+        self.sort_keys: List[RowSortKey] = []
+        # FLAG_* bits per row (duplicates / stale entries).
+        self.flags = array("B")
+        self.ignored: Optional[bytearray] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[ComparisonRow]) -> "ColumnarRows":
+        """Build a store from ``ComparisonRow`` objects (or return it as-is)."""
+        if isinstance(rows, cls):
+            return rows
+        store = cls()
+        for row in rows:
+            store.append(
+                row.syncro_name,
+                row.huntress_name,
+                row.status,
+                row.organization,
+                flags=row.flags,
+                sort_key=row.sort_key,
+            )
+        return store
+
+    @classmethod
+    def from_columns(
+        cls,
+        orgs: List[str],
+        org_codes: Iterable[int],
+        status_codes: Iterable[int],
+        syncro_names: List[str],
+        huntress_names: List[str],
+        keys: List[str],
+        flags: Optional[Iterable[int]] = None,
+    ) -> "ColumnarRows":
+        """Build a store directly from already-encoded columns.
+
+        ``flags`` defaults to all zeros.
+        """
+        store = cls()
+        store.orgs = list(orgs)
+        store._org_lookup = {org: code for code, org in enumerate(store.orgs)}
+        store.org_codes = array("I", org_codes)
+        store.status_codes = array("B", status_codes)
+        store.syncro_names = syncro_names
+        store.huntress_names = huntress_names
+        store.keys = keys
+        store.sort_keys = [
+            make_sort_key(org, syncro, huntress)
+            for org, syncro, huntress in zip(
+                store.iter_orgs(), syncro_names, huntress_names
+            )
+        ]
+        store.flags = array("B", flags if flags is not None else bytes(len(keys)))
+        return store
+
+    @classmethod
+    def concat(cls, parts: Iterable["ColumnarRows"]) -> "ColumnarRows":
+        """Join stores end to end. The ``ignored`` bitmap is kept only when
+        every part has one."""
+        store = cls()
+        flags: Optional[bytearray] = bytearray()
+        for part in parts:
+            for index, values in enumerate(part.iter_values()):
+                organization, syncro, huntress, status = values
+                store.append(
+                    syncro,
+                    huntress,
+                    status,
+                    organization,
+                    part.keys[index],
+                    part.flags[index],
+                    part.sort_keys[index],
+                )
+            if flags is not None and part.ignored is not None:
+                flags.extend(part.ignored)
+            else:
+                flags = None
+        store.ignored = flags
+        return store
+
+    def append(
+        self,
+        syncro_name: str,
+        huntress_name: str,
+        status: str,
+        organization: str = "",
+        key: Optional[str] = None,
+        flags: int = 0,
+        sort_key: Optional[RowSortKey] = None,
+    ) -> None:
+        """Append one row. ``key`` defaults to the row's ``row_key`` and
+        ``sort_key`` to its ``make_sort_key``."""
+        code = self._org_lookup.get(organization)
+        if code is None:
+            code = self._org_lookup[organization] = len(self.orgs)
+            self.orgs.append(organization)
+        self.org_codes.append(code)
+        self.status_codes.append(STATUS_TO_CODE[status])
+        self.syncro_names.append(syncro_name)
+        self.huntress_names.append(huntress_name)
+        if key is None:
+            key = names_key(syncro_name, huntress_name)
+        self.keys.append(key)
+        if sort_key is None:
+            sort_key = make_sort_key(organization, syncro_name, huntress_name)
+        self.sort_keys.append(sort_key)
+        self.flags.append(flags)
+        self.ignored = None
+
+    def mark_ignored(self, ignored_keys: Container[str]) -> int:
+        """Compute the ``ignored`` bitmap against ``ignored_keys``.
+
+        Returns the number of ignored rows.
+        """
+        self.ignored = bytearray(key in ignored_keys for key in self.keys)
+        return sum(self.ignored)
+
+    def is_ignored(self, index: int) -> bool:
+        return self.ignored is not None and bool(self.ignored[index])
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[ComparisonRow]:
+        return (self.row(i) for i in range(len(self)))
+
+    def row(self, index: int) -> ComparisonRow:
+        """Materialize a ``ComparisonRow`` view of row ``index``."""
+        return ComparisonRow(
+            syncro_name=self.syncro_names[index],
+            huntress_name=self.huntress_names[index],
+            status=STATUS_CODES[self.status_codes[index]],
+            organization=self.orgs[self.org_codes[index]],
+            sort_key=self.sort_keys[index],
+            flags=self.flags[index],
+        )
+
+    def organization(self, index: int) -> str:
+        return self.orgs[self.org_codes[index]]
+
+    def status(self, index: int) -> str:
+        return STATUS_CODES[self.status_codes[index]]
+
+    def values(self, index: int) -> Tuple[str, str, str, str]:
+        """Display values ``(organization, syncro, huntress, status)``."""
+        return (
+            self.orgs[self.org_codes[index]],
+            self.syncro_names[index],
+            self.huntress_names[index],
+            STATUS_CODES[self.status_codes[index]],
+        )
+
+    def iter_orgs(self) -> Iterator[str]:
+        orgs = self.orgs
+        return (orgs[code] for code in self.org_codes)
+
+    def iter_statuses(self) -> Iterator[str]:
+        return (STATUS_CODES[code] for code in self.status_codes)
+
+    def iter_values(self) -> Iterator[Tuple[str, str, str, str]]:
+        """Yield display values for every row, in order."""
+        return zip(
+            self.iter_orgs(),
+            self.syncro_names,
+            self.huntress_names,
+            self.iter_statuses(),
+        )
+
+    def iter_sort_keys(self) -> Iterator[Tuple[str, RowSortKey]]:
+        """Yield ``(status, RowSortKey)`` pairs for ``order_indexes``."""
+        return zip(self.iter_statuses(), self.sort_keys)
+
+    def distinct_orgs(self) -> Set[str]:
+        """Organizations actually referenced by a row."""
+        return {self.orgs[code] for code in set(self.org_codes)}
+
+    def status_counts(self, ignored_keys=None) -> Tuple[Dict[str, int], int]:
+        """Count rows per status, skipping ignored keys.
+
+        Without ``ignored_keys`` the ``ignored`` bitmap is used when present.
+
+        Returns ``(counts, ignored_count)`` where ``counts`` maps every status
+        string to its number of non-ignored rows.
+        """
+        tallies = [0] * len(STATUS_CODES)
+        ignored = 0
+        if ignored_keys is None and self.ignored is not None:
+            for code, flag in zip(self.status_codes, self.ignored):
+                if flag:
+                    ignored += 1
+                else:
+                    tallies[code] += 1
+        elif ignored_keys:
+            for code, key in zip(self.status_codes, self.keys):
+                if key in ignored_keys:
+                    ignored += 1
+                else:
+                    tallies[code] += 1
+        else:
+            for code in self.status_codes:
+                tallies[code] += 1
+        return dict(zip(STATUS_CODES, tallies)), ignored
+
+    def take(self, indices: Iterable[int]) -> "ColumnarRows":
+        """Return a new store holding rows ``indices`` (in that order).
+
+        The organization table is rebuilt from the organizations those rows
+        reference, so a filtered or per-organization store never carries
+        other clients' names. The ``ignored`` bitmap is carried over when
+        present.
+        """
+        other = ColumnarRows()
+        recoded: Dict[int, int] = {}
+        flags = self.ignored
+        picked = bytearray()
+        for i in indices:
+            if flags is not None:
+                picked.append(flags[i])
+            code = self.org_codes[i]
+            new_code = recoded.get(code)
+            if new_code is None:
+                new_code = recoded[code] = len(other.orgs)
+                other.orgs.append(self.orgs[code])
+                other._org_lookup[self.orgs[code]] = new_code
+            other.org_codes.append(new_code)
+            other.status_codes.append(self.status_codes[i])
+            other.syncro_names.append(self.syncro_names[i])
+            other.huntress_names.append(self.huntress_names[i])
+            other.keys.append(self.keys[i])
+            other.sort_keys.append(self.sort_keys[i])
+            other.flags.append(self.flags[i])
+        if flags is not None:
+            other.ignored = picked
+        return other
+
+    def compact_orgs(self) -> "ColumnarRows":
+        """This store, or a copy whose organization table holds only the
+        organizations its rows reference (stores built ``from_columns`` may
+        carry more)."""
+        if len(set(self.org_codes)) == len(self.orgs):
+            return self
+        return self.take(range(len(self)))
+
+    def partition_by_org(self) -> Dict[str, "ColumnarRows"]:
+        """Split into one store per organization in a single pass over the
+        organization codes (row order is kept within each store)."""
+        indices: Dict[int, List[int]] = {}
+        for i, code in enumerate(self.org_codes):
+            indices.setdefault(code, []).append(i)
+        return {self.orgs[code]: self.take(picked) for code, picked in indices.items()}
+
+    def exclude_status(self, status: str) -> "ColumnarRows":
+        """Return the rows whose status is not ``status``."""
+        code = STATUS_TO_CODE[status]
+        return self.take(i for i, c in enumerate(self.status_codes) if c != code)
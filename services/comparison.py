@@ -1,5 +1,22 @@
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, List, Optional, Set
+import hashlib
+import queue
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Container,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from const import (
     MAX_NAME_WIDTH,
@@ -7,9 +24,84 @@ from const import (
     STATUS_MISSING_SYNCRO,
     STATUS_OK,
 )
+from services import normalization
 
 if TYPE_CHECKING:
     from api.client import HuntressClient, SyncroClient
+    from services.aggregates import OrgAggregates
+    from services.columnar import ColumnarRows
+    from services.org_mapping import OrgMapping
+    from services.sources import InventorySource
+
+
+# Row orderings understood by ``order_indexes`` / ``ComparisonResult.ordered``.
+ORDER_MISMATCHES_FIRST = "mismatches_first"
+ORDER_OK_FIRST = "ok_first"
+ORDER_ORG = "org"
+ORDER_STATUS = "status"
+ORDER_HOSTNAME = "hostname"
+ORDER_HUNTRESS = "huntress"
+
+# Status order used by ORDER_STATUS: problems first, OK last.
+STATUS_RANK = {
+    STATUS_MISSING_HUNTRESS: 0,
+    STATUS_MISSING_SYNCRO: 1,
+    STATUS_OK: 2,
+}
+
+
+# Queue marker: a producer in ``_fetch_and_index`` has finished.
+_DONE = object()
+
+# Row flags (bit mask) set by the engine's indexing pass.
+FLAG_DUPLICATE_SYNCRO = 1
+FLAG_DUPLICATE_HUNTRESS = 2
+FLAG_STALE_SYNCRO = 4
+FLAG_STALE_HUNTRESS = 8
+FLAG_DUPLICATE = FLAG_DUPLICATE_SYNCRO | FLAG_DUPLICATE_HUNTRESS
+FLAG_STALE = FLAG_STALE_SYNCRO | FLAG_STALE_HUNTRESS
+
+# Presence bits of the built-in two-way comparison (bit i = source i).
+PRESENCE_SYNCRO = 1
+PRESENCE_HUNTRESS = 2
+
+# Two-way presence mask -> status.
+PRESENCE_STATUS = {
+    PRESENCE_SYNCRO | PRESENCE_HUNTRESS: STATUS_OK,
+    PRESENCE_SYNCRO: STATUS_MISSING_HUNTRESS,
+    PRESENCE_HUNTRESS: STATUS_MISSING_SYNCRO,
+}
+
+FLAG_LABELS = (
+    (FLAG_DUPLICATE_SYNCRO, "Duplicate in Syncro"),
+    (FLAG_DUPLICATE_HUNTRESS, "Duplicate in Huntress"),
+    (FLAG_STALE_SYNCRO, "Stale in Syncro"),
+    (FLAG_STALE_HUNTRESS, "Stale in Huntress"),
+)
+
+# Payload fields holding a last check-in time, most specific first. Records
+# without any of them are never considered stale. (Syncro's ``updated_at`` is
+# a record-edit time, not a check-in, so it does not count.)
+SYNCRO_SEEN_FIELDS = ("last_seen",)
+HUNTRESS_SEEN_FIELDS = ("last_callback_at", "last_survey_at")
+
+
+def describe_flags(flags: int) -> str:
+    """Human-readable notes for a row's flags ("" when none are set)."""
+    return "; ".join(label for bit, label in FLAG_LABELS if flags & bit)
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class RowSortKey(NamedTuple):
+    """Casefolded sort fields, computed once per row."""
+
+    organization: str
+    hostname: str
+    syncro: str
+    huntress: str
 
 
 @dataclass
@@ -20,6 +112,20 @@ class ComparisonRow:
     huntress_name: str
     status: str
     organization: str = ""
+    # Filled in by __post_init__ so orderings never re-casefold names per compare.
+    sort_key: RowSortKey = field(default=None, compare=False, repr=False)
+    # FLAG_* bits (duplicates / stale entries); 0 for rows loaded from files.
+    flags: int = field(default=0, compare=False)
+
+    def __post_init__(self):
+        if self.sort_key is None:
+            self.sort_key = make_sort_key(
+                self.organization, self.syncro_name, self.huntress_name
+            )
+
+
+# Comparison output: a plain row list, or a ``ColumnarRows`` store.
+RowSequence = Union[List[ComparisonRow], "ColumnarRows"]
 
 
 @dataclass
@@ -28,9 +134,109 @@ class ComparisonResult:
 
     syncro_assets: List[Dict]
     huntress_agents: List[Dict]
-    rows: List[ComparisonRow]
+    rows: "RowSequence"
     syncro_count: int
     huntress_count: int
+    # ISO-8601 UTC time the data was fetched.
+    created_at: str = field(default_factory=_utc_now)
+    # Timings and record counts from the run (seconds, raw record totals).
+    stats: Dict[str, float] = field(default_factory=dict)
+    # Per-organization counts emitted with the rows (None for loaded results).
+    aggregates: Optional["OrgAggregates"] = None
+    # Source ("syncro"/"huntress") -> normalized key -> ids of every record
+    # sharing that key, for keys seen more than once.
+    duplicates: Dict[str, Dict[str, list]] = field(default_factory=dict)
+    # Source -> content hash of the fetched pages (plus an "options"
+    # fingerprint); used to skip rebuilding when nothing changed.
+    content_hashes: Dict[str, str] = field(default_factory=dict, compare=False)
+    # Ordering name -> row indexes, built on first use by ``order``.
+    _orders: Dict[str, List[int]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def order(self, ordering: str) -> List[int]:
+        """Row indexes for ``ordering`` (cached; the rows are never re-sorted)."""
+        if ordering not in self._orders:
+            self._orders[ordering] = order_indexes(self.rows, ordering)
+        return self._orders[ordering]
+
+    def ordered(self, ordering: Optional[str] = None) -> "RowSequence":
+        """Rows in ``ordering``, or in engine order when ``ordering`` is None.
+
+        Columnar results stay columnar (``ColumnarRows.take``).
+        """
+        if ordering is None:
+            return self.rows
+        if hasattr(self.rows, "take"):
+            return self.rows.take(self.order(ordering))
+        return [self.rows[i] for i in self.order(ordering)]
+
+
+@dataclass
+class PresenceRow:
+    """One normalized hostname across the sources of an N-way comparison."""
+
+    key: str
+    organization: str
+    # Display names per source, in source order ("" where the host is absent).
+    names: Tuple[str, ...]
+    # Bit i set when source i holds the host.
+    presence: int
+
+
+@dataclass
+class InventoryComparison:
+    """Result of ``ComparisonService.compare_sources``."""
+
+    sources: List[str]
+    rows: List[PresenceRow]
+    # Source name -> number of unique hostnames it holds.
+    counts: Dict[str, int]
+    created_at: str = field(default_factory=_utc_now)
+    stats: Dict[str, float] = field(default_factory=dict)
+
+    def status(self, row: PresenceRow) -> str:
+        return describe_presence(row.presence, self.sources)
+
+
+def make_sort_key(organization: str, syncro_name: str, huntress_name: str):
+    """Build the casefolded ``RowSortKey`` for a row's display values."""
+    syncro = syncro_name.casefold()
+    huntress = huntress_name.casefold()
+    return RowSortKey(organization.casefold(), syncro or huntress, syncro, huntress)
+
+
+# Ordering name -> key over (status, RowSortKey). Ties keep engine order because
+# Python's sort is stable.
+_ORDER_KEYS: Dict[str, Callable[[str, RowSortKey], tuple]] = {
+    ORDER_MISMATCHES_FIRST: lambda st, k: (st == STATUS_OK, k.syncro, k.huntress),
+    ORDER_OK_FIRST: lambda st, k: (st != STATUS_OK, k.syncro, k.huntress),
+    ORDER_ORG: lambda st, k: (k.organization, k.hostname, k.huntress),
+    ORDER_STATUS: lambda st, k: (STATUS_RANK.get(st, len(STATUS_RANK)), k.hostname),
+    ORDER_HOSTNAME: lambda st, k: (k.hostname, k.huntress),
+    ORDER_HUNTRESS: lambda st, k: (k.huntress or k.syncro, k.syncro),
+}
+
+ORDERINGS = tuple(_ORDER_KEYS)
+
+
+def order_indexes(rows: List[ComparisonRow], ordering: str) -> List[int]:
+    """Return the row indexes of ``rows`` sorted by ``ordering``.
+
+    Works from the precomputed ``sort_key`` on each row, so building an
+    ordering is one key lookup per row rather than several ``lower()`` calls
+    per comparison.
+    """
+    try:
+        key_fn = _ORDER_KEYS[ordering]
+    except KeyError:
+        raise ValueError(f"Unknown row ordering: {ordering!r}")
+    if hasattr(rows, "iter_sort_keys"):
+        pairs = rows.iter_sort_keys()  # ColumnarRows: no row objects needed
+    else:
+        pairs = ((row.status, row.sort_key) for row in rows)
+    keys = [key_fn(status, sort_key) for status, sort_key in pairs]
+    return sorted(range(len(keys)), key=keys.__getitem__)
 
 
 def normalize(name: str, length: int = MAX_NAME_WIDTH) -> Optional[str]:
@@ -38,8 +244,11 @@ def normalize(name: str, length: int = MAX_NAME_WIDTH) -> Optional[str]:
 
     Truncates to ``length`` (15 by default) because Syncro stores the
     NetBIOS-capped computer name while Huntress stores the full hostname.
-    See ``const.MAX_NAME_WIDTH``.
+    See ``const.MAX_NAME_WIDTH``. Default-length calls go through the
+    memoized, interning normalizer in ``services.normalization``.
     """
+    if length == MAX_NAME_WIDTH:
+        return normalization.default_normalizer()(name)
     if not name:
         return None
     return name.strip().lower()[:length]
@@ -47,7 +256,12 @@ def normalize(name: str, length: int = MAX_NAME_WIDTH) -> Optional[str]:
 
 def row_key(row: "ComparisonRow") -> str:
     """Stable ignore/identity key for a row (normalized comparison hostname)."""
-    return normalize(row.syncro_name) or normalize(row.huntress_name) or ""
+    return names_key(row.syncro_name, row.huntress_name)
+
+
+def names_key(syncro_name: str, huntress_name: str) -> str:
+    """``row_key`` computed from a row's display names."""
+    return normalize(syncro_name) or normalize(huntress_name) or ""
 
 
 def extract_org(asset: Dict) -> str:
@@ -64,6 +278,46 @@ def extract_org(asset: Dict) -> str:
     return ""
 
 
+# Source index key: the normalized hostname, or (organization, hostname) when
+# matching is scoped per organization.
+IndexKey = Union[str, Tuple[str, str]]
+
+
+@dataclass
+class SourceEntry:
+    """Everything one source holds under a normalized key."""
+
+    names: Set[str] = field(default_factory=set)
+    ids: list = field(default_factory=list)
+    organization: str = ""
+    # Newest check-in timestamp (raw ISO string) across the records.
+    last_seen: str = ""
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp, accepting the trailing ``Z`` the APIs use
+    (``datetime.fromisoformat`` only does from Python 3.11)."""
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _is_stale(last_seen: str, cutoff: Optional[datetime]) -> bool:
+    if cutoff is None or not last_seen:
+        return False
+    try:
+        seen = _parse_timestamp(last_seen)
+    except ValueError:
+        return False
+    if seen.tzinfo is None:
+        seen = seen.replace(tzinfo=timezone.utc)
+    return seen < cutoff
+
+
 class ComparisonService:
     """Service for comparing Syncro assets and Huntress agents."""
 
@@ -72,158 +326,1064 @@ class ComparisonService:
     ):
         self.syncro_client = syncro_client
         self.huntress_client = huntress_client
+        # Huntress organization id -> name from the last full fetch.
+        self._org_id_to_name: Dict[int, str] = {}
 
-    def fetch_and_compare(self, mismatches_first: bool = True) -> ComparisonResult:
-        """Fetch data from both APIs and perform comparison."""
-        from concurrent.futures import ThreadPoolExecutor
+    def fetch_and_compare(
+        self,
+        mismatches_first: bool = True,
+        columnar: bool = False,
+        ignored_keys: Optional[Container[str]] = None,
+        stale_after_days: Optional[int] = None,
+        org_mapping: Optional["OrgMapping"] = None,
+        organizations: Optional[Iterable[str]] = None,
+        previous: Optional["ComparisonResult"] = None,
+        name_mapping: Optional["OrgMapping"] = None,
+    ) -> ComparisonResult:
+        """Fetch data from both APIs and perform comparison.
 
-        # Fetch data in parallel
+        With ``columnar=True`` the rows come back as a ``ColumnarRows`` store
+        instead of a list of ``ComparisonRow`` objects. ``ignored_keys`` (a
+        set of keys or ``IgnoreRules``) affects the per-organization
+        ``aggregates`` and, for columnar rows, the ``ignored`` bitmap; ignored
+        rows are still returned.
+
+        Rows whose key occurs more than once in a source get a
+        FLAG_DUPLICATE_* bit (ids in ``result.duplicates``). With
+        ``stale_after_days`` set, rows whose newest check-in on a side is
+        older than that get a FLAG_STALE_* bit.
+
+        With an ``org_mapping`` hosts are matched on ``(organization,
+        hostname)`` instead of hostname alone, so the same name in two
+        customers no longer collapses into one row. The mapping's derived
+        pairs are refreshed from this run's hostname overlap first; Huntress
+        organizations are then translated to their paired Syncro customer.
+        Asset counts become unique (organization, hostname) keys.
+
+        ``organizations`` pushes an organization filter down into the fetch:
+        the names are resolved to Syncro customer ids and Huntress
+        organization ids, and only those records are requested. Hosts
+        matching across different organizations are then out of view.
+        ``name_mapping`` pairs Syncro and Huntress names for that lookup
+        without scoping the match (``org_mapping``, when given, is used).
+
+        Every page fetched in this pass is hashed by the clients (their
+        hashes are reset first); the per-source hashes (plus a fingerprint of
+        these options) are kept in ``content_hashes``. When they equal
+        ``previous.content_hashes`` the data is unchanged and ``previous``
+        itself is returned without being rebuilt, so callers can test
+        ``result is previous``. A pass with a failed page has no hashes and
+        is always rebuilt.
+
+        Raises:
+            ValueError: If none of ``organizations`` can be resolved.
+        """
+        # Fetch data in parallel (indexing pages as they arrive)
         # Note: We let the caller handle the spinner/progress indication
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            huntress_future = executor.submit(self.huntress_client.get_all_agents)
-            syncro_future = executor.submit(self.syncro_client.get_all_assets)
-            org_future = executor.submit(self._fetch_huntress_org_names)
+        self._reset_page_hashes()
+        created_at = _utc_now()
+        started = time.perf_counter()
+        normalize_before = normalization.default_normalizer().stats()
+        scoped = org_mapping is not None
+        if organizations:
+            syncro_assets, huntress_agents, org_id_to_name, renames = (
+                self._fetch_scoped(list(organizations), org_mapping or name_mapping)
+            )
+            # Rows carry the requested names, whatever each API calls them.
+            syncro_index = _rekey_orgs(
+                self._index_syncro(syncro_assets, scoped), renames
+            )
+            huntress_index = _rekey_orgs(
+                self._index_huntress(huntress_agents, org_id_to_name, scoped),
+                renames,
+            )
+        else:
+            (
+                syncro_assets,
+                huntress_agents,
+                org_id_to_name,
+                syncro_index,
+                huntress_index,
+            ) = self._fetch_and_index(scoped)
+
+        # Pages were indexed as they arrived; only the row build is left.
+        fetched = time.perf_counter()
+        self._org_id_to_name = org_id_to_name
+        content_hashes = self._content_hashes(
+            mismatches_first,
+            columnar,
+            ignored_keys,
+            stale_after_days,
+            org_mapping,
+            organizations,
+        )
+        if (
+            previous is not None
+            and content_hashes
+            and previous.content_hashes == content_hashes
+        ):
+            return previous
+        rows, aggregates, syncro_index, huntress_index = self._compare_indexes(
+            syncro_index,
+            huntress_index,
+            created_at,
+            mismatches_first=mismatches_first,
+            columnar=columnar,
+            ignored_keys=ignored_keys,
+            stale_after_days=stale_after_days,
+            org_mapping=org_mapping,
+        )
+
+        return ComparisonResult(
+            syncro_assets=syncro_assets,
+            huntress_agents=huntress_agents,
+            rows=rows,
+            # Asset counts are unique normalized keys.
+            syncro_count=len(syncro_index),
+            huntress_count=len(huntress_index),
+            created_at=created_at,
+            aggregates=aggregates,
+            duplicates={
+                "syncro": _duplicate_ids(syncro_index),
+                "huntress": _duplicate_ids(huntress_index),
+            },
+            stats={
+                "fetch_seconds": round(fetched - started, 3),
+                "compare_seconds": round(time.perf_counter() - fetched, 3),
+                "syncro_records": len(syncro_assets),
+                "huntress_records": len(huntress_agents),
+                **_normalize_stats(normalize_before),
+            },
+            content_hashes=content_hashes,
+        )
+
+    def _content_hashes(self, *options) -> Dict[str, str]:
+        """Per-source content hashes of the last fetch, plus an ``options``
+        fingerprint; empty when a client cannot report a hash."""
+        hashes = {
+            "syncro": self.syncro_client.content_hash(),
+            "huntress": self.huntress_client.content_hash(),
+        }
+        if not all(isinstance(value, str) and value for value in hashes.values()):
+            return {}
+        hashes["options"] = _options_fingerprint(*options)
+        return hashes
+
+    def _reset_page_hashes(self) -> None:
+        """Start a fetch pass on both clients, so content hashes cover only
+        its pages (clients without page hashes are skipped)."""
+        for client in (self.syncro_client, self.huntress_client):
+            reset = getattr(client, "reset_page_hashes", None)
+            if reset is not None:
+                reset()
+
+    def default_sources(self) -> List["InventorySource"]:
+        """The Syncro and Huntress connectors for this service's clients."""
+        from services.sources import HuntressSource, SyncroSource
+
+        return [SyncroSource(self.syncro_client), HuntressSource(self.huntress_client)]
+
+    def compare_sources(
+        self,
+        sources: Sequence["InventorySource"],
+        mismatches_first: bool = True,
+    ) -> InventoryComparison:
+        """Reconcile any number of inventory sources by normalized hostname.
+
+        Sources are fetched in parallel, each is indexed in one pass, and
+        ``presence_join`` gives every hostname a bitmask of the sources that
+        hold it. Rows missing from any source sort first unless
+        ``mismatches_first`` is False.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        created_at = _utc_now()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+            records = list(executor.map(lambda source: source.fetch(), sources))
+        fetched = time.perf_counter()
+
+        indexes = [
+            self._index_source(
+                items, source.key_field, source.organization, source.seen_fields
+            )
+            for source, items in zip(sources, records)
+        ]
+        rows = []
+        for key, mask in presence_join(indexes).items():
+            entries = [index.get(key) for index in indexes]
+            rows.append(
+                PresenceRow(
+                    key,
+                    next((e.organization for e in entries if e and e.organization), ""),
+                    tuple("; ".join(sorted(e.names)) if e else "" for e in entries),
+                    mask,
+                )
+            )
+        everywhere = (1 << len(sources)) - 1
+        rows.sort(
+            key=lambda row: (
+                (row.presence == everywhere) == mismatches_first,
+                row.organization.casefold(),
+                row.key,
+            )
+        )
+
+        return InventoryComparison(
+            sources=[source.name for source in sources],
+            rows=rows,
+            counts={source.name: len(index) for source, index in zip(sources, indexes)},
+            created_at=created_at,
+            stats={
+                "fetch_seconds": round(fetched - started, 3),
+                "compare_seconds": round(time.perf_counter() - fetched, 3),
+                **{
+                    f"{source.name}_records": len(items)
+                    for source, items in zip(sources, records)
+                },
+            },
+        )
+
+    def _fetch_scoped(
+        self, organizations: List[str], org_mapping: Optional["OrgMapping"] = None
+    ) -> Tuple[List[Dict], List[Dict], Dict[int, str], Dict[str, str]]:
+        """Fetch only the records of ``organizations`` (server-side filters).
+
+        A name found on one side only (the two APIs name the client
+        differently and ``org_mapping`` has no pair for it) fetches the other
+        side unfiltered and keeps the customers / organizations sharing a
+        hostname with it, filtered here instead of by the API.
+
+        Returns ``(syncro_assets, huntress_agents, org_id_to_name, renames)``;
+        ``renames`` maps each fetched organization name on either side to
+        the requested name it was resolved through.
+        """
+        from concurrent.futures import ThreadPoolExecutor
 
-            huntress_agents = huntress_future.result()
-            syncro_assets = syncro_future.result()
+        pairs = org_mapping.pairs() if org_mapping is not None else {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            org_future = executor.submit(self._fetch_huntress_org_names)
+            customer_futures = {
+                name: executor.submit(self._syncro_customer_ids, name)
+                for name in organizations
+            }
+            customers_of = {
+                name: set(future.result()) for name, future in customer_futures.items()
+            }
             org_id_to_name = org_future.result()
 
-        rows = self._build_comparison(
+        org_ids_of = {
+            name: {
+                oid
+                for oid, org_name in org_id_to_name.items()
+                if org_name in (name, pairs.get(name, name))
+            }
+            for name in organizations
+        }
+        customer_ids = sorted(set().union(*customers_of.values()))
+        org_ids = sorted(set().union(*org_ids_of.values()))
+        if not customer_ids and not org_ids:
+            raise ValueError(
+                "No Syncro customer or Huntress organization named "
+                + ", ".join(repr(name) for name in organizations)
+            )
+        # Names resolved on one side only need the other side unfiltered.
+        fetch_all_syncro = any(
+            org_ids_of[name] and not customers_of[name] for name in organizations
+        )
+        fetch_all_huntress = any(
+            customers_of[name] and not org_ids_of[name] for name in organizations
+        )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            if fetch_all_syncro:
+                syncro_futures = [executor.submit(self.syncro_client.get_all_assets)]
+            else:
+                syncro_futures = [
+                    executor.submit(self.syncro_client.get_all_assets, customer_id=cid)
+                    for cid in customer_ids
+                ]
+            if fetch_all_huntress:
+                huntress_futures = [
+                    executor.submit(self.huntress_client.get_all_agents)
+                ]
+            else:
+                huntress_futures = [
+                    executor.submit(
+                        self.huntress_client.get_all_agents, organization_id=oid
+                    )
+                    for oid in org_ids
+                ]
+            syncro_assets = [a for f in syncro_futures for a in f.result()]
+            huntress_agents = [a for f in huntress_futures for a in f.result()]
+
+        # Pair each one-sided name through shared hostnames, and label both
+        # sides' records with the name they were requested by.
+        renames: Dict[str, str] = {}
+        wanted_customers: Set[int] = set()
+        wanted_orgs: Set[int] = set()
+        for name in organizations:
+            customers, org_ids_of_name = customers_of[name], org_ids_of[name]
+            if customers and not org_ids_of_name:
+                hosts = _hosts(syncro_assets, "name", _customer_id, customers)
+                org_ids_of_name = _ids_sharing_hosts(
+                    huntress_agents, "hostname", _organization_id, hosts
+                )
+            elif org_ids_of_name and not customers:
+                hosts = _hosts(
+                    huntress_agents, "hostname", _organization_id, org_ids_of_name
+                )
+                customers = _ids_sharing_hosts(
+                    syncro_assets, "name", _customer_id, hosts
+                )
+            wanted_customers |= customers
+            wanted_orgs |= org_ids_of_name
+            for asset in syncro_assets:
+                if _customer_id(asset) in customers:
+                    renames.setdefault(extract_org(asset), name)
+            for oid in org_ids_of_name:
+                if oid in org_id_to_name:
+                    renames.setdefault(org_id_to_name[oid], name)
+        if fetch_all_syncro:
+            syncro_assets = [
+                a for a in syncro_assets if _customer_id(a) in wanted_customers
+            ]
+        if fetch_all_huntress:
+            huntress_agents = [
+                a for a in huntress_agents if _organization_id(a) in wanted_orgs
+            ]
+        return syncro_assets, huntress_agents, org_id_to_name, renames
+
+    def _syncro_customer_ids(self, name: str) -> List[int]:
+        """Ids of Syncro customers whose name is exactly ``name``."""
+        return [
+            customer["id"]
+            for customer in self.syncro_client.get_customers(business_name=name)
+            if customer.get("id") is not None
+            and name
+            in (
+                customer.get("business_name"),
+                customer.get("business_and_full_name"),
+                customer.get("fullname"),
+            )
+        ]
+
+    def refresh_org(
+        self,
+        result: ComparisonResult,
+        organization: str,
+        mismatches_first: bool = True,
+        ignored_keys: Optional[Container[str]] = None,
+        stale_after_days: Optional[int] = None,
+        org_mapping: Optional["OrgMapping"] = None,
+    ) -> ComparisonResult:
+        """Re-fetch one organization and splice it into ``result``.
+
+        Only that organization's Syncro assets (``customer_id`` filter) and
+        Huntress agents (``organization_id`` filter) are requested. Its rows
+        are rebuilt and replace the rows of ``result`` whose organization is
+        ``organization``; every other row, and the rest of the raw data, is
+        reused as-is. Returns a new ``ComparisonResult``; ``result`` (and
+        its aggregates) is left unchanged.
+
+        Duplicate and stale flags of the new rows come from this
+        organization's records alone, and other organizations' rows keep
+        their flags, even when a refreshed host moved to or from another
+        organization. A full comparison recomputes them.
+
+        Raises:
+            ValueError: If ``organization`` has no known Syncro customer or
+                Huntress organization id.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._reset_page_hashes()
+        if not self._org_id_to_name:
+            self._org_id_to_name = self._fetch_huntress_org_names()
+        customer_ids, org_ids = self._resolve_org_ids(result, organization, org_mapping)
+        if not customer_ids and not org_ids:
+            raise ValueError(f"Unknown organization: {organization!r}")
+
+        created_at = _utc_now()
+        started = time.perf_counter()
+        normalize_before = normalization.default_normalizer().stats()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            syncro_futures = [
+                executor.submit(self.syncro_client.get_all_assets, customer_id=cid)
+                for cid in customer_ids
+            ]
+            huntress_futures = [
+                executor.submit(
+                    self.huntress_client.get_all_agents, organization_id=oid
+                )
+                for oid in org_ids
+            ]
+            syncro_assets = [a for f in syncro_futures for a in f.result()]
+            huntress_agents = [a for f in huntress_futures for a in f.result()]
+
+        fetched = time.perf_counter()
+        columnar = hasattr(result.rows, "take")
+        fresh, fresh_aggregates, syncro_index, huntress_index = self._compare_records(
             syncro_assets,
             huntress_agents,
-            org_id_to_name,
+            self._org_id_to_name,
+            created_at,
             mismatches_first=mismatches_first,
+            columnar=columnar,
+            ignored_keys=ignored_keys,
+            stale_after_days=stale_after_days,
+            org_mapping=org_mapping,
+            derive_pairs=False,
         )
+        rows = _splice_rows(result.rows, fresh, organization, mismatches_first)
+
+        aggregates = None
+        if result.aggregates is not None:
+            # Copied: the caller may still hold (and show) the old result.
+            aggregates = result.aggregates.copy()
+            aggregates.by_org.pop(organization, None)
+            if organization in fresh_aggregates.by_org:
+                aggregates.by_org[organization] = fresh_aggregates.by_org[organization]
 
-        # Calculate asset counts (unique normalized)
-        syncro_count = len(self._build_map(syncro_assets))
-        huntress_count = len(self._build_map(huntress_agents, key_field="hostname"))
+        customer_set, org_set = set(customer_ids), set(org_ids)
+        syncro_raw = [
+            a for a in result.syncro_assets if _customer_id(a) not in customer_set
+        ] + syncro_assets
+        huntress_raw = [
+            a for a in result.huntress_agents if a.get("organization_id") not in org_set
+        ] + huntress_agents
+
+        old_keys = {
+            key if isinstance(key, str) else "/".join(key)
+            for key in (syncro_index.keys() | huntress_index.keys())
+        }
+        duplicates = {
+            source: {
+                key: ids
+                for key, ids in result.duplicates.get(source, {}).items()
+                if key not in old_keys
+            }
+            for source in ("syncro", "huntress")
+        }
+        duplicates["syncro"].update(_duplicate_ids(syncro_index))
+        duplicates["huntress"].update(_duplicate_ids(huntress_index))
 
         return ComparisonResult(
-            syncro_assets=syncro_assets,
-            huntress_agents=huntress_agents,
+            syncro_assets=syncro_raw,
+            huntress_agents=huntress_raw,
             rows=rows,
-            syncro_count=syncro_count,
-            huntress_count=huntress_count,
+            # One row per key, so a side's count is its number of non-blank rows.
+            syncro_count=_side_count(rows, "syncro"),
+            huntress_count=_side_count(rows, "huntress"),
+            created_at=created_at,
+            aggregates=aggregates,
+            duplicates=duplicates,
+            stats={
+                "fetch_seconds": round(fetched - started, 3),
+                "compare_seconds": round(time.perf_counter() - fetched, 3),
+                "syncro_records": len(syncro_assets),
+                "huntress_records": len(huntress_agents),
+                **_normalize_stats(normalize_before),
+                "refreshed_organization": organization,
+            },
         )
 
-    def _build_map(
-        self, items: List[Dict], key_field: str = "name"
-    ) -> Dict[str, Set[str]]:
-        """Build a map of normalized names to original names."""
-        item_map = {}
-        for item in items:
-            raw = item.get(key_field) or ""
-            normalized = normalize(raw)
-            if normalized:
-                item_map.setdefault(normalized, set()).add(raw.strip())
-        return item_map
-
-    def _build_org_map(self, syncro_assets: List[Dict]) -> Dict[str, str]:
-        """Build a map of normalized Syncro name -> organization name."""
-        org_map: Dict[str, str] = {}
-        for asset in syncro_assets:
-            normalized = normalize(asset.get("name") or "")
-            if not normalized:
-                continue
-            # Keep the first non-empty organization seen for this key.
-            if org_map.get(normalized):
-                continue
-            org = extract_org(asset)
-            if org:
-                org_map[normalized] = org
-        return org_map
+    def _resolve_org_ids(
+        self,
+        result: ComparisonResult,
+        organization: str,
+        org_mapping: Optional["OrgMapping"] = None,
+    ) -> Tuple[List[int], List[int]]:
+        """Syncro customer ids and Huntress organization ids behind
+        ``organization``.
 
-    def _fetch_huntress_org_names(self) -> Dict[int, str]:
-        """Fetch Huntress organization id -> name. Degrades to {} on failure."""
-        try:
-            orgs = self.huntress_client.get_all_organizations()
-            return {
-                o["id"]: o.get("name", "")
-                for o in orgs
-                if isinstance(o, dict) and o.get("id") is not None
+        Customer ids come from the assets already in ``result``. Huntress ids
+        are the organization with the same (or the mapped) name plus any
+        organization whose agents matched a host of this organization.
+        """
+        customer_ids = sorted(
+            {
+                cid
+                for asset in result.syncro_assets
+                if extract_org(asset) == organization
+                for cid in [_customer_id(asset)]
+                if cid is not None
             }
-        except Exception:
-            # Org names are a nice-to-have; never fail the whole comparison.
-            return {}
+        )
+        huntress_names = {organization}
+        if org_mapping is not None:
+            huntress_names.add(org_mapping.pairs().get(organization, organization))
+        org_ids = {
+            oid for oid, name in self._org_id_to_name.items() if name in huntress_names
+        }
 
-    def _build_huntress_org_map(
-        self, huntress_agents: List[Dict], org_id_to_name: Dict[int, str]
-    ) -> Dict[str, str]:
-        """Build a map of normalized Huntress hostname -> organization name."""
-        org_map: Dict[str, str] = {}
-        if not org_id_to_name:
-            return org_map
-        for agent in huntress_agents:
-            normalized = normalize(agent.get("hostname") or "")
-            if not normalized or org_map.get(normalized):
-                continue
-            name = org_id_to_name.get(agent.get("organization_id"))
-            if name:
-                org_map[normalized] = name
-        return org_map
+        hosts = {
+            names_key(syncro, huntress)
+            for org, syncro, huntress, _ in _iter_values(result.rows)
+            if org == organization
+        }
+        for agent in result.huntress_agents:
+            oid = agent.get("organization_id")
+            if oid is not None and normalize(agent.get("hostname") or "") in hosts:
+                org_ids.add(oid)
+        return customer_ids, sorted(org_ids)
 
-    def _build_comparison(
+    def _compare_records(
         self,
         syncro_assets: List[Dict],
         huntress_agents: List[Dict],
-        org_id_to_name: Optional[Dict[int, str]] = None,
+        org_id_to_name: Dict[int, str],
+        created_at: str,
         mismatches_first: bool = True,
-    ) -> List[ComparisonRow]:
-        """Build comparison rows from data."""
-        syncro_map = self._build_map(syncro_assets, "name")
-        huntress_map = self._build_map(huntress_agents, "hostname")
-        org_map = self._build_org_map(syncro_assets)
-        huntress_org_map = self._build_huntress_org_map(
-            huntress_agents, org_id_to_name or {}
+        columnar: bool = False,
+        ignored_keys: Optional[Container[str]] = None,
+        stale_after_days: Optional[int] = None,
+        org_mapping: Optional["OrgMapping"] = None,
+        derive_pairs: bool = True,
+    ) -> Tuple[
+        RowSequence,
+        "OrgAggregates",
+        Dict[IndexKey, SourceEntry],
+        Dict[IndexKey, SourceEntry],
+    ]:
+        """Index both sources and build the rows (see ``fetch_and_compare``).
+
+        ``derive_pairs=False`` uses the mapping as-is (partial data, such as a
+        single-organization refresh, must not rewrite the derived pairs).
+        """
+        scoped = org_mapping is not None
+        syncro_index = self._index_syncro(syncro_assets, scoped)
+        huntress_index = self._index_huntress(huntress_agents, org_id_to_name, scoped)
+        return self._compare_indexes(
+            syncro_index,
+            huntress_index,
+            created_at,
+            mismatches_first=mismatches_first,
+            columnar=columnar,
+            ignored_keys=ignored_keys,
+            stale_after_days=stale_after_days,
+            org_mapping=org_mapping,
+            derive_pairs=derive_pairs,
         )
 
-        all_keys = sorted(set(syncro_map.keys()) | set(huntress_map.keys()))
-        rows: List[ComparisonRow] = []
+    def _compare_indexes(
+        self,
+        syncro_index: Dict[IndexKey, SourceEntry],
+        huntress_index: Dict[IndexKey, SourceEntry],
+        created_at: str,
+        mismatches_first: bool = True,
+        columnar: bool = False,
+        ignored_keys: Optional[Container[str]] = None,
+        stale_after_days: Optional[int] = None,
+        org_mapping: Optional["OrgMapping"] = None,
+        derive_pairs: bool = True,
+    ) -> Tuple[
+        RowSequence,
+        "OrgAggregates",
+        Dict[IndexKey, SourceEntry],
+        Dict[IndexKey, SourceEntry],
+    ]:
+        """Build the rows from already indexed sources (``_compare_records``)."""
+        scoped = org_mapping is not None
+        if scoped:
+            if derive_pairs:
+                org_mapping.derive(syncro_index, huntress_index)
+            huntress_index = _rekey_orgs(huntress_index, org_mapping.syncro_org_for())
+        stale_cutoff = None
+        if stale_after_days:
+            stale_cutoff = _parse_timestamp(created_at) - timedelta(
+                days=stale_after_days
+            )
+        rows, aggregates = self._build_comparison(
+            syncro_index,
+            huntress_index,
+            mismatches_first=mismatches_first,
+            columnar=columnar,
+            ignored_keys=ignored_keys,
+            stale_cutoff=stale_cutoff,
+        )
+        return rows, aggregates, syncro_index, huntress_index
 
-        for key in all_keys:
-            s_names = syncro_map.get(key)
-            h_names = huntress_map.get(key)
+    def _index_syncro(
+        self,
+        assets: List[Dict],
+        scoped: bool = False,
+        index: Optional[Dict[IndexKey, SourceEntry]] = None,
+    ) -> Dict[IndexKey, SourceEntry]:
+        return self._index_source(
+            assets, "name", extract_org, SYNCRO_SEEN_FIELDS, scoped, index
+        )
 
-            s_display = "; ".join(sorted(s_names)) if s_names else ""
-            h_display = "; ".join(sorted(h_names)) if h_names else ""
+    def _index_huntress(
+        self,
+        agents: List[Dict],
+        org_id_to_name: Dict[int, str],
+        scoped: bool = False,
+        index: Optional[Dict[IndexKey, SourceEntry]] = None,
+    ) -> Dict[IndexKey, SourceEntry]:
+        return self._index_source(
+            agents,
+            "hostname",
+            lambda agent: org_id_to_name.get(agent.get("organization_id"), ""),
+            HUNTRESS_SEEN_FIELDS,
+            scoped,
+            index,
+        )
 
-            if s_names and h_names:
-                status = STATUS_OK
-            elif s_names and not h_names:
-                status = STATUS_MISSING_HUNTRESS
-            else:
-                status = STATUS_MISSING_SYNCRO
+    def _fetch_and_index(self, scoped: bool = False) -> Tuple[
+        List[Dict],
+        List[Dict],
+        Dict[int, str],
+        Dict[IndexKey, SourceEntry],
+        Dict[IndexKey, SourceEntry],
+    ]:
+        """Fetch everything, indexing each page while the rest download.
 
-            organization = org_map.get(key) or huntress_org_map.get(key, "")
+        The three fetches run as producers that put pages on a queue; this
+        thread consumes them straight into the per-source indexes, so once
+        the last page lands only the row build is left. Huntress pages wait
+        for the (small) organization list, which their organization names
+        come from. A fetcher that never calls ``on_page`` is indexed from its
+        return value as one page.
 
-            rows.append(
-                ComparisonRow(
-                    syncro_name=s_display,
-                    huntress_name=h_display,
-                    status=status,
-                    organization=organization,
+        Returns ``(syncro_assets, huntress_agents, org_id_to_name,
+        syncro_index, huntress_index)``.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        pages: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+
+        def produce(source: str, fetch: Callable[..., List[Dict]]) -> None:
+            streamed = False
+
+            def on_page(page: List[Dict]) -> None:
+                nonlocal streamed
+                streamed = True
+                pages.put((source, page))
+
+            try:
+                records = fetch(on_page=on_page)
+                if not streamed:
+                    pages.put((source, records))
+            finally:
+                pages.put((source, _DONE))
+
+        def produce_org_names() -> None:
+            try:
+                pages.put(("organizations", self._fetch_huntress_org_names()))
+            finally:
+                pages.put(("organizations", _DONE))
+
+        syncro_assets: List[Dict] = []
+        huntress_agents: List[Dict] = []
+        syncro_index: Dict[IndexKey, SourceEntry] = {}
+        huntress_index: Dict[IndexKey, SourceEntry] = {}
+        org_id_to_name: Optional[Dict[int, str]] = None
+        held: List[List[Dict]] = []
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(produce, "syncro", self.syncro_client.get_all_assets),
+                executor.submit(
+                    produce, "huntress", self.huntress_client.get_all_agents
+                ),
+                executor.submit(produce_org_names),
+            ]
+            remaining = len(futures)
+            while remaining:
+                source, payload = pages.get()
+                if payload is _DONE:
+                    remaining -= 1
+                elif source == "syncro":
+                    syncro_assets.extend(payload)
+                    self._index_syncro(payload, scoped, syncro_index)
+                elif source == "huntress":
+                    huntress_agents.extend(payload)
+                    if org_id_to_name is None:
+                        held.append(payload)
+                    else:
+                        self._index_huntress(
+                            payload, org_id_to_name, scoped, huntress_index
+                        )
+                else:
+                    org_id_to_name = payload
+                    for page in held:
+                        self._index_huntress(
+                            page, org_id_to_name, scoped, huntress_index
+                        )
+                    held = []
+            for future in futures:
+                future.result()  # Re-raise a producer's error
+
+        return (
+            syncro_assets,
+            huntress_agents,
+            org_id_to_name or {},
+            syncro_index,
+            huntress_index,
+        )
+
+    @staticmethod
+    def _index_source(
+        items: List[Dict],
+        key_field: str,
+        org_of: Callable[[Dict], str],
+        seen_fields: Tuple[str, ...],
+        scoped: bool = False,
+        index: Optional[Dict[IndexKey, SourceEntry]] = None,
+    ) -> Dict[IndexKey, SourceEntry]:
+        """Index one source by normalized name in a single pass.
+
+        Each entry collects the raw names, record ids (one per record, so
+        ``count > 1`` means a duplicate), the first non-empty organization,
+        and the newest check-in timestamp from ``seen_fields``. With
+        ``scoped`` the index key is ``(organization, normalized name)``.
+        Passing ``index`` adds ``items`` to an existing index (one page at a
+        time).
+        """
+        if index is None:
+            index = {}
+        for item in items:
+            raw = item.get(key_field) or ""
+            normalized = normalize(raw)
+            if not normalized:
+                continue
+            organization = None
+            key: IndexKey = normalized
+            if scoped:
+                organization = org_of(item)
+                key = (organization, normalized)
+            entry = index.get(key)
+            if entry is None:
+                entry = index[key] = SourceEntry()
+            entry.names.add(raw.strip())
+            entry.ids.append(item.get("id"))
+            if not entry.organization:
+                entry.organization = (
+                    org_of(item) if organization is None else organization
                 )
+            for seen_field in seen_fields:
+                seen = item.get(seen_field)
+                if seen:
+                    # ISO-8601 strings from one API compare chronologically.
+                    if str(seen) > entry.last_seen:
+                        entry.last_seen = str(seen)
+                    break
+        return index
+
+    def organizations(self) -> List[Dict]:
+        """Huntress organizations from the last fetch, as ``{"id", "name"}``
+        records (the shape ``get_all_organizations`` returns, for dumps)."""
+        return [{"id": oid, "name": name} for oid, name in self._org_id_to_name.items()]
+
+    def _fetch_huntress_org_names(self) -> Dict[int, str]:
+        return fetch_huntress_org_names(self.huntress_client)
+
+    def _build_comparison(
+        self,
+        syncro_index: Dict[IndexKey, SourceEntry],
+        huntress_index: Dict[IndexKey, SourceEntry],
+        mismatches_first: bool = True,
+        columnar: bool = False,
+        ignored_keys: Optional[Container[str]] = None,
+        stale_cutoff: Optional[datetime] = None,
+    ) -> Tuple[RowSequence, "OrgAggregates"]:
+        """Build comparison rows, and their per-organization counts, from the
+        per-source indexes."""
+        from services.aggregates import OrgAggregates
+
+        if ignored_keys is None:
+            ignored_keys = set()
+        # IgnoreRules count their hits only through match(), once per row here.
+        match = getattr(ignored_keys, "match", None)
+        aggregates = OrgAggregates()
+        presence = presence_join([syncro_index, huntress_index])
+        # (syncro, huntress, status, organization, row_key, sort_key, ignored,
+        # flags) per row; rows are only built once the order is known. Each key is
+        # matched against the ignore rules exactly once, here.
+        entries = []
+
+        # Sorted keys give rows with equal sort keys a stable, deterministic
+        # order (index insertion order depends on which page arrived first).
+        for key in sorted(presence):
+            mask = presence[key]
+            s_entry = syncro_index[key] if mask & PRESENCE_SYNCRO else None
+            h_entry = huntress_index[key] if mask & PRESENCE_HUNTRESS else None
+
+            s_display = "; ".join(sorted(s_entry.names)) if s_entry else ""
+            h_display = "; ".join(sorted(h_entry.names)) if h_entry else ""
+            status = PRESENCE_STATUS[mask]
+
+            flags = 0
+            if s_entry:
+                if s_entry.count > 1:
+                    flags |= FLAG_DUPLICATE_SYNCRO
+                if _is_stale(s_entry.last_seen, stale_cutoff):
+                    flags |= FLAG_STALE_SYNCRO
+            if h_entry:
+                if h_entry.count > 1:
+                    flags |= FLAG_DUPLICATE_HUNTRESS
+                if _is_stale(h_entry.last_seen, stale_cutoff):
+                    flags |= FLAG_STALE_HUNTRESS
+
+            organization = (s_entry and s_entry.organization) or (
+                h_entry.organization if h_entry else ""
             )
+            rkey = names_key(s_display, h_display)
+            if match is not None:
+                ignored = match(rkey) is not None
+            else:
+                ignored = rkey in ignored_keys
+            aggregates.add(organization, status, ignored)
 
-        # Sort based on configuration
-        if mismatches_first:
-            # Errors/Mismatches first, OK at bottom
-            rows.sort(
-                key=lambda r: (
-                    0 if r.status != STATUS_OK else 1,
-                    r.syncro_name.lower(),
-                    r.huntress_name.lower(),
+            entries.append(
+                (
+                    s_display,
+                    h_display,
+                    status,
+                    organization,
+                    rkey,
+                    make_sort_key(organization, s_display, h_display),
+                    ignored,
+                    flags,
                 )
             )
-        else:
-            # OK first, Errors/Mismatches at bottom
-            rows.sort(
-                key=lambda r: (
-                    0 if r.status == STATUS_OK else 1,
-                    r.syncro_name.lower(),
-                    r.huntress_name.lower(),
+
+        # Errors/Mismatches first (OK at bottom), or the reverse.
+        key_fn = _ORDER_KEYS[
+            ORDER_MISMATCHES_FIRST if mismatches_first else ORDER_OK_FIRST
+        ]
+        entries.sort(key=lambda e: key_fn(e[2], e[5]))
+
+        if columnar:
+            from services.columnar import ColumnarRows
+
+            store = ColumnarRows()
+            for (
+                s_display,
+                h_display,
+                status,
+                organization,
+                rkey,
+                sort_key,
+                _,
+                flags,
+            ) in entries:
+                store.append(
+                    s_display, h_display, status, organization, rkey, flags, sort_key
                 )
+            store.ignored = bytearray(e[6] for e in entries)
+            return store, aggregates
+
+        rows = [
+            ComparisonRow(s_display, h_display, status, organization, sort_key, flags)
+            for s_display, h_display, status, organization, _, sort_key, _, flags in (
+                entries
             )
+        ]
+        return rows, aggregates
+
+
+def fetch_huntress_org_names(client: "HuntressClient") -> Dict[int, str]:
+    """Fetch Huntress organization id -> name. Degrades to {} on failure."""
+    try:
+        orgs = client.get_all_organizations()
+        return {
+            o["id"]: o.get("name", "")
+            for o in orgs
+            if isinstance(o, dict) and o.get("id") is not None
+        }
+    except Exception:
+        # Org names are a nice-to-have; never fail the whole comparison.
+        return {}
+
+
+def presence_join(
+    indexes: Sequence[Dict[IndexKey, SourceEntry]],
+) -> Dict[IndexKey, int]:
+    """N-way hash join of per-source indexes.
+
+    Returns key -> presence mask, where bit ``i`` is set when ``indexes[i]``
+    holds the key. Each index is walked once, so every extra source costs one
+    more pass rather than multiplying the work.
+    """
+    presence: Dict[IndexKey, int] = {}
+    for position, index in enumerate(indexes):
+        bit = 1 << position
+        for key in index:
+            presence[key] = presence.get(key, 0) | bit
+    return presence
+
+
+def describe_presence(presence: int, sources: Sequence[str]) -> str:
+    """Status text for an N-way presence mask ("OK" or "Missing in A, B")."""
+    missing = [name for i, name in enumerate(sources) if not presence >> i & 1]
+    if not missing:
+        return STATUS_OK
+    return "Missing in " + ", ".join(missing)
+
+
+def _duplicate_ids(index: Dict[IndexKey, SourceEntry]) -> Dict[str, list]:
+    """Normalized key -> record ids, for keys held by more than one record.
 
-        return rows
+    Scoped keys are reported as ``organization/hostname``.
+    """
+    return {
+        key if isinstance(key, str) else "/".join(key): entry.ids
+        for key, entry in index.items()
+        if entry.count > 1
+    }
+
+
+def _rekey_orgs(
+    index: Dict[IndexKey, SourceEntry], renames: Dict[str, str]
+) -> Dict[IndexKey, SourceEntry]:
+    """Translate the organization half of scoped keys through ``renames``.
+
+    Entries that land on the same key (two organizations paired with one
+    customer) are merged. Unscoped keys stay; only the entries'
+    organization is renamed.
+    """
+    rekeyed: Dict[IndexKey, SourceEntry] = {}
+    for key, entry in index.items():
+        if not isinstance(key, tuple):
+            entry.organization = renames.get(entry.organization, entry.organization)
+            rekeyed[key] = entry
+            continue
+        organization, host = key
+        organization = renames.get(organization, organization)
+        entry.organization = organization
+        existing = rekeyed.get((organization, host))
+        if existing is None:
+            rekeyed[(organization, host)] = entry
+            continue
+        existing.names |= entry.names
+        existing.ids.extend(entry.ids)
+        existing.last_seen = max(existing.last_seen, entry.last_seen)
+    return rekeyed
+
+
+def _normalize_stats(before: Dict[str, int]) -> Dict[str, int]:
+    """Normalizer cache activity since ``before`` (for ``ComparisonResult.stats``)."""
+    after = normalization.default_normalizer().stats()
+    return {
+        "normalize_calls": after["calls"] - before["calls"],
+        "normalize_cache_hits": after["hits"] - before["hits"],
+        "normalize_cache_size": after["size"],
+    }
+
+
+def _options_fingerprint(
+    mismatches_first: bool,
+    columnar: bool,
+    ignored_keys: Optional[Container[str]],
+    stale_after_days: Optional[int],
+    org_mapping: Optional["OrgMapping"],
+    organizations: Optional[Iterable[str]],
+) -> str:
+    """Hash of everything besides the data that shapes a comparison result."""
+    from services.ignore_rules import IgnoreRules
+
+    if isinstance(ignored_keys, IgnoreRules):
+        ignored = sorted(
+            (rule.pattern, str(rule.expires)) for rule in ignored_keys.rules
+        )
+    elif ignored_keys is None:
+        ignored = []
+    else:
+        ignored = sorted(ignored_keys)
+    options = (
+        mismatches_first,
+        columnar,
+        ignored,
+        stale_after_days,
+        # Stale flags move with the calendar even when the data does not.
+        datetime.now(timezone.utc).date().isoformat() if stale_after_days else "",
+        sorted(org_mapping.overrides.items()) if org_mapping is not None else None,
+        sorted(organizations) if organizations else None,
+        normalization.default_normalizer().unicode,
+    )
+    return hashlib.sha256(repr(options).encode()).hexdigest()
+
+
+def _customer_id(asset: Dict) -> Optional[int]:
+    """Syncro customer id of an asset (top-level or nested customer)."""
+    cid = asset.get("customer_id")
+    if cid is None and isinstance(asset.get("customer"), dict):
+        cid = asset["customer"].get("id")
+    return cid
+
+
+def _organization_id(agent: Dict) -> Optional[int]:
+    return agent.get("organization_id")
+
+
+def _hosts(
+    records: Iterable[Dict],
+    key_field: str,
+    id_of: Callable[[Dict], Optional[int]],
+    ids: Container[int],
+) -> Set[str]:
+    """Normalized names of the records whose ``id_of`` is in ``ids``."""
+    return {
+        normalize(record.get(key_field) or "")
+        for record in records
+        if id_of(record) in ids
+    } - {None}
+
+
+def _ids_sharing_hosts(
+    records: Iterable[Dict],
+    key_field: str,
+    id_of: Callable[[Dict], Optional[int]],
+    hosts: Container[str],
+) -> Set[int]:
+    """``id_of`` of the records whose normalized name is in ``hosts``."""
+    return {
+        id_of(record)
+        for record in records
+        if id_of(record) is not None and normalize(record.get(key_field) or "") in hosts
+    }
+
+
+def _iter_values(rows: RowSequence):
+    """``(organization, syncro, huntress, status)`` per row, for either kind."""
+    if hasattr(rows, "iter_values"):
+        return rows.iter_values()
+    return (
+        (row.organization, row.syncro_name, row.huntress_name, row.status)
+        for row in rows
+    )
+
+
+def _side_count(rows: RowSequence, side: str) -> int:
+    position = 1 if side == "syncro" else 2
+    return sum(1 for values in _iter_values(rows) if values[position])
+
+
+def _splice_rows(
+    rows: RowSequence,
+    fresh: RowSequence,
+    organization: str,
+    mismatches_first: bool = True,
+) -> RowSequence:
+    """Replace ``organization``'s rows in ``rows`` with its rows in ``fresh``.
+
+    The result is put back in engine order (mismatches or OK first).
+    """
+    ordering = ORDER_MISMATCHES_FIRST if mismatches_first else ORDER_OK_FIRST
+    if hasattr(rows, "take"):
+        from services.columnar import ColumnarRows
+
+        kept = rows.take(
+            i for i, org in enumerate(rows.iter_orgs()) if org != organization
+        )
+        added = fresh.take(
+            i for i, org in enumerate(fresh.iter_orgs()) if org == organization
+        )
+        combined = ColumnarRows.concat([kept, added])
+        return combined.take(order_indexes(combined, ordering))
+    combined = [row for row in rows if row.organization != organization] + [
+        row for row in fresh if row.organization == organization
+    ]
+    return [combined[i] for i in order_indexes(combined, ordering)]
@@ -0,0 +1,106 @@
+"""Run-to-run drift between two comparison results."""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from services.columnar import ColumnarRows
+from services.comparison import RowSequence, row_key
+
+CHANGE_APPEARED = "appeared"
+CHANGE_DISAPPEARED = "disappeared"
+CHANGE_CHANGED = "changed"
+
+# (organization, syncro, huntress, status) display values of one row.
+Values = Tuple[str, str, str, str]
+
+
+@dataclass
+class RowChange:
+    """One row that differs between the old and new result."""
+
+    key: str
+    kind: str
+    before: Optional[Values] = None
+    after: Optional[Values] = None
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Changed fields for CHANGE_CHANGED rows (``status``/``organization``)."""
+        if self.before is None or self.after is None:
+            return ()
+        changed = []
+        if self.before[3] != self.after[3]:
+            changed.append("status")
+        if self.before[0] != self.after[0]:
+            changed.append("organization")
+        return tuple(changed)
+
+    @property
+    def label(self) -> str:
+        """Human label: the kind, or the changed fields for changed rows."""
+        return ", ".join(self.fields) if self.kind == CHANGE_CHANGED else self.kind
+
+
+@dataclass
+class DriftReport:
+    """All row changes plus per-kind counts."""
+
+    changes: List[RowChange]
+
+    def counts(self) -> Dict[str, int]:
+        tallies = {CHANGE_APPEARED: 0, CHANGE_DISAPPEARED: 0, CHANGE_CHANGED: 0}
+        for change in self.changes:
+            tallies[change.kind] += 1
+        return tallies
+
+
+def _keyed_values(rows: RowSequence) -> Iterator[Tuple[str, Values]]:
+    if isinstance(rows, ColumnarRows):
+        return zip(rows.keys, rows.iter_values())
+    return (
+        (
+            row_key(row),
+            (row.organization, row.syncro_name, row.huntress_name, row.status),
+        )
+        for row in rows
+    )
+
+
+def diff_rows(old_rows: RowSequence, new_rows: RowSequence) -> DriftReport:
+    """Join ``old_rows`` and ``new_rows`` on ``row_key`` and report drift.
+
+    Runs in linear time: one pass indexes the old rows by key, one pass over
+    the new rows matches them. When a key appears more than once on a side
+    (the same hostname in several organizations) rows are paired by
+    organization first, and whatever is left over appears or disappears.
+    New and changed rows follow the new result's order; disappeared rows
+    follow the old result's order.
+    """
+    old_index: Dict[str, List[Values]] = {}
+    for key, values in _keyed_values(old_rows):
+        old_index.setdefault(key, []).append(values)
+
+    changes: List[RowChange] = []
+    for key, after in _keyed_values(new_rows):
+        candidates = old_index.get(key)
+        if not candidates:
+            changes.append(RowChange(key, CHANGE_APPEARED, after=after))
+            continue
+        before = _pop_match(candidates, after)
+        if before != after and (before[0] != after[0] or before[3] != after[3]):
+            changes.append(RowChange(key, CHANGE_CHANGED, before, after))
+
+    for key, leftovers in old_index.items():
+        for before in leftovers:
+            changes.append(RowChange(key, CHANGE_DISAPPEARED, before=before))
+
+    return DriftReport(changes)
+
+
+def _pop_match(candidates: List[Values], after: Values) -> Values:
+    """Remove and return the old row best matching ``after`` (same org first)."""
+    if len(candidates) > 1:
+        for i, before in enumerate(candidates):
+            if before[0] == after[0]:
+                return candidates.pop(i)
+    return candidates.pop(0)
@@ -0,0 +1,282 @@
+"""Row filter expressions (``--where``, exporters and the GUI search box).
+
+An expression such as::
+
+    status != "OK!" and org ~ "dental" and syncro ~ "^srv"
+
+is parsed once and compiled into one Python predicate over a row record
+(``RECORD_FIELDS``). Grammar, lowest precedence first::
+
+    expr       := and_expr ("or" and_expr)*
+    and_expr   := not_expr ("and" not_expr)*
+    not_expr   := "not" not_expr | "(" expr ")" | comparison | FLAG
+    comparison := FIELD ("==" | "=" | "!=" | "~" | "!~") VALUE
+
+``FIELD`` is one of ``STRING_FIELDS`` (``host`` matches either hostname);
+``FLAG`` one of ``FLAG_FIELDS``. ``VALUE`` is a bare word or a quoted string
+(only the quote character may be backslash-escaped, so regexes like ``\\d``
+are written as-is). ``==`` / ``!=`` compare case-insensitively; ``~`` / ``!~``
+are case-insensitive regex searches, compiled once.
+"""
+
+import re
+from typing import Any, Callable, Container, Dict, Iterator, List, Optional, Tuple
+
+from const import STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import (
+    FLAG_DUPLICATE,
+    FLAG_STALE,
+    RowSequence,
+    describe_flags,
+    row_key,
+)
+
+# Positions in a filter record: (organization, syncro name, huntress name,
+# status, key, flags, ignored).
+RECORD_FIELDS = (
+    "organization",
+    "syncro",
+    "huntress",
+    "status",
+    "key",
+    "flags",
+    "ignored",
+)
+Record = Tuple[str, str, str, str, str, int, bool]
+
+# Field name -> record expression(s) it compares against.
+STRING_FIELDS = {
+    "org": ("r[0]",),
+    "organization": ("r[0]",),
+    "syncro": ("r[1]",),
+    "huntress": ("r[2]",),
+    "host": ("r[1]", "r[2]"),
+    "status": ("r[3]",),
+    "key": ("r[4]",),
+    "notes": ("_notes(r[5])",),
+}
+# Bare boolean fields.
+FLAG_FIELDS = {
+    "ignored": "r[6]",
+    "flagged": "r[5] != 0",
+    "duplicate": f"r[5] & {FLAG_DUPLICATE} != 0",
+    "stale": f"r[5] & {FLAG_STALE} != 0",
+    "matched": f"r[3] == {STATUS_OK!r}",
+}
+_OPERATORS = ("==", "=", "!=", "~", "!~")
+_KEYWORDS = ("and", "or", "not")
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>==|!=|!~|=|~|\(|\))
+      | (?P<word>[^\s()"'=!~]+)
+    )""",
+    re.VERBOSE,
+)
+
+
+class FilterError(ValueError):
+    """Raised for an expression that cannot be parsed."""
+
+    pass
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str, int]]:
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN.match(expression, pos)
+        if match is None:
+            raise FilterError(f"Unexpected {expression[pos:].strip()[:10]!r}")
+        kind = match.lastgroup
+        text, start = match.group(kind), match.start(kind)
+        if kind == "string":
+            quote = text[0]
+            text = text[1:-1].replace("\\" + quote, quote)
+        elif kind == "word" and text.lower() in _KEYWORDS:
+            kind, text = "keyword", text.lower()
+        tokens.append((kind, text, start))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing ``(cost, code)`` pairs.
+
+    ``cost`` ranks how expensive a sub-expression is to evaluate, so the
+    operands of ``and`` / ``or`` can be ordered cheapest first.
+    """
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+        self.namespace: Dict[str, Any] = {"_notes": describe_flags}
+
+    def _peek(self) -> Optional[Tuple[str, str, int]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self, expected: str) -> Tuple[str, str, int]:
+        token = self._peek()
+        if token is None:
+            raise FilterError(f"Expected {expected} at the end of the expression")
+        self.pos += 1
+        return token
+
+    def parse(self) -> Tuple[int, str]:
+        if not self.tokens:
+            raise FilterError("Empty filter expression")
+        node = self._or()
+        token = self._peek()
+        if token is not None:
+            raise FilterError(f"Unexpected {token[1]!r} at position {token[2]}")
+        return node
+
+    def _join(self, keyword: str, parse) -> Tuple[int, str]:
+        nodes = [parse()]
+        while self._peek() is not None and self._peek()[:2] == ("keyword", keyword):
+            self.pos += 1
+            nodes.append(parse())
+        if len(nodes) == 1:
+            return nodes[0]
+        nodes.sort(key=lambda node: node[0])
+        code = f" {keyword} ".join(f"({code})" for _, code in nodes)
+        return sum(cost for cost, _ in nodes), code
+
+    def _or(self) -> Tuple[int, str]:
+        return self._join("or", self._and)
+
+    def _and(self) -> Tuple[int, str]:
+        return self._join("and", self._not)
+
+    def _not(self) -> Tuple[int, str]:
+        kind, text, position = self._next("a condition")
+        if (kind, text) == ("keyword", "not"):
+            cost, code = self._not()
+            return cost, f"not ({code})"
+        if (kind, text) == ("op", "("):
+            node = self._or()
+            if self._next("')'")[1] != ")":
+                raise FilterError(f"Expected ')' to close position {position}")
+            return node
+        if kind != "word":
+            raise FilterError(f"Expected a field at position {position}, got {text!r}")
+        name = text.lower()
+        if name in FLAG_FIELDS:
+            return 0, FLAG_FIELDS[name]
+        if name not in STRING_FIELDS:
+            raise FilterError(
+                f"Unknown field {text!r}; expected one of "
+                f"{', '.join(sorted(STRING_FIELDS) + sorted(FLAG_FIELDS))}"
+            )
+        op = self._next("an operator after " + text)
+        if op[0] != "op" or op[1] not in _OPERATORS:
+            raise FilterError(f"Expected an operator at position {op[2]}")
+        value = self._next("a value after " + op[1])
+        if value[0] not in ("word", "string"):
+            raise FilterError(f"Expected a value at position {value[2]}")
+        return self._comparison(STRING_FIELDS[name], op[1], value[1])
+
+    def _comparison(
+        self, targets: Tuple[str, ...], op: str, value: str
+    ) -> Tuple[int, str]:
+        cost = len(targets) * (2 if targets[0].startswith("_notes") else 1)
+        if op in ("~", "!~"):
+            try:
+                pattern = re.compile(value, re.IGNORECASE)
+            except re.error as e:
+                raise FilterError(f"Invalid regex {value!r}: {e}")
+            name = f"_m{len(self.namespace)}"
+            self.namespace[name] = pattern.search
+            tests = [f"{name}({target}) is not None" for target in targets]
+            cost *= 4
+        else:
+            folded = value.casefold()
+            tests = [f"{target}.casefold() == {folded!r}" for target in targets]
+        code = " or ".join(tests)
+        if op in ("!=", "!~"):
+            code = f"not ({code})"
+        return cost, code
+
+
+class RowFilter:
+    """A compiled filter expression; call it with a record to test it."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parser = _Parser(expression)
+        _, code = parser.parse()
+        self.code = code
+        namespace = dict(parser.namespace, __builtins__={})
+        self.predicate: Callable[[Record], bool] = eval(
+            compile(f"lambda r: {code}", "<filter>", "eval"), namespace
+        )
+
+    def __call__(self, record: Record) -> bool:
+        return self.predicate(record)
+
+    def __repr__(self) -> str:
+        return f"RowFilter({self.expression!r})"
+
+    def apply(
+        self, rows: RowSequence, ignored_keys: Optional[Container[str]] = None
+    ) -> RowSequence:
+        """The rows matching the filter, as the same kind of sequence."""
+        predicate = self.predicate
+        kept = [
+            i for i, r in enumerate(iter_records(rows, ignored_keys)) if predicate(r)
+        ]
+        if isinstance(rows, ColumnarRows):
+            return rows.take(kept)
+        return [rows[i] for i in kept]
+
+
+def compile_filter(expression: str) -> RowFilter:
+    """Parse and compile ``expression`` (raises ``FilterError``)."""
+    return RowFilter(expression)
+
+
+def iter_records(
+    rows: RowSequence, ignored_keys: Optional[Container[str]] = None
+) -> Iterator[Record]:
+    """Filter records for ``rows``; a columnar ``ignored`` bitmap wins over
+    ``ignored_keys``."""
+    if isinstance(rows, ColumnarRows):
+        if rows.ignored is not None:
+            ignored = map(bool, rows.ignored)
+        else:
+            ignored = (bool(ignored_keys) and key in ignored_keys for key in rows.keys)
+        return (
+            (*values, key, flags, flag)
+            for values, key, flags, flag in zip(
+                rows.iter_values(), rows.keys, rows.flags, ignored
+            )
+        )
+    return (
+        (
+            row.organization,
+            row.syncro_name,
+            row.huntress_name,
+            row.status,
+            key,
+            row.flags,
+            bool(ignored_keys) and key in ignored_keys,
+        )
+        for row, key in ((row, row_key(row)) for row in rows)
+    )
+
+
+def search_filter(text: str) -> Optional[RowFilter]:
+    """The filter for a search-box string, or None for plain-text search.
+
+    Text counts as an expression when it has a comparison operator and
+    parses; anything else stays a substring search.
+    """
+    if not any(op in text for op in ("=", "~")):
+        return None
+    try:
+        return compile_filter(text)
+    except FilterError:
+        return None
@@ -0,0 +1,170 @@
+"""Compiled ignore rules: exact hostnames plus wildcard patterns."""
+
+import fnmatch
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Union
+
+# Trie node key marking "a rule ends here" (never a hostname character).
+_END = ""
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IgnoreRule:
+    """One ignore entry: an exact key or a ``*`` / ``?`` glob pattern."""
+
+    pattern: str
+    expires: Optional[date] = None
+    hits: int = 0
+
+    def is_expired(self, today: date) -> bool:
+        return self.expires is not None and self.expires < today
+
+
+def _parse_entry(entry: Union[str, Dict]) -> Optional[IgnoreRule]:
+    """Build a rule from a settings entry: a string or a
+    ``{"pattern": ..., "expires": "YYYY-MM-DD"}`` dict.
+
+    An entry whose ``expires`` is not a date is skipped (None) with a
+    warning rather than failing the whole settings load.
+    """
+    if isinstance(entry, dict):
+        pattern = str(entry.get("pattern") or "")
+        expires = entry.get("expires")
+        try:
+            expiry = date.fromisoformat(expires) if expires else None
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Skipping ignore rule {pattern!r}: expires {expires!r} "
+                "is not a YYYY-MM-DD date"
+            )
+            return None
+    else:
+        pattern, expiry = str(entry), None
+    return IgnoreRule(pattern.strip().lower(), expiry)
+
+
+class IgnoreRules:
+    """Ignore matcher compiled once from exact keys and glob patterns.
+
+    Patterns match the normalized (lowercased, 15-character) row key. Exact
+    keys live in a dict, ``prefix*`` patterns in a character trie, ``*suffix``
+    patterns in a trie over the reversed key, and any other glob is folded
+    into one combined regex. The dict and tries make a lookup
+    O(hostname length) however many rules there are. Expired rules are kept
+    in ``rules`` but never match.
+
+    Supports ``key in rules`` so it drops in wherever a set of ignored keys
+    was used. Membership tests never count; only ``match`` (called once per
+    row by the comparison pass) bumps the matching rule's ``hits``, so GUI
+    re-checks and re-filters do not inflate the counts.
+    """
+
+    def __init__(
+        self,
+        exact: Iterable[str] = (),
+        patterns: Iterable[Union[str, Dict]] = (),
+        today: Optional[date] = None,
+    ):
+        today = today or date.today()
+        self.rules: List[IgnoreRule] = []
+        self._exact: Dict[str, IgnoreRule] = {}
+        self._prefixes: Dict = {}
+        self._suffixes: Dict = {}
+        globs: List[IgnoreRule] = []
+
+        for entry in list(exact) + list(patterns):
+            rule = _parse_entry(entry)
+            if rule is None or not rule.pattern:
+                continue
+            self.rules.append(rule)
+            if rule.is_expired(today):
+                continue
+            body = rule.pattern
+            if not any(c in body for c in "*?["):
+                self._exact.setdefault(body, rule)
+            elif body.endswith("*") and not any(c in body[:-1] for c in "*?["):
+                self._insert(self._prefixes, body[:-1], rule)
+            elif body.startswith("*") and not any(c in body[1:] for c in "*?["):
+                self._insert(self._suffixes, body[:0:-1], rule)
+            else:
+                globs.append(rule)
+
+        self._globs = globs
+        self._glob_re = (
+            re.compile(
+                "|".join(
+                    f"(?P<r{i}>{fnmatch.translate(rule.pattern)})"
+                    for i, rule in enumerate(globs)
+                )
+            )
+            if globs
+            else None
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Dict) -> "IgnoreRules":
+        """Compile ``IgnoredAssets`` (exact keys) and ``IgnorePatterns``."""
+        return cls(
+            settings.get("IgnoredAssets", []), settings.get("IgnorePatterns", [])
+        )
+
+    @staticmethod
+    def _insert(trie: Dict, text: str, rule: IgnoreRule) -> None:
+        node = trie
+        for char in text:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, rule)
+
+    @staticmethod
+    def _walk(trie: Dict, chars: Iterable[str]) -> Optional[IgnoreRule]:
+        """Return the rule for the shortest trie entry prefixing ``chars``."""
+        node = trie
+        for char in chars:
+            if _END in node:
+                return node[_END]
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def _find(self, key: str) -> Optional[IgnoreRule]:
+        rule = self._exact.get(key)
+        if rule is None and self._prefixes:
+            rule = self._walk(self._prefixes, key)
+        if rule is None and self._suffixes:
+            rule = self._walk(self._suffixes, reversed(key))
+        if rule is None and self._glob_re is not None:
+            found = self._glob_re.match(key)
+            if found:
+                rule = self._globs[int(found.lastgroup[1:])]
+        return rule
+
+    def match(self, key: str) -> Optional[IgnoreRule]:
+        """Return the rule ignoring ``key`` (and count the hit), or None."""
+        rule = self._find(key)
+        if rule is not None:
+            rule.hits += 1
+        return rule
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __bool__(self) -> bool:
+        return bool(self._exact or self._prefixes or self._suffixes or self._globs)
+
+    def flags(self, keys: Iterable[str]) -> bytearray:
+        """Ignored bitmap (1 = ignored) for ``keys``, in order, counting hits."""
+        return bytearray(self.match(key) is not None for key in keys)
+
+    def hit_counts(self) -> Dict[str, int]:
+        """Pattern -> number of keys it matched."""
+        return {rule.pattern: rule.hits for rule in self.rules}
+
+    def reset_hits(self) -> None:
+        for rule in self.rules:
+            rule.hits = 0
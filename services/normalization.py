@@ -0,0 +1,92 @@
+"""Hostname normalization with a bounded memo cache and string interning."""
+
+import sys
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+
+from const import MAX_NAME_WIDTH
+
+# Characters folded before NFKC in Unicode mode: zero-width / BOM characters
+# are dropped and typographic dashes and spaces become their ASCII forms.
+_UNICODE_TABLE = str.maketrans(
+    {
+        "\u200b": None,  # zero width space
+        "\u200c": None,  # zero width non-joiner
+        "\u200d": None,  # zero width joiner
+        "\u2060": None,  # word joiner
+        "\ufeff": None,  # byte order mark
+        "\u00a0": " ",  # no-break space
+        "\u2010": "-",  # hyphen
+        "\u2011": "-",  # non-breaking hyphen
+        "\u2012": "-",  # figure dash
+        "\u2013": "-",  # en dash
+        "\u2014": "-",  # em dash
+        "\u2212": "-",  # minus sign
+    }
+)
+
+
+class Normalizer:
+    """Normalizes hostnames to comparison keys, memoizing each result.
+
+    The default mode is ``strip().lower()[:length]``. ``unicode=True`` also
+    applies the translation table above, NFKC and ``casefold()``. Results are
+    interned, so equal keys are one object and dict lookups take the
+    identity fast path. The memo holds at most ``maxsize`` names.
+    """
+
+    def __init__(
+        self,
+        length: int = MAX_NAME_WIDTH,
+        unicode: bool = False,
+        maxsize: int = 65536,
+    ):
+        self.length = length
+        self.unicode = unicode
+        self.maxsize = maxsize
+        self._cached = lru_cache(maxsize=maxsize)(self._normalize)
+
+    def _normalize(self, name: str) -> str:
+        if self.unicode:
+            name = unicodedata.normalize("NFKC", name.translate(_UNICODE_TABLE))
+            folded = name.strip().casefold()
+        else:
+            folded = name.strip().lower()
+        return sys.intern(folded[: self.length])
+
+    def __call__(self, name: str) -> Optional[str]:
+        if not name:
+            return None
+        return self._cached(name)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters: calls, hits, misses and current size."""
+        info = self._cached.cache_info()
+        return {
+            "calls": info.hits + info.misses,
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+        }
+
+    def clear(self) -> None:
+        self._cached.cache_clear()
+
+
+_default = Normalizer()
+
+
+def default_normalizer() -> Normalizer:
+    """The normalizer behind ``services.comparison.normalize``."""
+    return _default
+
+
+def configure(unicode: bool = False, maxsize: Optional[int] = None) -> Normalizer:
+    """Replace the default normalizer (e.g. from the ``UnicodeHostnames``
+    setting). A no-op when nothing changes, so the memo is kept."""
+    global _default
+    maxsize = _default.maxsize if maxsize is None else maxsize
+    if unicode != _default.unicode or maxsize != _default.maxsize:
+        _default = Normalizer(unicode=unicode, maxsize=maxsize)
+    return _default
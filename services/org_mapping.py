@@ -0,0 +1,99 @@
+"""Syncro customer <-> Huntress organization pairing."""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from const import ORG_MAPPING_FILE
+
+
+class OrgMapping:
+    """Pairs Syncro customers with Huntress organizations.
+
+    ``derived`` pairs are rebuilt from hostname overlap on every scoped run;
+    ``overrides`` are edited by hand (in the JSON file) and always win. A
+    Huntress organization with no pair keeps its own name, so identically
+    named organizations still line up.
+    """
+
+    def __init__(
+        self,
+        overrides: Optional[Dict[str, str]] = None,
+        derived: Optional[Dict[str, str]] = None,
+    ):
+        self.overrides: Dict[str, str] = dict(overrides or {})
+        self.derived: Dict[str, str] = dict(derived or {})
+
+    @classmethod
+    def load(cls, path: str = ORG_MAPPING_FILE) -> "OrgMapping":
+        """Read a mapping file; a missing file gives an empty mapping."""
+        mapping_path = Path(path)
+        if not mapping_path.exists():
+            return cls()
+        try:
+            with open(mapping_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            raise ValueError(f"Failed to load organization mapping {path}: {e}")
+        return cls(data.get("overrides"), data.get("derived"))
+
+    def save(self, path: str = ORG_MAPPING_FILE) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"overrides": self.overrides, "derived": self.derived},
+                f,
+                indent=4,
+                sort_keys=True,
+            )
+
+    def pairs(self) -> Dict[str, str]:
+        """Syncro customer -> Huntress organization (overrides win)."""
+        combined = dict(self.derived)
+        combined.update(self.overrides)
+        return combined
+
+    def syncro_org_for(self) -> Dict[str, str]:
+        """Huntress organization -> the Syncro customer it is paired with."""
+        return {huntress: syncro for syncro, huntress in self.pairs().items()}
+
+    def derive(
+        self,
+        syncro_keys: Iterable[Tuple[str, str]],
+        huntress_keys: Iterable[Tuple[str, str]],
+        min_overlap: int = 1,
+    ) -> Dict[str, str]:
+        """Rebuild ``derived`` from ``(organization, hostname)`` keys.
+
+        Every Syncro customer / Huntress organization pair is scored by the
+        number of hostnames they share (one pass over each side). Pairs are
+        then taken greedily, largest overlap first, so each organization is
+        paired at most once; organizations already in ``overrides`` are left
+        alone.
+        """
+        hosts_to_syncro: Dict[str, Set[str]] = {}
+        for organization, host in syncro_keys:
+            if organization:
+                hosts_to_syncro.setdefault(host, set()).add(organization)
+
+        overlap: Dict[Tuple[str, str], int] = {}
+        for h_org, host in huntress_keys:
+            if not h_org:
+                continue
+            for s_org in hosts_to_syncro.get(host, ()):
+                overlap[(s_org, h_org)] = overlap.get((s_org, h_org), 0) + 1
+
+        taken_syncro = set(self.overrides)
+        taken_huntress = set(self.overrides.values())
+        derived: Dict[str, str] = {}
+        for (s_org, h_org), count in sorted(
+            overlap.items(), key=lambda item: (-item[1], item[0])
+        ):
+            if count < min_overlap:
+                break
+            if s_org in taken_syncro or h_org in taken_huntress:
+                continue
+            derived[s_org] = h_org
+            taken_syncro.add(s_org)
+            taken_huntress.add(h_org)
+        self.derived = derived
+        return derived
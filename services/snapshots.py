@@ -0,0 +1,289 @@
+"""SQLite-backed history of comparison results."""
+
+import codecs
+import json
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from const import SNAPSHOT_DB_FILE
+from services.columnar import ColumnarRows
+from services.comparison import ComparisonResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    syncro_count INTEGER NOT NULL,
+    huntress_count INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    stats TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_created ON snapshots (created_at);
+
+CREATE TABLE IF NOT EXISTS snapshot_orgs (
+    snapshot_id INTEGER NOT NULL,
+    code INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, code)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS snapshot_rows (
+    snapshot_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    org_code INTEGER NOT NULL,
+    status_code INTEGER NOT NULL,
+    syncro_name TEXT NOT NULL,
+    huntress_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    flags INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (snapshot_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshot_rows_key ON snapshot_rows (snapshot_id, key);
+
+CREATE TABLE IF NOT EXISTS snapshot_payloads (
+    snapshot_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (snapshot_id, source)
+) WITHOUT ROWID;
+"""
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be found or read."""
+
+    pass
+
+
+@dataclass
+class SnapshotInfo:
+    """Summary of one stored snapshot (no rows)."""
+
+    id: int
+    created_at: str
+    label: str
+    syncro_count: int
+    huntress_count: int
+    row_count: int
+    stats: Dict[str, float]
+
+
+class SnapshotStore:
+    """Stores comparison results in a local SQLite file.
+
+    Rows are kept in the same encoded form as ``ColumnarRows`` (organization
+    codes into a per-snapshot table, status codes), so loading a snapshot is
+    a single ordered scan. Raw API payloads are stored zlib-compressed and
+    only read when asked for.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_DB_FILE):
+        self.path = path
+        try:
+            self._conn = sqlite3.connect(path)
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+        except sqlite3.Error as e:
+            raise SnapshotError(f"Failed to open snapshot database {path}: {e}")
+
+    def _migrate(self) -> None:
+        """Add columns introduced after a database was created."""
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(snapshot_rows)")
+        }
+        if "flags" not in columns:
+            with self._conn:
+                self._conn.execute(
+                    "ALTER TABLE snapshot_rows"
+                    " ADD COLUMN flags INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def save(
+        self,
+        result: ComparisonResult,
+        label: str = "",
+        include_payloads: bool = True,
+    ) -> int:
+        """Store ``result`` and return the new snapshot id."""
+        rows = ColumnarRows.from_rows(result.rows)
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO snapshots (created_at, label, syncro_count,"
+                " huntress_count, row_count, stats) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    result.created_at,
+                    label,
+                    result.syncro_count,
+                    result.huntress_count,
+                    len(rows),
+                    json.dumps(result.stats),
+                ),
+            )
+            snapshot_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO snapshot_orgs VALUES (?, ?, ?)",
+                ((snapshot_id, code, name) for code, name in enumerate(rows.orgs)),
+            )
+            self._conn.executemany(
+                "INSERT INTO snapshot_rows (snapshot_id, position, org_code,"
+                " status_code, syncro_name, huntress_name, key, flags)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (snapshot_id, position, *values)
+                    for position, values in enumerate(
+                        zip(
+                            rows.org_codes,
+                            rows.status_codes,
+                            rows.syncro_names,
+                            rows.huntress_names,
+                            rows.keys,
+                            rows.flags,
+                        )
+                    )
+                ),
+            )
+            if include_payloads:
+                self._conn.executemany(
+                    "INSERT INTO snapshot_payloads VALUES (?, ?, ?)",
+                    (
+                        (snapshot_id, "syncro", _pack(result.syncro_assets)),
+                        (snapshot_id, "huntress", _pack(result.huntress_agents)),
+                    ),
+                )
+        return snapshot_id
+
+    def list_snapshots(self, limit: Optional[int] = None) -> List[SnapshotInfo]:
+        """Stored snapshots, newest first."""
+        query = (
+            "SELECT id, created_at, label, syncro_count, huntress_count,"
+            " row_count, stats FROM snapshots ORDER BY id DESC"
+        )
+        params: tuple = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        return [
+            SnapshotInfo(*row[:6], stats=json.loads(row[6]))
+            for row in self._conn.execute(query, params)
+        ]
+
+    def latest_id(self) -> Optional[int]:
+        row = self._conn.execute("SELECT MAX(id) FROM snapshots").fetchone()
+        return row[0]
+
+    def info(self, snapshot_id: int) -> SnapshotInfo:
+        row = self._conn.execute(
+            "SELECT id, created_at, label, syncro_count, huntress_count,"
+            " row_count, stats FROM snapshots WHERE id = ?",
+            (snapshot_id,),
+        ).fetchone()
+        if row is None:
+            raise SnapshotError(f"No snapshot with id {snapshot_id}")
+        return SnapshotInfo(*row[:6], stats=json.loads(row[6]))
+
+    def load(
+        self, snapshot_id: Optional[int] = None, with_payloads: bool = False
+    ) -> ComparisonResult:
+        """Load a snapshot (the latest when ``snapshot_id`` is None).
+
+        Rows come back as ``ColumnarRows``. Raw payloads are empty lists
+        unless ``with_payloads`` is set.
+        """
+        if snapshot_id is None:
+            snapshot_id = self.latest_id()
+            if snapshot_id is None:
+                raise SnapshotError("No snapshots have been saved yet")
+        info = self.info(snapshot_id)
+
+        orgs = [
+            name
+            for (name,) in self._conn.execute(
+                "SELECT name FROM snapshot_orgs WHERE snapshot_id = ? ORDER BY code",
+                (snapshot_id,),
+            )
+        ]
+        records = self._conn.execute(
+            "SELECT org_code, status_code, syncro_name, huntress_name, key, flags"
+            " FROM snapshot_rows WHERE snapshot_id = ? ORDER BY position",
+            (snapshot_id,),
+        ).fetchall()
+        columns = list(zip(*records)) if records else [()] * 6
+        rows = ColumnarRows.from_columns(
+            orgs,
+            columns[0],
+            columns[1],
+            list(columns[2]),
+            list(columns[3]),
+            list(columns[4]),
+            columns[5],
+        )
+
+        payloads: Dict[str, list] = {"syncro": [], "huntress": []}
+        if with_payloads:
+            for source, data in self._conn.execute(
+                "SELECT source, data FROM snapshot_payloads WHERE snapshot_id = ?",
+                (snapshot_id,),
+            ):
+                payloads[source] = _unpack(data)
+
+        return ComparisonResult(
+            syncro_assets=payloads["syncro"],
+            huntress_agents=payloads["huntress"],
+            rows=rows,
+            syncro_count=info.syncro_count,
+            huntress_count=info.huntress_count,
+            created_at=info.created_at,
+            stats=info.stats,
+        )
+
+    def payload_chunks(
+        self, snapshot_id: Optional[int], source: str, chunk_size: int = 1 << 16
+    ) -> Iterator[str]:
+        """Stream one stored payload's JSON text (the latest snapshot when
+        ``snapshot_id`` is None), decompressed ``chunk_size`` bytes at a time.
+
+        Yields nothing when the snapshot holds no ``source`` payload.
+        """
+        if snapshot_id is None:
+            snapshot_id = self.latest_id()
+            if snapshot_id is None:
+                raise SnapshotError("No snapshots have been saved yet")
+        self.info(snapshot_id)
+        row = self._conn.execute(
+            "SELECT data FROM snapshot_payloads WHERE snapshot_id = ? AND source = ?",
+            (snapshot_id, source),
+        ).fetchone()
+        if row is None:
+            return
+        data = memoryview(row[0])
+        inflater = zlib.decompressobj()
+        text = codecs.getincrementaldecoder("utf-8")()
+        for start in range(0, len(data), chunk_size):
+            # Bound each step's output too: payloads compress very well.
+            chunk = inflater.decompress(data[start : start + chunk_size], chunk_size)
+            while chunk:
+                yield text.decode(chunk)
+                chunk = inflater.decompress(inflater.unconsumed_tail, chunk_size)
+        yield text.decode(inflater.flush(), final=True)
+
+
+def _pack(records: list) -> bytes:
+    return zlib.compress(
+        json.dumps(records, separators=(",", ":"), default=str).encode("utf-8")
+    )
+
+
+def _unpack(data: bytes) -> list:
+    return json.loads(zlib.decompress(data).decode("utf-8"))
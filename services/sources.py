@@ -0,0 +1,154 @@
+"""Inventory sources (connectors) for N-way comparisons."""
+
+import abc
+import csv
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from services.comparison import (
+    HUNTRESS_SEEN_FIELDS,
+    SYNCRO_SEEN_FIELDS,
+    extract_org,
+    fetch_huntress_org_names,
+)
+
+if TYPE_CHECKING:
+    from api.client import HuntressClient, SyncroClient
+
+# CSV headers (casefolded) tried, in order, for the hostname / organization.
+HOSTNAME_COLUMNS = (
+    "hostname",
+    "dnshostname",
+    "computername",
+    "computer name",
+    "computer",
+    "name",
+    "host",
+)
+ORGANIZATION_COLUMNS = ("organization", "customer", "company", "org")
+
+# Record field CsvSource stores the bare hostname under.
+CSV_HOSTNAME_FIELD = "_hostname"
+
+
+class InventorySource(abc.ABC):
+    """One host inventory to reconcile.
+
+    Subclasses set ``name`` (shown in column headers and statuses),
+    ``key_field`` (the record field holding the hostname) and implement
+    ``fetch``. ``organization`` and ``seen_fields`` are optional.
+    """
+
+    name = ""
+    key_field = "name"
+    seen_fields: Tuple[str, ...] = ()
+
+    @abc.abstractmethod
+    def fetch(self) -> List[Dict]:
+        """Every record of this inventory."""
+
+    def organization(self, record: Dict) -> str:
+        return ""
+
+
+class SyncroSource(InventorySource):
+    """Syncro assets."""
+
+    name = "Syncro"
+    key_field = "name"
+    seen_fields = SYNCRO_SEEN_FIELDS
+
+    def __init__(self, client: "SyncroClient"):
+        self.client = client
+
+    def fetch(self) -> List[Dict]:
+        return self.client.get_all_assets()
+
+    def organization(self, record: Dict) -> str:
+        return extract_org(record)
+
+
+class HuntressSource(InventorySource):
+    """Huntress agents (organization names are fetched alongside)."""
+
+    name = "Huntress"
+    key_field = "hostname"
+    seen_fields = HUNTRESS_SEEN_FIELDS
+
+    def __init__(self, client: "HuntressClient"):
+        self.client = client
+        self._org_names: Dict[int, str] = {}
+
+    def fetch(self) -> List[Dict]:
+        self._org_names = fetch_huntress_org_names(self.client)
+        return self.client.get_all_agents()
+
+    def organization(self, record: Dict) -> str:
+        return self._org_names.get(record.get("organization_id"), "")
+
+
+def _find_column(fieldnames: Sequence[str], candidates: Sequence[str]) -> Optional[str]:
+    by_name = {name.strip().casefold(): name for name in fieldnames if name}
+    for candidate in candidates:
+        if candidate in by_name:
+            return by_name[candidate]
+    return None
+
+
+class CsvSource(InventorySource):
+    """An inventory exported to CSV (an AV console export, an AD computer list).
+
+    The hostname and organization columns are picked from the header
+    (``HOSTNAME_COLUMNS`` / ``ORGANIZATION_COLUMNS``) unless given. Fully
+    qualified names are cut at the first dot, so ``pc-01.corp.local`` matches
+    the ``PC-01`` the other sources report.
+    """
+
+    key_field = CSV_HOSTNAME_FIELD
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        hostname_column: Optional[str] = None,
+        organization_column: Optional[str] = None,
+    ):
+        self.name = name
+        self.path = path
+        self.hostname_column = hostname_column
+        self.organization_column = organization_column
+
+    def fetch(self) -> List[Dict]:
+        with open(self.path, "r", newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or []
+            hostname_column = self.hostname_column or _find_column(
+                fieldnames, HOSTNAME_COLUMNS
+            )
+            if hostname_column is None:
+                raise ValueError(
+                    f"{self.path}: no hostname column (expected one of "
+                    f"{', '.join(HOSTNAME_COLUMNS)})"
+                )
+            if self.organization_column is None:
+                self.organization_column = _find_column(
+                    fieldnames, ORGANIZATION_COLUMNS
+                )
+            records = []
+            for record in reader:
+                hostname = (record.get(hostname_column) or "").strip()
+                record[CSV_HOSTNAME_FIELD] = hostname.split(".", 1)[0]
+                records.append(record)
+        return records
+
+    def organization(self, record: Dict) -> str:
+        if self.organization_column is None:
+            return ""
+        return (record.get(self.organization_column) or "").strip()
+
+
+def parse_source_spec(spec: str) -> CsvSource:
+    """Build a ``CsvSource`` from a ``NAME=PATH`` command-line value."""
+    name, sep, path = spec.partition("=")
+    if not sep or not name.strip() or not path.strip():
+        raise ValueError(f"Expected NAME=PATH, got {spec!r}")
+    return CsvSource(name.strip(), path.strip())
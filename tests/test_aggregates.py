@@ -0,0 +1,60 @@
+import pytest
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.aggregates import OrgAggregates
+from services.columnar import ColumnarRows
+from services.comparison import ComparisonRow
+
+
+@pytest.fixture
+def rows():
+    return [
+        ComparisonRow("PC-1", "PC-1", STATUS_OK, "Acme"),
+        ComparisonRow("PC-2", "", STATUS_MISSING_HUNTRESS, "Acme"),
+        ComparisonRow("", "GHOST", STATUS_MISSING_SYNCRO, "Globex"),
+        ComparisonRow("OLD", "", STATUS_MISSING_HUNTRESS, "Globex"),
+    ]
+
+
+class TestOrgAggregates:
+    def test_build_counts_per_org(self, rows):
+        aggregates = OrgAggregates.build(rows, {"old"})
+        acme = aggregates.by_org["Acme"]
+        globex = aggregates.by_org["Globex"]
+        assert (acme.ok, acme.missing_huntress, acme.ignored) == (1, 1, 0)
+        assert (globex.missing_syncro, globex.missing_huntress) == (1, 0)
+        assert globex.ignored == 1
+
+    def test_build_from_columnar_matches_rows(self, rows):
+        plain = OrgAggregates.build(rows, {"old"})
+        columnar = OrgAggregates.build(ColumnarRows.from_rows(rows), {"old"})
+        assert plain.by_org == columnar.by_org
+
+    def test_totals_skip_excluded_orgs(self, rows):
+        aggregates = OrgAggregates.build(rows)
+        assert aggregates.totals().total == 4
+        aggregates.set_excluded({"Globex"})
+        assert aggregates.totals().total == 2
+        assert aggregates.totals(include={"Acme"}).ok == 1
+
+    def test_set_ignored_moves_counts(self, rows):
+        aggregates = OrgAggregates.build(rows)
+        aggregates.set_ignored("Acme", STATUS_MISSING_HUNTRESS, True)
+        acme = aggregates.by_org["Acme"]
+        assert (acme.missing_huntress, acme.ignored) == (0, 1)
+        aggregates.set_ignored("Acme", STATUS_MISSING_HUNTRESS, False)
+        assert (acme.missing_huntress, acme.ignored) == (1, 0)
+
+    def test_copy_is_independent(self, rows):
+        aggregates = OrgAggregates.build(rows)
+        copied = aggregates.copy()
+        copied.set_ignored("Acme", STATUS_MISSING_HUNTRESS, True)
+        copied.set_excluded({"Acme"})
+        assert aggregates.by_org["Acme"].ignored == 0
+        assert aggregates.excluded == set()
+
+    def test_organizations_skip_blank(self):
+        aggregates = OrgAggregates.build(
+            [ComparisonRow("", "X", STATUS_MISSING_SYNCRO, "")]
+        )
+        assert aggregates.organizations() == []
@@ -0,0 +1,98 @@
+import pytest
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import (
+    ORDER_ORG,
+    ComparisonRow,
+    make_sort_key,
+    order_indexes,
+)
+
+
+@pytest.fixture
+def rows():
+    return [
+        ComparisonRow("PC-1", "PC-1", STATUS_OK, "Acme"),
+        ComparisonRow("PC-2", "", STATUS_MISSING_HUNTRESS, "Globex"),
+        ComparisonRow("", "GHOST", STATUS_MISSING_SYNCRO, "Acme"),
+    ]
+
+
+class TestColumnarRows:
+    def test_round_trips_row_views(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        assert len(store) == 3
+        assert list(store) == rows
+        assert store[1] == rows[1]
+
+    def test_interns_org_names(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        assert store.orgs == ["Acme", "Globex"]
+        assert list(store.org_codes) == [0, 1, 0]
+
+    def test_keys_match_row_key(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        assert store.keys == ["pc-1", "pc-2", "ghost"]
+
+    def test_iter_values_without_rows(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        assert next(store.iter_values()) == ("Acme", "PC-1", "PC-1", STATUS_OK)
+
+    def test_take_and_slice(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        taken = store.take([2, 0])
+        assert [r.syncro_name for r in taken] == ["", "PC-1"]
+        assert len(store[1:]) == 2
+
+    def test_partition_by_org(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        store.mark_ignored({"ghost"})
+        parts = store.partition_by_org()
+        assert set(parts) == {"Acme", "Globex"}
+        assert [r.huntress_name for r in parts["Acme"]] == ["PC-1", "GHOST"]
+        assert list(parts["Acme"].ignored) == [0, 1]
+        # Each part's organization table holds only its own organization.
+        assert parts["Globex"].orgs == ["Globex"]
+        assert list(parts["Globex"].org_codes) == [0]
+
+    def test_compact_orgs(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        assert store.compact_orgs() is store
+        padded = ColumnarRows.from_columns(
+            ["Secret", "Acme"], [1], [0], ["PC-1"], ["PC-1"], ["pc-1"]
+        )
+        compact = padded.compact_orgs()
+        assert compact.orgs == ["Acme"]
+        assert list(compact) == list(padded)
+
+    def test_status_counts_skip_ignored(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        counts, ignored = store.status_counts({"pc-2"})
+        assert counts[STATUS_MISSING_HUNTRESS] == 0
+        assert counts[STATUS_OK] == 1
+        assert ignored == 1
+
+    def test_exclude_status(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        assert len(store.exclude_status(STATUS_OK)) == 2
+
+    def test_orderings_work_on_columns(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        assert order_indexes(store, ORDER_ORG) == order_indexes(rows, ORDER_ORG)
+
+    def test_sort_keys_are_stored_not_rebuilt(self, rows, monkeypatch):
+        store = ColumnarRows.from_rows(rows)
+        assert store.sort_keys == [row.sort_key for row in rows]
+        joined = ColumnarRows.concat([store.take([2]), store.take([0, 1])])
+        assert joined.sort_keys == [
+            make_sort_key(*values[:3]) for values in joined.iter_values()
+        ]
+
+        def fail(*args):
+            raise AssertionError("sort key rebuilt")
+
+        monkeypatch.setattr("services.columnar.make_sort_key", fail)
+        monkeypatch.setattr("services.comparison.make_sort_key", fail)
+        assert order_indexes(joined, ORDER_ORG) == [0, 1, 2]
+        assert joined.row(0).sort_key is joined.sort_keys[0]
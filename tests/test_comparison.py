@@ -1,9 +1,23 @@
+import json
+import threading
 from unittest.mock import Mock
 
 import pytest
+import responses
 
 from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
-from services.comparison import ComparisonService, extract_org, normalize
+from services.comparison import (
+    ORDER_HOSTNAME,
+    ORDER_HUNTRESS,
+    ORDER_ORG,
+    ORDER_STATUS,
+    ComparisonResult,
+    ComparisonRow,
+    ComparisonService,
+    extract_org,
+    normalize,
+    order_indexes,
+)
 
 
 class TestNormalize:
@@ -111,6 +125,370 @@ class TestComparisonService:
         assert result.rows[1].syncro_name == "MISSING-IN-HUNTRESS"
         assert result.rows[1].status == STATUS_MISSING_HUNTRESS
 
+    def test_columnar_output_matches_rows(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [{"name": "OK-PC"}, {"name": "LOST"}]
+        huntress.get_all_agents.return_value = [{"hostname": "OK-PC"}]
+
+        plain = service.fetch_and_compare()
+        columnar = service.fetch_and_compare(columnar=True)
+
+        assert list(columnar.rows) == plain.rows
+        # The second run re-normalizes the same names from the memo.
+        assert columnar.stats["normalize_calls"] > 0
+        assert (
+            columnar.stats["normalize_cache_hits"] == columnar.stats["normalize_calls"]
+        )
+
+    def test_emits_org_aggregates(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [
+            {"name": "OK-PC", "customer": {"business_name": "Acme"}},
+            {"name": "LOST", "customer": {"business_name": "Acme"}},
+        ]
+        huntress.get_all_agents.return_value = [{"hostname": "OK-PC"}]
+
+        result = service.fetch_and_compare(ignored_keys={"lost"})
+
+        acme = result.aggregates.by_org["Acme"]
+        assert (acme.ok, acme.missing_huntress, acme.ignored) == (1, 0, 1)
+
+    def test_flags_duplicate_keys_with_ids(self, service, mock_clients):
+        from services.comparison import FLAG_DUPLICATE_HUNTRESS
+
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [{"id": 1, "name": "PC-1"}]
+        huntress.get_all_agents.return_value = [
+            {"id": 10, "hostname": "PC-1"},
+            {"id": 11, "hostname": "pc-1"},
+        ]
+
+        result = service.fetch_and_compare()
+
+        assert result.rows[0].flags == FLAG_DUPLICATE_HUNTRESS
+        assert result.duplicates == {"syncro": {}, "huntress": {"pc-1": [10, 11]}}
+        assert result.huntress_count == 1
+
+    def test_flags_stale_entries(self, service, mock_clients):
+        from services.comparison import FLAG_STALE_HUNTRESS
+
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [{"name": "OLD"}, {"name": "NEW"}]
+        huntress.get_all_agents.return_value = [
+            {"hostname": "OLD", "last_callback_at": "2000-01-01T00:00:00Z"},
+            {"hostname": "NEW", "last_callback_at": "2999-01-01T00:00:00Z"},
+        ]
+
+        result = service.fetch_and_compare(columnar=True, stale_after_days=30)
+        flags = dict(zip(result.rows.keys, result.rows.flags))
+        assert flags == {"old": FLAG_STALE_HUNTRESS, "new": 0}
+
+        # Without a threshold nothing is stale.
+        result = service.fetch_and_compare(columnar=True)
+        assert not any(result.rows.flags)
+
+    def test_stale_check_accepts_z_suffix(self, monkeypatch):
+        from services import comparison
+
+        calls = []
+        real = comparison.datetime
+
+        class NoZDatetime(real):
+            # Python < 3.11 rejects a trailing "Z".
+            @classmethod
+            def fromisoformat(cls, value):
+                calls.append(value)
+                if value.endswith("Z"):
+                    raise ValueError(value)
+                return real.fromisoformat(value)
+
+        monkeypatch.setattr(comparison, "datetime", NoZDatetime)
+        cutoff = real(2020, 1, 1, tzinfo=comparison.timezone.utc)
+        assert comparison._is_stale("2000-01-01T00:00:00Z", cutoff)
+        assert comparison._is_stale("2000-01-01T00:00:00.123Z", cutoff)
+        assert not comparison._is_stale("2999-01-01T00:00:00Z", cutoff)
+        assert calls[0] == "2000-01-01T00:00:00+00:00"
+
+    def test_updated_at_is_not_a_check_in(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [
+            {"name": "OLD", "updated_at": "2000-01-01T00:00:00Z"}
+        ]
+        huntress.get_all_agents.return_value = []
+
+        result = service.fetch_and_compare(columnar=True, stale_after_days=30)
+        assert list(result.rows.flags) == [0]
+
+    def test_org_scoped_matching_keeps_tenants_apart(self, service, mock_clients):
+        from services.org_mapping import OrgMapping
+
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [
+            {"name": "DESKTOP-01", "customer": {"business_name": "Acme"}},
+            {"name": "ACME-DC", "customer": {"business_name": "Acme"}},
+            {"name": "DESKTOP-01", "customer": {"business_name": "Globex"}},
+        ]
+        huntress.get_all_agents.return_value = [
+            {"hostname": "DESKTOP-01", "organization_id": 1},
+            {"hostname": "ACME-DC", "organization_id": 1},
+        ]
+        huntress.get_all_organizations.return_value = [{"id": 1, "name": "ACME Inc"}]
+
+        # Hostname-only matching reports one (false) OK for DESKTOP-01.
+        plain = service.fetch_and_compare()
+        assert len(plain.rows) == 2
+
+        mapping = OrgMapping()
+        result = service.fetch_and_compare(org_mapping=mapping)
+
+        assert mapping.derived == {"Acme": "ACME Inc"}
+        statuses = {(r.organization, r.syncro_name): r.status for r in result.rows}
+        assert statuses == {
+            ("Acme", "DESKTOP-01"): STATUS_OK,
+            ("Acme", "ACME-DC"): STATUS_OK,
+            ("Globex", "DESKTOP-01"): STATUS_MISSING_HUNTRESS,
+        }
+        assert result.syncro_count == 3
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_refresh_org_splices_one_partition(self, service, mock_clients, columnar):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [
+            {"name": "ACME-1", "customer_id": 1, "customer": {"business_name": "Acme"}},
+            {
+                "name": "GLX-1",
+                "customer_id": 2,
+                "customer": {"business_name": "Globex"},
+            },
+        ]
+        huntress.get_all_agents.return_value = [
+            {"hostname": "GLX-1", "organization_id": 20},
+        ]
+        huntress.get_all_organizations.return_value = [
+            {"id": 10, "name": "Acme"},
+            {"id": 20, "name": "Globex"},
+        ]
+        result = service.fetch_and_compare(columnar=columnar)
+        assert result.aggregates.by_org["Acme"].missing_huntress == 1
+
+        # The technician installs the Acme agent; only Acme is re-fetched.
+        syncro.get_all_assets.reset_mock()
+        huntress.get_all_agents.reset_mock()
+        syncro.get_all_assets.return_value = [
+            {"name": "ACME-1", "customer_id": 1, "customer": {"business_name": "Acme"}}
+        ]
+        huntress.get_all_agents.return_value = [
+            {"hostname": "ACME-1", "organization_id": 10}
+        ]
+
+        refreshed = service.refresh_org(result, "Acme")
+
+        syncro.get_all_assets.assert_called_once_with(customer_id=1)
+        huntress.get_all_agents.assert_called_once_with(organization_id=10)
+        statuses = {r.syncro_name: r.status for r in refreshed.rows}
+        assert statuses == {"ACME-1": STATUS_OK, "GLX-1": STATUS_OK}
+        assert refreshed.aggregates.by_org["Acme"].ok == 1
+        # The previous result (e.g. a diff baseline) is left as it was.
+        assert result.aggregates.by_org["Acme"].missing_huntress == 1
+        assert result.aggregates.by_org["Acme"].ok == 0
+        assert refreshed.huntress_count == 2
+        assert len(refreshed.huntress_agents) == 2
+
+    def test_refresh_unknown_org_raises(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = []
+        huntress.get_all_agents.return_value = []
+        huntress.get_all_organizations.return_value = []
+        result = service.fetch_and_compare()
+
+        with pytest.raises(ValueError):
+            service.refresh_org(result, "Nobody")
+
+    def test_org_filter_pushed_down_to_fetch(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_customers.return_value = [
+            {"id": 1, "business_name": "Acme"},
+            {"id": 3, "business_name": "Acme Labs"},
+        ]
+        syncro.get_all_assets.return_value = [
+            {"name": "ACME-1", "customer_id": 1, "customer": {"business_name": "Acme"}}
+        ]
+        huntress.get_all_agents.return_value = [
+            {"hostname": "ACME-1", "organization_id": 10}
+        ]
+        huntress.get_all_organizations.return_value = [
+            {"id": 10, "name": "Acme"},
+            {"id": 20, "name": "Globex"},
+        ]
+
+        result = service.fetch_and_compare(organizations=["Acme"])
+
+        syncro.get_customers.assert_called_once_with(business_name="Acme")
+        syncro.get_all_assets.assert_called_once_with(customer_id=1)
+        huntress.get_all_agents.assert_called_once_with(organization_id=10)
+        assert [(r.syncro_name, r.status) for r in result.rows] == [
+            ("ACME-1", STATUS_OK)
+        ]
+
+    def test_org_filter_unknown_org_raises(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_customers.return_value = []
+        huntress.get_all_organizations.return_value = [{"id": 20, "name": "Globex"}]
+
+        with pytest.raises(ValueError):
+            service.fetch_and_compare(organizations=["Nobody"])
+        syncro.get_all_assets.assert_not_called()
+
+    def test_scoped_ties_keep_a_stable_order(self, service, mock_clients):
+        from services.org_mapping import OrgMapping
+
+        syncro, huntress = mock_clients
+        assets = [
+            {"name": "DESKTOP-01", "customer": {"business_name": org}}
+            for org in ("Globex", "Acme", "Initech")
+        ]
+        huntress.get_all_agents.return_value = []
+        huntress.get_all_organizations.return_value = []
+        orders = []
+        for records in (assets, assets[::-1]):
+            syncro.get_all_assets.return_value = records
+            result = service.fetch_and_compare(org_mapping=OrgMapping())
+            orders.append([r.organization for r in result.rows])
+        assert orders[0] == orders[1] == ["Acme", "Globex", "Initech"]
+
+    def test_indexes_pages_as_they_stream_in(self, service, mock_clients):
+        from services.org_mapping import OrgMapping
+
+        syncro, huntress = mock_clients
+        org_names_ready = threading.Event()
+
+        def syncro_pages(on_page):
+            on_page([{"name": "PC-1", "customer": {"business_name": "Acme"}}])
+            on_page([{"name": "PC-2", "customer": {"business_name": "Acme"}}])
+
+        def huntress_pages(on_page):
+            # Agents arrive before the organization names do.
+            on_page([{"hostname": "PC-1", "organization_id": 10}])
+            org_names_ready.set()
+
+        def organizations():
+            org_names_ready.wait(5)
+            return [{"id": 10, "name": "Acme"}]
+
+        syncro.get_all_assets.side_effect = syncro_pages
+        huntress.get_all_agents.side_effect = huntress_pages
+        huntress.get_all_organizations.side_effect = organizations
+
+        result = service.fetch_and_compare(org_mapping=OrgMapping())
+
+        statuses = {(r.organization, r.syncro_name): r.status for r in result.rows}
+        assert statuses == {
+            ("Acme", "PC-1"): STATUS_OK,
+            ("Acme", "PC-2"): STATUS_MISSING_HUNTRESS,
+        }
+        assert len(result.syncro_assets) == 2
+
+    def test_fetch_error_propagates(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.side_effect = RuntimeError("Syncro down")
+        huntress.get_all_agents.return_value = []
+        huntress.get_all_organizations.return_value = []
+
+        with pytest.raises(RuntimeError, match="Syncro down"):
+            service.fetch_and_compare()
+
+    def test_unchanged_content_returns_previous(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [{"name": "PC-1"}]
+        huntress.get_all_agents.return_value = [{"hostname": "PC-1"}]
+        syncro.content_hash.return_value = "s1"
+        huntress.content_hash.return_value = "h1"
+
+        first = service.fetch_and_compare()
+        assert service.fetch_and_compare(previous=first) is first
+
+        # Different options or data rebuild the result.
+        assert service.fetch_and_compare(previous=first, columnar=True) is not first
+        huntress.content_hash.return_value = "h2"
+        assert service.fetch_and_compare(previous=first) is not first
+
+    def test_no_short_circuit_without_hashes(self, service, mock_clients):
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = []
+        huntress.get_all_agents.return_value = []
+        syncro.content_hash.return_value = ""
+        huntress.content_hash.return_value = ""
+
+        first = service.fetch_and_compare()
+
+        assert first.content_hashes == {}
+        assert service.fetch_and_compare(previous=first) is not first
+
+    @responses.activate
+    def test_reused_clients_hash_only_the_current_pass(self):
+        from urllib.parse import parse_qs, urlparse
+
+        from api.client import HuntressClient, SyncroClient
+        from const import (
+            HUNTRESS_API_URL,
+            HUNTRESS_ORGANIZATIONS_URL,
+            SYNCRO_BASE_URL_TEMPLATE,
+        )
+
+        failing = set()
+
+        def assets_page(request):
+            page = parse_qs(urlparse(request.url).query)["page"][0]
+            if page in failing:
+                return 404, {}, "{}"
+            body = {"assets": [{"id": page, "name": f"PC-{page}"}]}
+            body["meta"] = {"total_pages": 2}
+            return 200, {}, json.dumps(body)
+
+        url = SYNCRO_BASE_URL_TEMPLATE.format(subdomain="acme") + "customer_assets"
+        responses.add_callback(responses.GET, url, callback=assets_page)
+        responses.add(responses.GET, HUNTRESS_API_URL, json={"agents": []})
+        responses.add(
+            responses.GET, HUNTRESS_ORGANIZATIONS_URL, json={"organizations": []}
+        )
+        service = ComparisonService(
+            SyncroClient("key", "acme"), HuntressClient("key", "secret")
+        )
+
+        first = service.fetch_and_compare()
+        assert first.content_hashes
+        assert service.fetch_and_compare(previous=first) is first
+
+        # Page 2 fails: its hash from the first pass must not stand in for it.
+        failing.add("2")
+        partial = service.fetch_and_compare(previous=first)
+        assert partial is not first
+        assert partial.content_hashes == {}
+        assert ("customer_assets", None, 2) not in service.syncro_client.page_hashes
+
+        # A complete pass hashes again, without pages left over from before.
+        failing.clear()
+        assert service.fetch_and_compare(previous=first).content_hashes == (
+            first.content_hashes
+        )
+
+    def test_columnar_rows_carry_ignored_bitmap(self, service, mock_clients):
+        from services.ignore_rules import IgnoreRules
+
+        syncro, huntress = mock_clients
+        syncro.get_all_assets.return_value = [{"name": "OK-PC"}, {"name": "KIOSK-1"}]
+        huntress.get_all_agents.return_value = [{"hostname": "OK-PC"}]
+
+        rules = IgnoreRules(patterns=["kiosk-*"])
+        result = service.fetch_and_compare(columnar=True, ignored_keys=rules)
+
+        flags = dict(zip(result.rows.keys, result.rows.ignored))
+        assert flags == {"ok-pc": 0, "kiosk-1": 1}
+        assert rules.hit_counts() == {"kiosk-*": 1}
+        # Re-marking (as the GUI does on every ignore change) is not a hit.
+        result.rows.mark_ignored(rules)
+        assert rules.hit_counts() == {"kiosk-*": 1}
+
     def test_assets_with_empty_names_ignored(self, service, mock_clients):
         syncro, huntress = mock_clients
         syncro.get_all_assets.return_value = [
@@ -130,6 +508,54 @@ class TestComparisonService:
         assert result.rows[0].status == STATUS_OK
 
 
+class TestOrderings:
+    @pytest.fixture
+    def rows(self):
+        return [
+            ComparisonRow("b-pc", "B-PC", STATUS_OK, "Zeta"),
+            ComparisonRow("", "a-ghost", STATUS_MISSING_SYNCRO, "acme"),
+            ComparisonRow("C-PC", "", STATUS_MISSING_HUNTRESS, "Acme"),
+        ]
+
+    def test_sort_key_is_casefolded(self):
+        row = ComparisonRow("PC-1", "", STATUS_MISSING_HUNTRESS, "ACME")
+        assert row.sort_key.organization == "acme"
+        assert row.sort_key.hostname == "pc-1"
+
+    def test_hostname_falls_back_to_huntress_name(self, rows):
+        assert order_indexes(rows, ORDER_HOSTNAME) == [1, 0, 2]
+
+    def test_huntress_ordering_sorts_by_huntress_name(self):
+        rows = [
+            ComparisonRow("A-PC", "Z-PC", STATUS_OK),
+            ComparisonRow("B-PC", "Y-PC", STATUS_OK),
+            ComparisonRow("C-PC", "", STATUS_MISSING_HUNTRESS),
+        ]
+        assert order_indexes(rows, ORDER_HOSTNAME) == [0, 1, 2]
+        assert order_indexes(rows, ORDER_HUNTRESS) == [2, 1, 0]
+
+    def test_org_ordering_is_case_insensitive_and_stable(self, rows):
+        assert order_indexes(rows, ORDER_ORG) == [1, 2, 0]
+
+    def test_status_ordering_puts_problems_first(self, rows):
+        assert order_indexes(rows, ORDER_STATUS) == [2, 1, 0]
+
+    def test_unknown_ordering_raises(self, rows):
+        with pytest.raises(ValueError):
+            order_indexes(rows, "nope")
+
+    def test_result_caches_orderings(self, rows):
+        result = ComparisonResult([], [], rows, 2, 2)
+        assert result.order(ORDER_ORG) is result.order(ORDER_ORG)
+        assert [r.organization for r in result.ordered(ORDER_ORG)] == [
+            "acme",
+            "Acme",
+            "Zeta",
+        ]
+        # The underlying rows keep engine order.
+        assert result.rows[0].organization == "Zeta"
+
+
 class TestExtractOrg:
     def test_reads_business_name(self):
         asset = {"name": "PC", "customer": {"business_name": "Acme Corp"}}
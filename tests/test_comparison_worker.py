@@ -73,6 +73,44 @@ class TestComparisonWorker:
         )
         mock_service.fetch_and_compare.assert_called_once()
 
+    @patch("gui.workers.comparison_worker.SyncroClient")
+    @patch("gui.workers.comparison_worker.HuntressClient")
+    @patch("gui.workers.comparison_worker.ComparisonService")
+    def test_refresh_org_uses_scoped_refresh(
+        self, mock_service_cls, mock_huntress_cls, mock_syncro_cls, mock_settings
+    ):
+        previous = Mock()
+        worker = ComparisonWorker(mock_settings, previous=previous, organization="Acme")
+        mock_service = mock_service_cls.return_value
+        mock_service.refresh_org.return_value = Mock(rows=[], syncro_assets=[])
+
+        worker.run()
+
+        mock_service.fetch_and_compare.assert_not_called()
+        args, _ = mock_service.refresh_org.call_args
+        assert args == (previous, "Acme")
+
+    @patch("gui.workers.comparison_worker.SyncroClient")
+    @patch("gui.workers.comparison_worker.HuntressClient")
+    @patch("gui.workers.comparison_worker.ComparisonService")
+    def test_unchanged_data_emits_unchanged(
+        self, mock_service_cls, mock_huntress_cls, mock_syncro_cls, mock_settings
+    ):
+        previous = Mock()
+        worker = ComparisonWorker(mock_settings, previous=previous)
+        mock_service_cls.return_value.fetch_and_compare.return_value = previous
+        unchanged, results, finished = [], [], []
+        worker.unchanged.connect(lambda: unchanged.append(True))
+        worker.result.connect(results.append)
+        worker.finished_work.connect(lambda: finished.append(True))
+
+        worker.run()
+
+        _, kwargs = mock_service_cls.return_value.fetch_and_compare.call_args
+        assert kwargs["previous"] is previous
+        assert unchanged == [True] and finished == [True]
+        assert results == []
+
     @patch("gui.workers.comparison_worker.SyncroClient")
     def test_run_error_emits_error_signal(self, mock_syncro_cls, worker):
         """Test that exception during run emits error signal."""
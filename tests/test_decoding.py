@@ -0,0 +1,103 @@
+import json
+
+import responses
+
+from api.client import HuntressClient
+from api.decoding import HUNTRESS_AGENT_FIELDS, ProcessPoolDecoder, decode_page
+from const import HUNTRESS_API_URL
+
+PAGE = {
+    "agents": [
+        {"id": 1, "hostname": "PC-1", "organization_id": 10, "os": "Windows"},
+        {"id": 2, "hostname": "PC-2", "ipv4_address": "10.0.0.2"},
+    ],
+    "pagination": {"total_count": 2, "limit": 500},
+}
+
+
+class TestDecodePage:
+    def test_projects_records(self):
+        data = decode_page(json.dumps(PAGE).encode(), "agents", HUNTRESS_AGENT_FIELDS)
+
+        assert data["agents"] == [
+            {"id": 1, "hostname": "PC-1", "organization_id": 10},
+            {"id": 2, "hostname": "PC-2"},
+        ]
+        assert data["pagination"] == PAGE["pagination"]
+
+    def test_without_fields_keeps_records(self):
+        assert decode_page(json.dumps(PAGE).encode(), "agents") == PAGE
+
+
+class TestProcessPoolDecoder:
+    def test_decodes_in_worker_process(self):
+        with ProcessPoolDecoder(max_workers=1) as decoder:
+            data = decoder.decode(json.dumps(PAGE).encode(), "agents", ("hostname",))
+
+        assert data["agents"] == [{"hostname": "PC-1"}, {"hostname": "PC-2"}]
+
+    @responses.activate
+    def test_client_uses_decoder(self):
+        responses.add(responses.GET, HUNTRESS_API_URL, json=PAGE)
+        client = HuntressClient("key", "secret")
+        calls = []
+
+        class RecordingDecoder:
+            def decode(self, body, list_key, fields):
+                calls.append(list_key)
+                return decode_page(body, list_key, fields)
+
+        client.decoder = RecordingDecoder()
+        agents = client.get_agents()
+
+        assert calls == ["agents"]
+        assert agents[0] == {"id": 1, "hostname": "PC-1", "organization_id": 10}
+
+
+class TestDecodeModesAgree:
+    ASSETS = {
+        "assets": [
+            {"id": 1, "name": "PC-1", "customer_business_then_name": "Acme Dental"},
+            {"id": 2, "name": "PC-2", "customer": {"business_name": "Globex"}},
+        ],
+        "meta": {"total_pages": 1},
+    }
+
+    def _compare(self, decoder):
+        from api.client import SyncroClient
+        from const import HUNTRESS_ORGANIZATIONS_URL, SYNCRO_BASE_URL_TEMPLATE
+        from services.comparison import ComparisonService
+
+        url = SYNCRO_BASE_URL_TEMPLATE.format(subdomain="acme") + "customer_assets"
+        with responses.RequestsMock() as mock:
+            mock.add(responses.GET, url, json=self.ASSETS)
+            mock.add(responses.GET, HUNTRESS_API_URL, json=PAGE)
+            mock.add(
+                responses.GET, HUNTRESS_ORGANIZATIONS_URL, json={"organizations": []}
+            )
+            syncro = SyncroClient("key", "acme")
+            huntress = HuntressClient("key", "secret")
+            syncro.decoder = huntress.decoder = decoder
+            result = ComparisonService(syncro, huntress).fetch_and_compare()
+        return result
+
+    def test_pool_and_in_thread_give_identical_rows(self):
+        in_thread = self._compare(None)
+        with ProcessPoolDecoder(max_workers=1) as decoder:
+            pooled = self._compare(decoder)
+
+        assert list(pooled.rows) == list(in_thread.rows)
+        orgs = {r.syncro_name: r.organization for r in pooled.rows}
+        assert orgs["PC-1"] == "Acme Dental"
+        # Only the pool projects; in-thread records stay whole.
+        assert "os" not in pooled.huntress_agents[0]
+        assert in_thread.huntress_agents[0]["os"] == "Windows"
+
+    def test_in_thread_dumps_keep_every_field(self, tmp_path):
+        from utils.dumps import DumpWriter, read_dump
+
+        result = self._compare(None)
+        with DumpWriter(str(tmp_path)) as writer:
+            paths = writer.submit({"huntress": result.huntress_agents}).result()
+
+        assert list(read_dump(paths[0])) == PAGE["agents"]
@@ -0,0 +1,66 @@
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import ComparisonRow
+from services.diff import (
+    CHANGE_APPEARED,
+    CHANGE_CHANGED,
+    CHANGE_DISAPPEARED,
+    diff_rows,
+)
+
+
+def _old():
+    return [
+        ComparisonRow("PC-1", "PC-1", STATUS_OK, "Acme"),
+        ComparisonRow("PC-2", "PC-2", STATUS_OK, "Acme"),
+        ComparisonRow("OLD-PC", "", STATUS_MISSING_HUNTRESS, "Acme"),
+        ComparisonRow("PC-3", "PC-3", STATUS_OK, "Acme"),
+    ]
+
+
+def _new():
+    return [
+        ComparisonRow("PC-1", "PC-1", STATUS_OK, "Acme"),
+        ComparisonRow("PC-2", "", STATUS_MISSING_HUNTRESS, "Acme"),
+        ComparisonRow("", "NEW-PC", STATUS_MISSING_SYNCRO, "Globex"),
+        ComparisonRow("PC-3", "PC-3", STATUS_OK, "Globex"),
+    ]
+
+
+class TestDiffRows:
+    def test_reports_each_kind_of_change(self):
+        report = diff_rows(_old(), _new())
+        by_key = {c.key: c for c in report.changes}
+
+        assert set(by_key) == {"pc-2", "new-pc", "old-pc", "pc-3"}
+        assert by_key["pc-2"].kind == CHANGE_CHANGED
+        assert by_key["pc-2"].fields == ("status",)
+        assert by_key["pc-3"].fields == ("organization",)
+        assert by_key["new-pc"].kind == CHANGE_APPEARED
+        assert by_key["old-pc"].kind == CHANGE_DISAPPEARED
+        assert report.counts() == {
+            CHANGE_APPEARED: 1,
+            CHANGE_DISAPPEARED: 1,
+            CHANGE_CHANGED: 2,
+        }
+
+    def test_identical_results_have_no_changes(self):
+        assert diff_rows(_old(), _old()).changes == []
+
+    def test_accepts_columnar_rows(self):
+        report = diff_rows(ColumnarRows.from_rows(_old()), _new())
+        assert report.counts()[CHANGE_CHANGED] == 2
+
+    def test_duplicate_keys_pair_by_organization(self):
+        old = [
+            ComparisonRow("DESKTOP-01", "DESKTOP-01", STATUS_OK, "Acme"),
+            ComparisonRow("DESKTOP-01", "", STATUS_MISSING_HUNTRESS, "Globex"),
+        ]
+        new = [
+            ComparisonRow("DESKTOP-01", "DESKTOP-01", STATUS_OK, "Globex"),
+            ComparisonRow("DESKTOP-01", "DESKTOP-01", STATUS_OK, "Acme"),
+        ]
+        report = diff_rows(old, new)
+        assert len(report.changes) == 1
+        assert report.changes[0].before[0] == "Globex"
+        assert report.changes[0].fields == ("status",)
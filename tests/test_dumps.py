@@ -0,0 +1,131 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from utils.dumps import (
+    DumpWriter,
+    iter_json_array,
+    latest_dump,
+    read_dump,
+    rotate_dumps,
+    write_dump,
+)
+
+
+def _touch(directory, name, size=10):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+class TestWriteDump:
+    def test_compact_json_lines(self, tmp_path):
+        path = str(tmp_path / "dump.jsonl.gz")
+        assert write_dump(path, [{"id": 1, "name": "PC-1"}, {"id": 2}]) == 2
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert lines[0] == '{"id":1,"name":"PC-1"}'
+        assert json.loads(lines[1]) == {"id": 2}
+
+    def test_failed_dump_leaves_no_file(self, tmp_path):
+        def records():
+            yield {"id": 1}
+            raise RuntimeError("boom")
+
+        path = str(tmp_path / "dump.jsonl.gz")
+        with pytest.raises(RuntimeError):
+            write_dump(path, records())
+        assert os.listdir(tmp_path) == []
+
+
+class TestReadDump:
+    def test_round_trips_json_lines(self, tmp_path):
+        path = str(tmp_path / "dump.jsonl.gz")
+        write_dump(path, [{"id": 1}, {"id": 2, "name": "PC-2"}])
+        assert list(read_dump(path)) == [{"id": 1}, {"id": 2, "name": "PC-2"}]
+
+    def test_json_array_split_at_every_position(self):
+        records = [{"id": 1, "name": "a, ]"}, 12345, [1, {"x": None}], "s", True]
+        text = json.dumps(records, indent=4)
+        for size in (1, 2, 3, 7, len(text)):
+            chunks = [text[i : i + size] for i in range(0, len(text), size)]
+            assert list(iter_json_array(chunks)) == records
+
+    def test_truncated_array_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(['[{"id": 1}, {"id"']))
+
+    def test_legacy_array_files(self, tmp_path):
+        (tmp_path / "agentDumpSyncro.json").write_text(json.dumps([{"id": 1}]))
+        (tmp_path / "agentDumpHuntress.json").write_text("[]")
+        paths = latest_dump(str(tmp_path))
+        assert sorted(paths) == ["huntress", "syncro"]
+        assert list(read_dump(paths["syncro"])) == [{"id": 1}]
+
+    def test_latest_run_wins_over_legacy_files(self, tmp_path):
+        (tmp_path / "agentDumpSyncro.json").write_text("[]")
+        _touch(tmp_path, "20260101T000000-syncro.jsonl.gz")
+        _touch(tmp_path, "20260102T000000-2-syncro.jsonl.gz")
+        assert latest_dump(str(tmp_path)) == {
+            "syncro": str(tmp_path / "20260102T000000-2-syncro.jsonl.gz")
+        }
+
+
+class TestRotateDumps:
+    def test_keeps_newest_runs_by_count(self, tmp_path):
+        for stamp in ("20260101T000000", "20260102T000000", "20260103T000000"):
+            _touch(tmp_path, f"{stamp}-syncro.jsonl.gz")
+            _touch(tmp_path, f"{stamp}-huntress.jsonl.gz")
+        _touch(tmp_path, "notes.txt")
+
+        removed = rotate_dumps(str(tmp_path), keep=2)
+
+        assert len(removed) == 2
+        assert sorted(os.listdir(tmp_path)) == [
+            "20260102T000000-huntress.jsonl.gz",
+            "20260102T000000-syncro.jsonl.gz",
+            "20260103T000000-huntress.jsonl.gz",
+            "20260103T000000-syncro.jsonl.gz",
+            "notes.txt",
+        ]
+
+    def test_size_cap_drops_oldest_but_never_the_newest(self, tmp_path):
+        _touch(tmp_path, "20260101T000000-syncro.jsonl.gz", 40)
+        _touch(tmp_path, "20260102T000000-syncro.jsonl.gz", 40)
+        _touch(tmp_path, "20260103T000000-syncro.jsonl.gz", 100)
+
+        rotate_dumps(str(tmp_path), keep=10, max_bytes=50)
+
+        assert os.listdir(tmp_path) == ["20260103T000000-syncro.jsonl.gz"]
+
+
+class TestDumpWriter:
+    def test_writes_runs_in_the_background(self, tmp_path):
+        directory = tmp_path / "debug"
+        with DumpWriter(str(directory), keep=1) as writer:
+            first = writer.submit({"syncro": [{"id": 1}], "huntress": []})
+            second = writer.submit({"syncro": [{"id": 2}], "huntress": [{"id": 3}]})
+        assert len(first.result()) == 2
+        paths = second.result()
+
+        # The second run got its own (numbered) stamp and rotated the first out.
+        assert sorted(os.listdir(directory)) == sorted(map(os.path.basename, paths))
+        with gzip.open(paths[1], "rt", encoding="utf-8") as f:
+            assert json.loads(f.readline()) == {"id": 3}
+
+    def test_from_settings(self, tmp_path):
+        writer = DumpWriter.from_settings(
+            {"DebugDumpKeep": 3, "DebugDumpMaxMB": 0}, str(tmp_path)
+        )
+        writer.close()
+        assert writer.keep == 3 and writer.max_bytes is None
+
+    def test_rotate_false_leaves_older_runs(self, tmp_path):
+        _touch(tmp_path, "20260101T000000-syncro.jsonl.gz")
+        with DumpWriter(str(tmp_path), keep=1, rotate=False) as writer:
+            paths = writer.submit({"syncro": [{"id": 1}]}).result()
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            ["20260101T000000-syncro.jsonl.gz", os.path.basename(paths[0])]
+        )
@@ -0,0 +1,87 @@
+import pytest
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import FLAG_STALE_SYNCRO, ComparisonRow
+from services.filters import (
+    FilterError,
+    compile_filter,
+    iter_records,
+    search_filter,
+)
+
+
+@pytest.fixture
+def rows():
+    stale = ComparisonRow("SRV-DB", "", STATUS_MISSING_HUNTRESS, "Dental Care")
+    stale.flags = FLAG_STALE_SYNCRO
+    return [
+        ComparisonRow("PC-1", "pc-1", STATUS_OK, "Dental Care"),
+        stale,
+        ComparisonRow("", "SRV-WEB", STATUS_MISSING_SYNCRO, "Acme"),
+        ComparisonRow("SRV-APP", "", STATUS_MISSING_HUNTRESS, "Acme"),
+    ]
+
+
+def _names(rows):
+    return [r.syncro_name or r.huntress_name for r in rows]
+
+
+class TestCompileFilter:
+    def test_request_example(self, rows):
+        where = compile_filter('status != "OK!" and org ~ "dental" and syncro ~ "^srv"')
+        assert _names(where.apply(rows)) == ["SRV-DB"]
+
+    def test_precedence_parentheses_and_not(self, rows):
+        assert _names(
+            compile_filter("org == acme or stale and not matched").apply(rows)
+        ) == [
+            "SRV-DB",
+            "SRV-WEB",
+            "SRV-APP",
+        ]
+        assert _names(
+            compile_filter("(org == acme or stale) and huntress == ''").apply(rows)
+        ) == [
+            "SRV-DB",
+            "SRV-APP",
+        ]
+
+    def test_host_matches_either_name_and_regex_is_case_insensitive(self, rows):
+        assert _names(compile_filter("host ~ '^srv-(web|app)$'").apply(rows)) == [
+            "SRV-WEB",
+            "SRV-APP",
+        ]
+        assert _names(compile_filter(r'syncro ~ "\d$"').apply(rows)) == ["PC-1"]
+
+    def test_flags_notes_and_ignored(self, rows):
+        assert _names(compile_filter("notes ~ stale").apply(rows)) == ["SRV-DB"]
+        assert _names(compile_filter("ignored").apply(rows, {"srv-app"})) == ["SRV-APP"]
+
+    def test_cheap_predicates_run_first(self):
+        where = compile_filter('syncro ~ "^srv" and ignored and org == acme')
+        assert where.code.startswith("(r[6]) and (r[0].casefold()")
+
+    def test_columnar_rows_stay_columnar(self, rows):
+        store = ColumnarRows.from_rows(rows)
+        matched = compile_filter("status == 'missing in syncro'").apply(store)
+        assert isinstance(matched, ColumnarRows)
+        assert _names(matched) == ["SRV-WEB"]
+        assert list(iter_records(store)) == list(iter_records(rows))
+
+    @pytest.mark.parametrize(
+        "expression",
+        ["", "org", "org ==", "bogus == 1", "org ~ '('", "(org == a", "org == a b"],
+    )
+    def test_errors(self, expression):
+        with pytest.raises(FilterError):
+            compile_filter(expression)
+
+
+class TestSearchFilter:
+    def test_plain_text_is_not_an_expression(self):
+        assert search_filter("dental") is None
+        assert search_filter("org ==") is None
+
+    def test_expression(self):
+        assert search_filter("org ~ dental") is not None
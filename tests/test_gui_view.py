@@ -1,4 +1,8 @@
-"""Tests for the comparison view: proxy filters, stat cards, settings dialog."""
+"""Tests for the comparison view: proxy filters, stat cards, settings and debug
+dialogs."""
+
+import os
+import time
 
 import pytest
 
@@ -54,6 +58,41 @@ class TestProxyFilter:
         proxy.set_status_filter(set())
         assert proxy.rowCount() == 4
 
+    def test_flagged_filter_and_notes_column(self, qapp, rows):
+        from gui.models.comparison_model import COL_NOTES
+        from services.comparison import FLAG_DUPLICATE_HUNTRESS
+
+        rows[2].flags = FLAG_DUPLICATE_HUNTRESS
+        model, proxy = self._model(rows)
+        assert model.index(2, COL_NOTES).data() == "Duplicate in Huntress"
+        assert model.flagged_count() == 1
+        proxy.set_only_flagged(True)
+        assert proxy.rowCount() == 1
+
+    def test_column_sort_uses_precomputed_ranks(self, qapp, rows):
+        from PySide6.QtCore import Qt
+
+        from gui.models.comparison_model import COL_ORG, COL_STATUS
+
+        _, proxy = self._model(rows)
+        proxy.sort(COL_ORG, Qt.AscendingOrder)
+        orgs = [proxy.index(i, COL_ORG).data() for i in range(proxy.rowCount())]
+        assert orgs == ["Acme", "Acme", "Brightwell", "Cascade"]
+        proxy.sort(COL_STATUS, Qt.AscendingOrder)
+        assert proxy.index(0, COL_STATUS).data() == STATUS_MISSING_HUNTRESS
+
+    def test_search_box_accepts_filter_expressions(self, qapp, rows):
+        _, proxy = self._model(rows)
+        proxy.set_search_text('status != "OK!" and org ~ "^ac"')
+        assert proxy.rowCount() == 1
+        proxy.set_search_text("host ~ ok$")
+        assert proxy.rowCount() == 2
+        # Plain text (or an expression that does not parse) is a substring search.
+        proxy.set_search_text("web")
+        assert proxy.rowCount() == 1
+        proxy.set_search_text("org ==")
+        assert proxy.rowCount() == 0
+
     def test_ignored_only_mode(self, qapp, rows):
         model, proxy = self._model(rows)
         model.set_ignored({"bw-rec"})
@@ -118,6 +157,22 @@ class TestComparisonWidget:
         assert widget._only_ignored is False
         assert widget._selected == set(DEFAULT_SELECTION)
 
+    def test_ignore_updates_cards_incrementally(self, qapp, isolated_settings, rows):
+        widget = self._widget(isolated_settings)
+        widget._on_result(rows)
+        widget._toggle_ignore("bw-rec", True)
+        assert widget._cards["missing_huntress"]._value.text() == "0"
+        assert widget.ignored_btn.text() == "1 ignored"
+        widget._toggle_ignore("bw-rec", False)
+        assert widget._cards["missing_huntress"]._value.text() == "1"
+
+    def test_excluding_org_updates_cards(self, qapp, isolated_settings, rows):
+        widget = self._widget(isolated_settings)
+        widget._on_result(rows)
+        widget._exclude_org("Acme")
+        assert widget._cards["total"]._value.text() == "2"
+        assert widget.org_btn.text() == "2 of 3 orgs"
+
     def test_stat_card_counts(self, qapp, isolated_settings, rows):
         widget = self._widget(isolated_settings)
         widget._on_result(rows)
@@ -153,3 +208,57 @@ class TestSettingsView:
         assert saved["value"] is True
         assert isolated_settings.get("SyncroSubDomain") == "acme"
         assert isolated_settings.validate()[0] is True
+
+
+class TestDebugDialog:
+    RAW = {"syncro": [{"id": 1}], "huntress": [{"id": 2}]}
+
+    @pytest.fixture
+    def dialog(self, qapp, tmp_path, monkeypatch):
+        import shiboken6
+
+        from gui.widgets import debug_dialog
+
+        monkeypatch.setattr(
+            debug_dialog.QFileDialog,
+            "getExistingDirectory",
+            lambda *args: str(tmp_path),
+        )
+        shown = []
+        monkeypatch.setattr(
+            debug_dialog.QMessageBox, "information", lambda *args: shown.append(args)
+        )
+        dialog = debug_dialog.DebugDialog(
+            self.RAW, settings={"DebugDumpKeep": 1, "DebugDumpMaxMB": 0}
+        )
+        dialog.shown = shown
+        yield dialog
+        # Delete it here, on the GUI thread: left to the cyclic GC it could
+        # be collected (and its widgets destroyed) on any thread.
+        shiboken6.delete(dialog)
+
+    def _wait_for_dump(self, qapp, directory, files):
+        deadline = time.monotonic() + 5
+        while len(os.listdir(directory)) < files and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for _ in range(5):
+            qapp.processEvents()
+            time.sleep(0.01)
+
+    def test_save_keeps_older_runs_in_chosen_folder(self, qapp, tmp_path, dialog):
+        (tmp_path / "20260101T000000-syncro.jsonl.gz").write_bytes(b"x")
+        dialog._save_data()
+        self._wait_for_dump(qapp, tmp_path, 4)
+
+        assert len(dialog.shown) == 1
+        assert dialog.save_btn.isEnabled()
+        # DebugDumpKeep is 1, but a folder the user picked is never rotated.
+        assert "20260101T000000-syncro.jsonl.gz" in os.listdir(tmp_path)
+
+    def test_dump_finishing_after_close_is_ignored(self, qapp, tmp_path, dialog):
+        dialog._save_data()
+        dialog.reject()
+        self._wait_for_dump(qapp, tmp_path, 3)
+
+        assert len(os.listdir(tmp_path)) == 3
+        assert dialog.shown == []
@@ -47,6 +47,20 @@ class TestGetAgents:
         assert "page=2" in request_url
         assert "limit=100" in request_url
 
+    @responses.activate
+    def test_organization_filter(self, huntress_client):
+        """organization_id is passed through as a server-side filter."""
+        responses.add(
+            responses.GET,
+            HUNTRESS_API_URL,
+            json={"agents": [], "pagination": {"total_count": 0}},
+            status=200,
+        )
+
+        huntress_client.get_all_agents(organization_id=7)
+
+        assert all("organization_id=7" in c.request.url for c in responses.calls)
+
     @responses.activate
     def test_auth_headers(self, huntress_client):
         """Test that Basic Auth header is present."""
@@ -62,6 +76,28 @@ class TestGetAgents:
         assert "Authorization" in responses.calls[0].request.headers
         assert responses.calls[0].request.headers["Authorization"].startswith("Basic ")
 
+    @responses.activate
+    def test_hashes_each_page(self, huntress_client):
+        """Fetched pages are hashed; identical bodies give identical hashes."""
+        responses.add(responses.GET, HUNTRESS_API_URL, json={"agents": []})
+
+        huntress_client.get_agents(page=1)
+        first = huntress_client.content_hash()
+        huntress_client.get_agents(page=1)
+
+        assert list(huntress_client.page_hashes) == [("agents", None, 1)]
+        assert first and huntress_client.content_hash() == first
+
+    def test_content_hash_ignores_completion_order(self, huntress_client):
+        huntress_client.record_page(("agents", None, 2), b"two")
+        huntress_client.record_page(("agents", None, 1), b"one")
+        reordered = HuntressClient("k", "s")
+        reordered.record_page(("agents", None, 1), b"one")
+        reordered.record_page(("agents", None, 2), b"two")
+
+        assert huntress_client.content_hash() == reordered.content_hash()
+        assert HuntressClient("k", "s").content_hash() == ""
+
 
 class TestGetAllAgents:
     @responses.activate
@@ -0,0 +1,99 @@
+from datetime import date
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import ComparisonRow
+from services.ignore_rules import IgnoreRules
+
+
+class TestIgnoreRules:
+    def test_exact_keys(self):
+        rules = IgnoreRules(["old-pc"])
+        assert "old-pc" in rules
+        assert "old-pc2" not in rules
+
+    def test_prefix_suffix_and_glob(self):
+        rules = IgnoreRules(patterns=["kiosk-*", "*-test", "lab?-pc"])
+        assert "kiosk-01" in rules
+        assert "web-test" in rules
+        assert "lab1-pc" in rules
+        assert "lab12-pc" not in rules
+        assert "desk-01" not in rules
+
+    def test_patterns_are_case_insensitive(self):
+        rules = IgnoreRules(patterns=["KIOSK-*"])
+        assert "kiosk-01" in rules
+
+    def test_counts_hits_per_rule(self):
+        rules = IgnoreRules(["old-pc"], ["kiosk-*"])
+        rules.flags(["kiosk-1", "kiosk-2", "old-pc", "pc-1"])
+        assert rules.hit_counts() == {"old-pc": 1, "kiosk-*": 2}
+        # Membership tests (GUI re-checks, re-filters) are not hits.
+        assert "kiosk-3" in rules and "old-pc" in rules
+        assert rules.hit_counts() == {"old-pc": 1, "kiosk-*": 2}
+        rules.reset_hits()
+        assert rules.hit_counts() == {"old-pc": 0, "kiosk-*": 0}
+
+    def test_expired_rules_never_match(self):
+        rules = IgnoreRules(
+            patterns=[
+                {"pattern": "kiosk-*", "expires": "2024-01-01"},
+                {"pattern": "lab-*", "expires": "2030-01-01"},
+            ],
+            today=date(2025, 6, 1),
+        )
+        assert "kiosk-1" not in rules
+        assert "lab-1" in rules
+        assert [r.pattern for r in rules.rules] == ["kiosk-*", "lab-*"]
+
+    def test_malformed_expiry_skips_the_rule(self, caplog):
+        rules = IgnoreRules.from_settings(
+            {
+                "IgnorePatterns": [
+                    {"pattern": "kiosk-*", "expires": "next tuesday"},
+                    {"pattern": "lab-*", "expires": 20300101},
+                    "*-test",
+                ]
+            }
+        )
+
+        assert [r.pattern for r in rules.rules] == ["*-test"]
+        assert "kiosk-1" not in rules and "web-test" in rules
+        assert "'kiosk-*'" in caplog.text and "'next tuesday'" in caplog.text
+
+    def test_empty_rules_are_falsy(self):
+        assert not IgnoreRules()
+        assert IgnoreRules(patterns=["*-test"])
+
+    def test_from_settings(self):
+        rules = IgnoreRules.from_settings(
+            {"IgnoredAssets": ["old-pc"], "IgnorePatterns": ["*-test"]}
+        )
+        assert "old-pc" in rules and "web-test" in rules
+
+    def test_flags_bitmap(self):
+        rules = IgnoreRules(patterns=["kiosk-*"])
+        assert rules.flags(["kiosk-1", "pc-1"]) == bytearray([1, 0])
+
+
+class TestIgnoredBitmap:
+    def test_mark_ignored_and_take(self):
+        store = ColumnarRows.from_rows(
+            [
+                ComparisonRow("KIOSK-1", "KIOSK-1", STATUS_OK, "Acme"),
+                ComparisonRow("PC-1", "", STATUS_MISSING_HUNTRESS, "Acme"),
+            ]
+        )
+        assert store.mark_ignored(IgnoreRules(patterns=["kiosk-*"])) == 1
+        assert store.is_ignored(0) and not store.is_ignored(1)
+        assert store.take([1, 0]).ignored == bytearray([0, 1])
+        counts, ignored = store.status_counts()
+        assert ignored == 1
+        assert counts[STATUS_MISSING_HUNTRESS] == 1
+
+    def test_append_invalidates_bitmap(self):
+        store = ColumnarRows()
+        store.append("PC-1", "PC-1", STATUS_OK)
+        store.mark_ignored({"pc-1"})
+        store.append("PC-2", "", STATUS_MISSING_HUNTRESS)
+        assert store.ignored is None
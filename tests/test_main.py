@@ -1,8 +1,12 @@
+import os
 import sys
 from unittest.mock import Mock, patch
 
-from main import _apply_filters, main
+import pytest
+
+from main import _apply_filters, _emit_result, main
 from services.comparison import ComparisonRow
+from services.filters import compile_filter
 
 
 class TestMain:
@@ -34,6 +38,7 @@ class TestMain:
         mock_result.huntress_count = 1
         mock_result.syncro_assets = []
         mock_result.huntress_agents = []
+        mock_result.ordered.return_value = mock_result.rows
 
         mock_service_cls.return_value.fetch_and_compare.return_value = mock_result
 
@@ -51,19 +56,312 @@ class TestMain:
         """Test that help is shown when no arguments provided."""
         mock_parser = Mock()
         mock_parser_func.return_value = mock_parser
-        mock_parser.parse_args.return_value = Mock(compare=False)
+        mock_parser.parse_args.return_value = Mock(
+            compare=False,
+            list_snapshots=False,
+            open_snapshot=None,
+            diff=None,
+            from_dump=None,
+        )
 
         main()
 
         mock_parser.print_help.assert_called_once()
 
 
+class TestSnapshots:
+    @patch("main.console")
+    def test_open_snapshot_without_credentials(self, mock_console, tmp_path):
+        from services.comparison import ComparisonResult
+        from services.snapshots import SnapshotStore
+
+        db = str(tmp_path / "snap.db")
+        with SnapshotStore(db) as store:
+            store.save(
+                ComparisonResult([], [], [ComparisonRow("A", "A", "OK!", "Acme")], 1, 1)
+            )
+
+        test_args = ["main.py", "--open-snapshot", "latest", "--snapshot-db", db]
+        with (
+            patch.object(sys, "argv", test_args),
+            patch("main.load_settings", return_value={}) as mock_load,
+            patch("main.print_colored_table") as mock_print,
+        ):
+            main()
+
+        mock_load.assert_called_once_with(require_credentials=False)
+        rows = mock_print.call_args[0][0]
+        assert [r.organization for r in rows] == ["Acme"]
+
+
+class TestFromDump:
+    @patch("main.console")
+    def test_compares_dumps_without_credentials(self, mock_console, tmp_path):
+        from utils.dumps import write_dump
+
+        write_dump(
+            str(tmp_path / "20260101T000000-syncro.jsonl.gz"),
+            [{"id": 1, "name": "PC-1", "customer": {"business_name": "Acme"}}],
+        )
+        write_dump(str(tmp_path / "20260101T000000-huntress.jsonl.gz"), [])
+
+        test_args = ["main.py", "--from-dump", str(tmp_path)]
+        with (
+            patch.object(sys, "argv", test_args),
+            patch("main.load_settings", return_value={}) as mock_load,
+            patch("main.SyncroClient") as mock_syncro,
+            patch("main.print_colored_table") as mock_print,
+        ):
+            main()
+
+        mock_load.assert_called_once_with(require_credentials=False)
+        mock_syncro.assert_not_called()
+        rows = mock_print.call_args[0][0]
+        assert [(r.organization, r.syncro_name) for r in rows] == [("Acme", "PC-1")]
+
+    @patch("main.console")
+    def test_org_uses_the_mapping_without_scoped_matching(self, mock_console, tmp_path):
+        from services.org_mapping import OrgMapping
+        from utils.dumps import write_dump
+
+        write_dump(
+            str(tmp_path / "20260101T000000-syncro.jsonl.gz"),
+            [
+                {
+                    "id": 1,
+                    "name": "PC-1",
+                    "customer_id": 10,
+                    "customer": {"business_name": "Acme Inc"},
+                }
+            ],
+        )
+        write_dump(
+            str(tmp_path / "20260101T000000-huntress.jsonl.gz"),
+            [{"id": 7, "hostname": "PC-9", "organization_id": 100}],
+        )
+        write_dump(
+            str(tmp_path / "20260101T000000-organizations.jsonl.gz"),
+            [{"id": 100, "name": "ACME Corporation"}],
+        )
+        mapping = str(tmp_path / "org_mapping.json")
+        OrgMapping({"Acme Inc": "ACME Corporation"}).save(mapping)
+
+        test_args = ["main.py", "--from-dump", str(tmp_path), "--org", "Acme Inc"]
+        test_args += ["--org-mapping", mapping]
+        with (
+            patch.object(sys, "argv", test_args),
+            patch("main.load_settings", return_value={}),
+            patch("main.print_colored_table") as mock_print,
+        ):
+            main()
+
+        rows = mock_print.call_args[0][0]
+        assert sorted((r.syncro_name, r.huntress_name) for r in rows) == [
+            ("", "PC-9"),
+            ("PC-1", ""),
+        ]
+        assert {r.organization for r in rows} == {"Acme Inc"}
+
+
+class TestSources:
+    @pytest.mark.parametrize(
+        "extra, message",
+        [
+            (["--where", "matched"], "--where"),
+            (["--sort", "org"], "--sort org"),
+            (["--stale"], "--stale"),
+            (["--format", "html"], "--format html"),
+            (["-o", "-"], "--output -"),
+            (["--split-by-org", "out"], "--split-by-org"),
+            (["--sqlite", "runs.db"], "--sqlite"),
+            (["--snapshot"], "--snapshot"),
+            (["--limit", "5"], "--limit"),
+            (["--pager"], "--pager"),
+            (["--org-scoped"], "--org-scoped"),
+        ],
+    )
+    def test_rejects_row_options_it_cannot_honor(self, capsys, extra, message):
+        test_args = ["main.py", "--compare", "--source", "AD=ad.csv"] + extra
+        with patch.object(sys, "argv", test_args), patch("main.load_settings"):
+            with pytest.raises(SystemExit) as exc:
+                main()
+
+        assert exc.value.code == 2
+        assert f"{message} cannot be used with --source" in capsys.readouterr().err
+
+    @patch("main.print_presence_table")
+    def test_org_filters_presence_rows(self, mock_table, tmp_path):
+        from utils.dumps import write_dump
+
+        write_dump(
+            str(tmp_path / "20260101T000000-syncro.jsonl.gz"),
+            [
+                {"id": 1, "name": "PC-1", "customer": {"business_name": "Acme"}},
+                {"id": 2, "name": "PC-2", "customer": {"business_name": "Globex"}},
+            ],
+        )
+        write_dump(str(tmp_path / "20260101T000000-huntress.jsonl.gz"), [])
+        inventory = tmp_path / "ad.csv"
+        inventory.write_text("Hostname\nPC-1\n", encoding="utf-8")
+
+        test_args = ["main.py", "--from-dump", str(tmp_path), "--org", "Acme"]
+        test_args += ["--source", f"AD={inventory}"]
+        with (
+            patch.object(sys, "argv", test_args),
+            patch("main.load_settings", return_value={}),
+            patch("main.console"),
+        ):
+            main()
+
+        rows = mock_table.call_args[0][1]
+        assert [row.key for row in rows] == ["pc-1"]
+
+
+class TestEmitResult:
+    def test_split_by_org_with_rows_on_stdout(self, tmp_path, capsysbinary):
+        from services.comparison import ComparisonResult
+
+        rows = [
+            ComparisonRow("PC-1", "PC-1", "OK!", "Acme"),
+            ComparisonRow("PC-2", "", "Missing in Huntress", "Globex"),
+        ]
+        result = ComparisonResult([], [], rows, 2, 1)
+        args = Mock(
+            by_org=False,
+            sqlite=None,
+            sort=None,
+            org=[],
+            exclude_org=[],
+            where=None,
+            duplicates=False,
+            stale=False,
+            show_ignored=False,
+            output="-",
+            format="csv",
+            compress=None,
+            split_by_org=str(tmp_path / "orgs"),
+        )
+
+        _emit_result(result, args, {})
+
+        captured = capsysbinary.readouterr()
+        assert b"PC-2" in captured.out
+        assert b"organization files" not in captured.out
+        assert sorted(os.listdir(tmp_path / "orgs")) == [
+            "Acme.csv",
+            "Globex.csv",
+            "index.csv",
+        ]
+
+
+class TestByOrg:
+    @patch("main.print_org_summary")
+    @patch("main.print_colored_table")
+    def test_by_org_prints_only_aggregates(self, mock_table, mock_summary):
+        from services.comparison import ComparisonResult
+
+        result = ComparisonResult(
+            [], [], [ComparisonRow("A", "", "Missing in Huntress", "Acme")], 1, 0
+        )
+        args = Mock(
+            by_org=True,
+            org=[],
+            exclude_org=["Globex"],
+            no_color=True,
+            sqlite=None,
+            where=None,
+            duplicates=False,
+            stale=False,
+        )
+
+        _emit_result(result, args, {"ExcludedOrganizations": ["Initech"]})
+
+        mock_table.assert_not_called()
+        aggregates = mock_summary.call_args[0][0]
+        assert aggregates.by_org["Acme"].missing_huntress == 1
+        assert aggregates.excluded == {"Globex", "Initech"}
+
+    @patch("main.print_org_summary")
+    def test_by_org_counts_only_filtered_rows(self, mock_summary):
+        from services.comparison import ComparisonResult
+
+        rows = [
+            ComparisonRow("A", "", "Missing in Huntress", "Acme"),
+            ComparisonRow("B", "B", "OK!", "Acme"),
+            ComparisonRow("C", "", "Missing in Huntress", "Globex"),
+        ]
+        result = ComparisonResult([], [], rows, 3, 1)
+        args = Mock(
+            by_org=True,
+            org=[],
+            exclude_org=[],
+            no_color=True,
+            sqlite=None,
+            where=compile_filter("not matched"),
+            duplicates=False,
+            stale=False,
+            show_ignored=False,
+        )
+
+        _emit_result(result, args, {"IgnorePatterns": ["c"]})
+
+        by_org = mock_summary.call_args[0][0].by_org
+        assert (by_org["Acme"].ok, by_org["Acme"].missing_huntress) == (0, 1)
+        assert by_org["Globex"].ignored == 1
+
+
+class TestDiff:
+    @patch("main.print_diff_table")
+    def test_diff_two_csv_exports(self, mock_print, tmp_path):
+        from utils.output import write_csv
+
+        old = tmp_path / "old.csv"
+        new = tmp_path / "new.csv"
+        write_csv(str(old), [ComparisonRow("PC-1", "PC-1", "OK!", "Acme")])
+        write_csv(str(new), [ComparisonRow("PC-1", "", "Missing in Huntress", "Acme")])
+
+        with patch.object(sys, "argv", ["main.py", "--diff", str(old), str(new)]):
+            main()
+
+        report = mock_print.call_args[0][0]
+        assert [c.label for c in report.changes] == ["status"]
+
+    @patch("main.console")
+    def test_bad_csv_reports_an_error(self, mock_console, tmp_path):
+        from utils.output import write_csv
+
+        old = tmp_path / "old.csv.gz"
+        new = tmp_path / "new.csv"
+        write_csv(str(old), [ComparisonRow("PC-1", "PC-1", "OK!", "Acme")])
+        new.write_text(
+            "Organization,Syncro Asset,Huntress Asset,Status\nAcme,PC-1,,Gone\n"
+        )
+
+        with patch.object(sys, "argv", ["main.py", "--diff", str(old), str(new)]):
+            with pytest.raises(SystemExit):
+                main()
+
+        message = mock_console.print.call_args[0][0]
+        assert "line 2: unknown status 'Gone'" in message
+
+
 class TestApplyFilters:
-    def _args(self, org=None, exclude_org=None, show_ignored=False):
+    def _args(
+        self,
+        org=None,
+        exclude_org=None,
+        show_ignored=False,
+        duplicates=False,
+        stale=False,
+        where=None,
+    ):
         return Mock(
             org=org or [],
             exclude_org=exclude_org or [],
             show_ignored=show_ignored,
+            duplicates=duplicates,
+            stale=stale,
+            where=compile_filter(where) if where else None,
         )
 
     def _rows(self):
@@ -90,7 +388,63 @@ class TestApplyFilters:
         settings = {"IgnoredAssets": ["old-pc"]}
         rows, ignored = _apply_filters(self._rows(), self._args(), settings)
         assert all(r.syncro_name != "OLD-PC" for r in rows)
-        assert ignored == {"old-pc"}
+        assert "old-pc" in ignored
+        assert "pc-1" not in ignored
+
+    def test_ignore_patterns_hide_rows(self):
+        settings = {"IgnorePatterns": ["old-*"]}
+        rows, _ = _apply_filters(self._rows(), self._args(), settings)
+        assert all(r.syncro_name != "OLD-PC" for r in rows)
+
+    def test_columnar_bitmap_reused(self):
+        from services.columnar import ColumnarRows
+
+        store = ColumnarRows.from_rows(self._rows())
+        store.ignored = bytearray(len(store))  # precomputed: nothing ignored
+        rows, _ = _apply_filters(store, self._args(), {"IgnoredAssets": ["old-pc"]})
+        assert any(r.syncro_name == "OLD-PC" for r in rows)
+
+    def test_columnar_rows_stay_columnar(self):
+        from services.columnar import ColumnarRows
+
+        store = ColumnarRows.from_rows(self._rows())
+        rows, _ = _apply_filters(
+            store, self._args(org=["Acme"]), {"IgnoredAssets": ["old-pc"]}
+        )
+        assert isinstance(rows, ColumnarRows)
+        assert [r.syncro_name for r in rows] == ["PC-1"]
+
+    def test_duplicates_and_stale_filters(self):
+        from services.comparison import FLAG_DUPLICATE_HUNTRESS, FLAG_STALE_SYNCRO
+
+        rows = self._rows()
+        rows[0].flags = FLAG_DUPLICATE_HUNTRESS
+        rows[1].flags = FLAG_STALE_SYNCRO
+
+        dupes, _ = _apply_filters(rows, self._args(duplicates=True), {})
+        assert [r.syncro_name for r in dupes] == ["PC-1"]
+        stale, _ = _apply_filters(rows, self._args(stale=True), {})
+        assert [r.syncro_name for r in stale] == ["PC-2"]
+        either, _ = _apply_filters(rows, self._args(duplicates=True, stale=True), {})
+        assert len(either) == 2
+
+    def test_where_expression(self):
+        rows, _ = _apply_filters(
+            self._rows(), self._args(where='status != "OK!" or syncro ~ "^old"'), {}
+        )
+        assert [r.syncro_name for r in rows] == ["PC-2", "OLD-PC"]
+
+    def test_where_runs_with_the_ignore_check(self):
+        from services.columnar import ColumnarRows
+
+        settings = {"IgnoredAssets": ["old-pc"]}
+        store = ColumnarRows.from_rows(self._rows())
+        rows, _ = _apply_filters(
+            store, self._args(where="org == acme", show_ignored=True), settings
+        )
+        assert [r.syncro_name for r in rows] == ["PC-1", "OLD-PC"]
+        rows, _ = _apply_filters(store, self._args(where="not ignored"), settings)
+        assert [r.syncro_name for r in rows] == ["PC-1", "PC-2"]
 
     def test_show_ignored_keeps_them(self):
         settings = {"IgnoredAssets": ["old-pc"]}
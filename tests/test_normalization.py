@@ -0,0 +1,44 @@
+from services import normalization
+from services.comparison import normalize
+from services.normalization import Normalizer
+
+
+class TestNormalizer:
+    def test_default_mode_matches_plain_lowercasing(self):
+        normalizer = Normalizer()
+        assert normalizer("  DESKTOP-ABCDEFGHIJK  ") == "desktop-abcdefg"
+        assert normalizer("") is None
+
+    def test_results_are_memoized_and_interned(self):
+        normalizer = Normalizer()
+        first = normalizer("".join(["PC", "-01"]))
+        second = normalizer("".join(["pc", "-01"]))
+        assert first is second
+        normalizer("PC-01")
+        assert normalizer.stats() == {"calls": 3, "hits": 1, "misses": 2, "size": 2}
+
+    def test_memo_is_bounded(self):
+        normalizer = Normalizer(maxsize=2)
+        for name in ("a", "b", "c"):
+            normalizer(name)
+        assert normalizer.stats()["size"] == 2
+
+    def test_unicode_mode_folds_width_dashes_and_zero_width(self):
+        normalizer = Normalizer(unicode=True)
+        fullwidth = "".join(chr(0xFF00 + ord(c) - 0x20) for c in "PC")
+        assert normalizer(fullwidth + "\u2013" + "0\u200b1") == "pc-01"
+        assert normalizer("STRASSE") == normalizer("stra\u00dfe")
+
+
+class TestConfigure:
+    def test_switches_the_default_normalizer(self):
+        try:
+            normalization.configure(unicode=True)
+            assert normalize("stra\u00dfe") == "strasse"
+        finally:
+            normalization.configure(unicode=False)
+        assert normalize("stra\u00dfe") == "stra\u00dfe"
+
+    def test_keeps_the_memo_when_unchanged(self):
+        before = normalization.default_normalizer()
+        assert normalization.configure() is before
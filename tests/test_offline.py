@@ -0,0 +1,132 @@
+import pytest
+
+from api.offline import (
+    OfflineHuntressClient,
+    OfflineSyncroClient,
+    clients_from_dump,
+    offline_clients,
+)
+from const import STATUS_MISSING_HUNTRESS, STATUS_OK
+from services.comparison import ComparisonResult, ComparisonService
+from services.snapshots import SnapshotStore
+from utils.dumps import write_dump
+
+ASSETS = [
+    {"id": 1, "name": "PC-1", "customer_id": 10, "customer": {"business_name": "Acme"}},
+    {"id": 2, "name": "PC-2", "customer_id": 10, "customer": {"business_name": "Acme"}},
+    {
+        "id": 3,
+        "name": "SRV",
+        "customer_id": 20,
+        "customer": {"business_name": "Globex"},
+    },
+]
+AGENTS = [
+    {"id": 7, "hostname": "PC-1", "organization_id": 100},
+    {"id": 8, "hostname": "SRV", "organization_id": 200},
+]
+ORGANIZATIONS = [{"id": 100, "name": "Acme"}, {"id": 200, "name": "Globex"}]
+
+
+@pytest.fixture
+def dump_dir(tmp_path):
+    stamp = "20260101T000000"
+    for source, records in (
+        ("syncro", ASSETS),
+        ("huntress", AGENTS),
+        ("organizations", ORGANIZATIONS),
+    ):
+        write_dump(str(tmp_path / f"{stamp}-{source}.jsonl.gz"), records)
+    return tmp_path
+
+
+class TestOfflineClients:
+    def test_assets_paged_and_filtered(self):
+        client = OfflineSyncroClient(lambda: iter(ASSETS), page_size=2)
+        pages = []
+        assets = client.get_all_assets(on_page=pages.append)
+        assert assets == ASSETS
+        assert [len(page) for page in pages] == [2, 1]
+        assert [a["id"] for a in client.get_all_assets(customer_id=20)] == [3]
+
+    def test_customers_from_assets(self):
+        client = OfflineSyncroClient(lambda: iter(ASSETS))
+        customers = client.get_customers(business_name="acme")
+        assert [(c["id"], c["business_name"]) for c in customers] == [(10, "Acme")]
+        assert len(client.get_customers()) == 2
+        assert client.get_customers(page=2) == []
+
+    def test_agents_and_organizations(self):
+        client = OfflineHuntressClient(lambda: iter(AGENTS), lambda: ORGANIZATIONS)
+        assert [a["id"] for a in client.get_all_agents(organization_id=200)] == [8]
+        assert client.get_all_organizations() == ORGANIZATIONS
+        assert OfflineHuntressClient(lambda: iter(AGENTS)).get_all_organizations() == []
+
+
+class TestFromDump:
+    def test_compare_newest_dump_run(self, dump_dir):
+        # An older, incomplete run is ignored.
+        write_dump(str(dump_dir / "20250101T000000-syncro.jsonl.gz"), [{"id": 9}])
+        service = ComparisonService(*clients_from_dump(str(dump_dir)))
+        result = service.fetch_and_compare(mismatches_first=False)
+
+        statuses = {row.syncro_name: row.status for row in result.rows}
+        assert statuses == {
+            "PC-1": STATUS_OK,
+            "PC-2": STATUS_MISSING_HUNTRESS,
+            "SRV": STATUS_OK,
+        }
+        assert (result.syncro_count, result.huntress_count) == (3, 2)
+        assert service.organizations() == ORGANIZATIONS
+
+    def test_scoped_to_one_organization(self, dump_dir):
+        service = ComparisonService(*clients_from_dump(str(dump_dir)))
+        result = service.fetch_and_compare(organizations=["Globex"])
+        assert [row.syncro_name for row in result.rows] == ["SRV"]
+
+    def test_scoped_when_the_apis_name_the_client_differently(self, tmp_path):
+        from services.org_mapping import OrgMapping
+
+        write_dump(str(tmp_path / "20260101T000000-syncro.jsonl.gz"), ASSETS)
+        write_dump(str(tmp_path / "20260101T000000-huntress.jsonl.gz"), AGENTS)
+        write_dump(
+            str(tmp_path / "20260101T000000-organizations.jsonl.gz"),
+            [{"id": 100, "name": "ACME Corporation"}, {"id": 200, "name": "Globex"}],
+        )
+        expected = {"PC-1": STATUS_OK, "PC-2": STATUS_MISSING_HUNTRESS}
+
+        # No pair known: the Huntress side is matched by shared hostnames.
+        service = ComparisonService(*clients_from_dump(str(tmp_path)))
+        result = service.fetch_and_compare(organizations=["Acme"])
+        assert {r.syncro_name: r.status for r in result.rows} == expected
+        assert result.huntress_count == 1
+
+        # A mapped pair resolves the Huntress organization directly.
+        service = ComparisonService(*clients_from_dump(str(tmp_path)))
+        result = service.fetch_and_compare(
+            organizations=["Acme"],
+            name_mapping=OrgMapping({"Acme": "ACME Corporation"}),
+        )
+        assert {r.syncro_name: r.status for r in result.rows} == expected
+
+        # Named as Huntress has it: the Syncro side is found the same way.
+        service = ComparisonService(*clients_from_dump(str(tmp_path)))
+        result = service.fetch_and_compare(organizations=["ACME Corporation"])
+        assert {r.syncro_name: r.status for r in result.rows} == expected
+        assert {r.organization for r in result.rows} == {"ACME Corporation"}
+
+    def test_missing_dumps_raise(self, tmp_path):
+        with pytest.raises(ValueError, match="syncro or huntress"):
+            clients_from_dump(str(tmp_path))
+        with pytest.raises(ValueError, match="does not exist"):
+            clients_from_dump(str(tmp_path / "nope"))
+
+    def test_from_snapshot_payloads(self, tmp_path):
+        db = str(tmp_path / "snapshots.db")
+        with SnapshotStore(db) as store:
+            store.save(ComparisonResult(ASSETS, AGENTS, [], 3, 2))
+        syncro, huntress = offline_clients("snapshot:latest", db)
+        assert syncro.get_all_assets() == ASSETS
+        assert huntress.get_all_agents() == AGENTS
+        with pytest.raises(ValueError, match="snapshot:ID"):
+            offline_clients("snapshot:first", db)
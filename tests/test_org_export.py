@@ -0,0 +1,95 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import ComparisonRow
+from utils.org_export import (
+    INDEX_FILENAME,
+    export_by_org,
+    org_filename_stem,
+    partition_by_org,
+)
+
+
+@pytest.fixture
+def rows():
+    return [
+        ComparisonRow("PC-1", "PC-1", STATUS_OK, "Acme Inc."),
+        ComparisonRow("PC-2", "", STATUS_MISSING_HUNTRESS, "Globex/West"),
+        ComparisonRow("", "GHOST", STATUS_MISSING_SYNCRO, "Acme Inc."),
+        ComparisonRow("PC-9", "", STATUS_MISSING_HUNTRESS, ""),
+    ]
+
+
+def _index(directory):
+    with open(directory / INDEX_FILENAME, newline="", encoding="utf-8") as f:
+        return {row["Organization"]: row for row in csv.DictReader(f)}
+
+
+class TestPartitionByOrg:
+    def test_lists_and_columnar_agree(self, rows):
+        from_list = partition_by_org(rows)
+        from_columnar = partition_by_org(ColumnarRows.from_rows(rows))
+        assert set(from_list) == set(from_columnar) == {"Acme Inc.", "Globex/West", ""}
+        assert list(from_columnar["Acme Inc."]) == from_list["Acme Inc."]
+
+
+class TestOrgFilenameStem:
+    def test_sanitizes(self):
+        assert org_filename_stem("Globex/West") == "Globex_West"
+        assert org_filename_stem("Acme Inc.") == "Acme_Inc"
+        assert org_filename_stem("  ") == "unassigned"
+
+
+class TestExportByOrg:
+    def test_writes_one_csv_per_org_and_an_index(self, rows, tmp_path):
+        exports = export_by_org(str(tmp_path), "csv", rows, ignored_keys={"ghost"})
+
+        assert [e.organization for e in exports] == ["", "Acme Inc.", "Globex/West"]
+        with open(tmp_path / "Acme_Inc.csv", newline="", encoding="utf-8") as f:
+            acme = list(csv.DictReader(f))
+        assert [r["Syncro Asset"] for r in acme] == ["PC-1", ""]
+
+        index = _index(tmp_path)
+        assert index["Acme Inc."]["OK"] == "1"
+        assert index["Acme Inc."]["Ignored"] == "1"
+        assert index["Acme Inc."]["Rows"] == "2"
+        assert index["Globex/West"]["File"] == "Globex_West.csv"
+        assert index[""]["File"] == "unassigned.csv"
+        assert int(index["Globex/West"]["Bytes"]) == (
+            (tmp_path / "Globex_West.csv").stat().st_size
+        )
+
+    def test_jsonl_compressed(self, rows, tmp_path):
+        export_by_org(
+            str(tmp_path), "jsonl", ColumnarRows.from_rows(rows), compression="gzip"
+        )
+        with gzip.open(tmp_path / "Globex_West.jsonl.gz", "rt") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["syncro"] for r in records] == ["PC-2"]
+
+    def test_ascii_and_colliding_names(self, tmp_path):
+        rows = [
+            ComparisonRow("A", "A", STATUS_OK, "Acme/1"),
+            ComparisonRow("B", "B", STATUS_OK, "Acme 1"),
+        ]
+        exports = export_by_org(str(tmp_path), "ascii", rows, max_workers=1)
+        assert sorted(e.path.rsplit("/", 1)[-1] for e in exports) == [
+            "Acme_1-2.txt",
+            "Acme_1.txt",
+        ]
+
+    def test_unknown_format(self, rows, tmp_path):
+        with pytest.raises(ValueError):
+            export_by_org(str(tmp_path), "xml", rows)
+
+    def test_html_reports_name_only_their_own_org(self, rows, tmp_path):
+        export_by_org(str(tmp_path), "html", ColumnarRows.from_rows(rows))
+
+        page = (tmp_path / "Globex_West.html").read_text(encoding="utf-8")
+        assert "Globex/West" in page
+        assert "Acme" not in page
@@ -0,0 +1,45 @@
+import pytest
+
+from services.org_mapping import OrgMapping
+
+
+class TestOrgMapping:
+    def test_derives_pairs_from_hostname_overlap(self):
+        mapping = OrgMapping()
+        syncro = [("Acme", "pc-1"), ("Acme", "pc-2"), ("Globex", "pc-1")]
+        huntress = [("ACME Corp", "pc-1"), ("ACME Corp", "pc-2"), ("Globex", "pc-9")]
+
+        assert mapping.derive(syncro, huntress) == {"Acme": "ACME Corp"}
+
+    def test_each_org_paired_once(self):
+        mapping = OrgMapping()
+        syncro = [("Acme", "pc-1"), ("Acme", "pc-2"), ("Globex", "pc-1")]
+        huntress = [("ACME Corp", "pc-1"), ("ACME Corp", "pc-2")]
+
+        # Globex also shares pc-1 with ACME Corp, but Acme overlaps more.
+        assert mapping.derive(syncro, huntress) == {"Acme": "ACME Corp"}
+
+    def test_overrides_win(self):
+        mapping = OrgMapping(overrides={"Acme": "Acme Holdings"})
+        mapping.derive([("Acme", "pc-1")], [("ACME Corp", "pc-1")])
+
+        assert mapping.derived == {}
+        assert mapping.pairs() == {"Acme": "Acme Holdings"}
+        assert mapping.syncro_org_for() == {"Acme Holdings": "Acme"}
+
+    def test_round_trips_through_file(self, tmp_path):
+        path = str(tmp_path / "mapping.json")
+        OrgMapping({"A": "B"}, {"C": "D"}).save(path)
+
+        loaded = OrgMapping.load(path)
+        assert loaded.overrides == {"A": "B"}
+        assert loaded.derived == {"C": "D"}
+
+    def test_missing_file_is_empty(self, tmp_path):
+        assert OrgMapping.load(str(tmp_path / "none.json")).pairs() == {}
+
+    def test_bad_file_raises(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text("{not json")
+        with pytest.raises(ValueError):
+            OrgMapping.load(str(path))
@@ -1,8 +1,41 @@
 import csv
+import gzip
+import io
+import json
 from unittest.mock import patch
 
-from services.comparison import ComparisonRow
-from utils.output import HEADERS, print_colored_table, write_ascii_table, write_csv
+import pytest
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import (
+    FLAG_STALE_SYNCRO,
+    ComparisonRow,
+    InventoryComparison,
+    PresenceRow,
+    describe_flags,
+)
+from services.diff import diff_rows
+from utils.output import (
+    DIFF_HEADERS,
+    EXTRA_HEADERS,
+    HEADERS,
+    compression_for,
+    export_rows,
+    print_colored_table,
+    print_plain_table,
+    read_csv,
+    stream_ascii_table,
+    stream_csv,
+    stream_jsonl,
+    write_ascii_table,
+    write_csv,
+    write_diff_csv,
+    write_diff_json,
+    write_html,
+    write_parquet,
+    write_presence_csv,
+)
 
 
 def _row(org, syncro, huntress, status):
@@ -29,9 +62,9 @@ class TestWriteCSV:
         with open(filepath, "r", encoding="utf-8") as f:
             lines = list(csv.reader(f))
 
-        assert lines[0] == list(HEADERS) + ["Ignored"]
-        assert lines[1] == ["Acme", "Asset1", "Agent1", "OK!", ""]
-        assert lines[2] == ["", "Asset2", "", "Missing in Huntress", ""]
+        assert lines[0] == list(HEADERS) + ["Ignored", "Notes"]
+        assert lines[1] == ["Acme", "Asset1", "Agent1", "OK!", "", ""]
+        assert lines[2] == ["", "Asset2", "", "Missing in Huntress", "", ""]
 
     def test_marks_ignored_rows(self, tmp_path):
         """Ignored assets are flagged in the Ignored column."""
@@ -42,7 +75,33 @@ class TestWriteCSV:
 
         with open(filepath, "r", encoding="utf-8") as f:
             lines = list(csv.reader(f))
-        assert lines[1][-1] == "yes"
+        assert lines[1][-2] == "yes"
+
+    def test_writes_columnar_rows(self, tmp_path):
+        from services.columnar import ColumnarRows
+
+        filepath = tmp_path / "col.csv"
+        rows = ColumnarRows.from_rows([_row("Acme", "PC-1", "", "Missing in Huntress")])
+
+        write_csv(str(filepath), rows, ignored_keys={"pc-1"})
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            lines = list(csv.reader(f))
+        assert lines[1] == ["Acme", "PC-1", "", "Missing in Huntress", "yes", ""]
+
+    def test_notes_column_describes_flags(self, tmp_path):
+        from services.comparison import FLAG_DUPLICATE_HUNTRESS, FLAG_STALE_SYNCRO
+
+        filepath = tmp_path / "notes.csv"
+        row = _row("Acme", "PC-1", "PC-1", "OK!")
+        row.flags = FLAG_DUPLICATE_HUNTRESS | FLAG_STALE_SYNCRO
+
+        write_csv(str(filepath), [row])
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            lines = list(csv.reader(f))
+        assert lines[1][-1] == "Duplicate in Huntress; Stale in Syncro"
+        assert read_csv(str(filepath)).flags[0] == row.flags
 
     def test_handles_io_error(self, capsys):
         """Test that IOError is caught and printed."""
@@ -55,6 +114,171 @@ class TestWriteCSV:
         )
 
 
+class TestStreamCsv:
+    def _rows(self):
+        # A generator: consumed once, never materialized by the writer.
+        return (_row("Acme", f"PC-{i}", f"PC-{i}", "OK!") for i in range(3))
+
+    def test_reports_rows_and_bytes(self, tmp_path):
+        path = tmp_path / "out.csv"
+
+        count, size = stream_csv(str(path), self._rows())
+
+        assert count == 3
+        assert size == path.stat().st_size
+        assert path.read_text(encoding="utf-8").splitlines()[1].startswith("Acme,PC-0")
+
+    def test_gzip_by_extension(self, tmp_path):
+        path = tmp_path / "out.csv.gz"
+
+        count, size = stream_csv(str(path), self._rows())
+
+        assert size == path.stat().st_size
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            lines = list(csv.reader(f))
+        assert lines[0] == list(HEADERS + EXTRA_HEADERS)
+        assert len(lines) == count + 1
+
+    def test_stdout(self, capsysbinary):
+        count, _ = stream_csv("-", self._rows())
+
+        out = capsysbinary.readouterr().out.decode("utf-8")
+        assert count == 3
+        assert out.splitlines()[0].startswith("Organization,")
+
+    def test_errors_propagate(self):
+        with pytest.raises(OSError):
+            stream_csv("/", [])
+
+    def test_compression_for(self):
+        assert compression_for("rows.csv.GZ") == "gzip"
+        assert compression_for("rows.csv.zst") == "zstd"
+        assert compression_for("rows.csv") is None
+
+
+class TestHtmlReport:
+    def _data(self, path):
+        page = path.read_text(encoding="utf-8")
+        block = page.split('<script type="application/json" id="data">')[1]
+        return json.loads(block.split("</script>")[0])
+
+    def test_embeds_dictionary_encoded_columns(self, tmp_path):
+        rows = [
+            _row("Acme", "PC-1", "PC-1", STATUS_OK),
+            _row("Acme", "OLD-PC", "", STATUS_MISSING_HUNTRESS),
+            _row("Globex", "PC-2", "", STATUS_MISSING_HUNTRESS),
+        ]
+        path = tmp_path / "report.html"
+
+        count, size = export_rows("html", str(path), rows, {"old-pc"})
+
+        data = self._data(path)
+        assert count == 3 and size == path.stat().st_size
+        assert data["orgs"] == ["Acme", "Globex"]
+        assert data["org"] == [0, 0, 1]
+        assert [data["statuses"][code] for code in data["status"]] == [
+            STATUS_OK,
+            STATUS_MISSING_HUNTRESS,
+            STATUS_MISSING_HUNTRESS,
+        ]
+        assert data["statuses"][data["ok"]] == STATUS_OK
+        assert data["syncro"] == ["PC-1", "OLD-PC", "PC-2"]
+        assert data["ignored"] == [0, 1, 0]
+
+    def test_org_table_holds_only_referenced_orgs(self, tmp_path):
+        store = ColumnarRows.from_columns(
+            ["Secret Client", "Acme"], [1], [0], ["PC-1"], ["PC-1"], ["pc-1"]
+        )
+        path = tmp_path / "report.html"
+
+        write_html(str(path), store)
+
+        data = self._data(path)
+        assert data["orgs"] == ["Acme"] and data["org"] == [0]
+        assert "Secret Client" not in path.read_text(encoding="utf-8")
+
+    def test_script_close_tags_in_names_are_escaped(self, tmp_path):
+        path = tmp_path / "report.html"
+        write_html(str(path), [_row("</script><b>", "PC-1", "", STATUS_OK)])
+        assert self._data(path)["orgs"] == ["</script><b>"]
+        assert path.read_text(encoding="utf-8").count("</script>") == 2
+
+    def test_notes_and_ignored_bitmap_from_columnar_rows(self, tmp_path):
+        row = _row("Acme", "PC-1", "", STATUS_MISSING_HUNTRESS)
+        row.flags = FLAG_STALE_SYNCRO
+        store = ColumnarRows.from_rows([row, _row("Acme", "PC-2", "PC-2", STATUS_OK)])
+        store.mark_ignored({"pc-2"})
+        path = tmp_path / "report.html.gz"
+
+        write_html(str(path), store)
+
+        page = gzip.open(path, "rt", encoding="utf-8").read()
+        data = json.loads(page.split('id="data">')[1].split("</script>")[0])
+        assert data["ignored"] == [0, 1]
+        assert data["notes"][data["note"][0]] == describe_flags(FLAG_STALE_SYNCRO)
+        assert data["notes"][data["note"][1]] == ""
+
+
+class TestJsonAndParquet:
+    def test_jsonl_one_object_per_row(self, tmp_path):
+        rows = [
+            _row("Acme", "PC-1", "PC-1", "OK!"),
+            _row("Acme", "OLD-PC", "", "Missing in Huntress"),
+        ]
+        path = tmp_path / "out.jsonl"
+
+        count, size = export_rows("jsonl", str(path), rows, {"old-pc"})
+
+        records = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+        assert count == 2 and size == path.stat().st_size
+        assert records[0]["matched"] is True and records[0]["key"] == "pc-1"
+        assert records[1]["ignored"] is True and records[1]["matched"] is False
+
+    def test_jsonl_columnar_rows(self, tmp_path):
+        store = ColumnarRows.from_rows(
+            [_row("Acme", "PC-1", "", "Missing in Huntress")]
+        )
+        store.flags[0] = FLAG_STALE_SYNCRO
+        path = tmp_path / "out.jsonl"
+
+        stream_jsonl(str(path), store)
+
+        record = json.loads(path.read_text("utf-8"))
+        assert record["notes"] == ["Stale in Syncro"]
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            export_rows("xml", str(tmp_path / "out.xml"), [])
+
+    def test_parquet_without_pyarrow(self, tmp_path):
+        with patch.dict("sys.modules", {"pyarrow": None, "pyarrow.parquet": None}):
+            with pytest.raises(ValueError, match="pyarrow"):
+                write_parquet(str(tmp_path / "out.parquet"), [])
+
+    def test_parquet_dictionary_encodes(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "out.parquet"
+
+        count, _ = write_parquet(str(path), [_row("Acme", "PC-1", "PC-1", "OK!")])
+
+        table = pq.read_table(path)
+        assert count == 1
+        assert table.column("organization").to_pylist() == ["Acme"]
+        assert str(table.schema.field("status").type).startswith("dictionary")
+
+    def test_parquet_dictionary_holds_only_referenced_orgs(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        store = ColumnarRows.from_columns(
+            ["Secret Client", "Acme"], [1], [0], ["PC-1"], ["PC-1"], ["pc-1"]
+        )
+        path = tmp_path / "out.parquet"
+
+        write_parquet(str(path), store)
+
+        column = pq.read_table(path).column("organization").combine_chunks()
+        assert column.dictionary.to_pylist() == ["Acme"]
+
+
 class TestWriteAsciiTable:
     def test_writes_formatted_table(self, tmp_path):
         """Test that ASCII table is written with alignment."""
@@ -93,6 +317,53 @@ class TestWriteAsciiTable:
         assert "Failed to write ASCII table" in captured.out
 
 
+class TestStreamAsciiTable:
+    ROWS = [
+        _row("Acme", "pc-1", "pc-1", STATUS_OK),
+        _row("Globex Corporation", "a-very-long-hostname", "", STATUS_MISSING_HUNTRESS),
+    ]
+
+    def _lines(self, path):
+        return path.read_text(encoding="utf-8").splitlines()[4:]
+
+    def test_list_columnar_and_generator_agree_on_widths(self, tmp_path):
+        """The pre-pass and the column-wise widths give the same table."""
+        from_list = tmp_path / "list.txt"
+        from_columnar = tmp_path / "columnar.txt"
+        count, size = stream_ascii_table(str(from_list), self.ROWS)
+        stream_ascii_table(str(from_columnar), ColumnarRows.from_rows(self.ROWS))
+
+        assert count == 2
+        assert size == from_list.stat().st_size
+        assert from_list.read_text() == from_columnar.read_text()
+        lines = self._lines(from_list)
+        assert len({len(line.rstrip("\n")) for line in lines}) == 1
+        assert "a-very-long-hostname" in lines[3]
+
+    def test_max_width_truncates_cells(self, tmp_path):
+        path = tmp_path / "capped.txt"
+        stream_ascii_table(str(path), self.ROWS, max_width=10)
+        lines = self._lines(path)
+        assert "Globex Corp~ | a-very-long~" in lines[3]
+        # Headers are never cut (columns are at least as wide as theirs).
+        assert "Huntress Asset" in lines[0]
+
+    def test_one_shot_iterator_uses_fixed_widths(self, tmp_path):
+        path = tmp_path / "iter.txt"
+        count, _ = stream_ascii_table(str(path), iter(self.ROWS), max_width=12)
+        assert count == 2
+        lines = self._lines(path)
+        assert lines[1].split("-+-")[0] == "-" * 12
+        assert "a-very-long~" in lines[3]
+
+    def test_compressed(self, tmp_path):
+        path = tmp_path / "table.txt.gz"
+        stream_ascii_table(str(path), self.ROWS, syncro_count=2)
+        content = gzip.open(path, "rt", encoding="utf-8").read()
+        assert "Syncro:   2" in content
+        assert "Globex Corporation" in content
+
+
 class TestPrintColoredTable:
     @patch("utils.output.console")
     def test_prints_table_elements(self, mock_console):
@@ -112,3 +383,140 @@ class TestPrintColoredTable:
         print_colored_table([_row("Acme", "A", "B", "OK!")], use_color=False)
 
         assert mock_console.print.called
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestPrintPlainTable:
+    ROWS = [
+        _row("Acme", "pc-1", "pc-1", STATUS_OK),
+        _row("Globex", "pc-2", "", STATUS_MISSING_HUNTRESS),
+        _row("Globex", "pc-3", "", STATUS_MISSING_HUNTRESS),
+    ]
+
+    def test_aligned_without_color_off_a_terminal(self):
+        out = io.StringIO()
+        printed = print_plain_table(self.ROWS, syncro_count=3, file=out)
+        lines = out.getvalue().splitlines()
+
+        assert printed == 3
+        assert "\x1b[" not in out.getvalue()
+        assert lines[0].split(" | ")[0].rstrip() == "Organization"
+        assert len({len(line) for line in lines[:5]}) == 1
+        assert "Syncro:   3" in out.getvalue()
+        # No row has flags, so there is no Notes column.
+        assert "Notes" not in lines[0]
+
+    def test_ansi_colors_on_a_terminal(self):
+        out = _Terminal()
+        print_plain_table(self.ROWS, file=out)
+        assert "\x1b[32m" + STATUS_OK in out.getvalue()
+        assert "\x1b[31m" + STATUS_MISSING_HUNTRESS in out.getvalue()
+
+        out = _Terminal()
+        print_plain_table(self.ROWS, use_color=False, file=out)
+        assert "\x1b[" not in out.getvalue()
+
+    def test_limit_reports_remaining_rows(self):
+        out = io.StringIO()
+        printed = print_plain_table(
+            ColumnarRows.from_rows(self.ROWS), limit=1, file=out
+        )
+        assert printed == 1
+        assert "pc-2" not in out.getvalue()
+        assert "2 more rows" in out.getvalue()
+
+    def test_notes_column_for_flagged_rows(self):
+        row = _row("Acme", "pc-1", "", STATUS_MISSING_HUNTRESS)
+        row.flags = FLAG_STALE_SYNCRO
+        out = io.StringIO()
+        print_plain_table([row], file=out)
+        assert "Notes" in out.getvalue().splitlines()[0]
+
+    @patch("utils.output.PLAIN_TABLE_THRESHOLD", 2)
+    @patch("utils.output.print_plain_table")
+    def test_colored_table_switches_above_threshold(self, mock_plain):
+        print_colored_table(self.ROWS[:2])
+        assert not mock_plain.called
+        print_colored_table(self.ROWS)
+        assert mock_plain.called
+
+
+class TestReadCSV:
+    def test_round_trips_write_csv(self, tmp_path):
+        filepath = tmp_path / "rt.csv"
+        rows = [
+            _row("Acme", "PC-1", "PC-1", "OK!"),
+            _row("", "", "GHOST", "Missing in Syncro"),
+        ]
+        write_csv(str(filepath), rows, ignored_keys={"ghost"})
+
+        assert list(read_csv(str(filepath))) == rows
+
+    def test_rejects_other_csv(self, tmp_path):
+        filepath = tmp_path / "other.csv"
+        filepath.write_text("a,b\n1,2\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            read_csv(str(filepath))
+
+    def test_reads_compressed_exports(self, tmp_path):
+        filepath = str(tmp_path / "rt.csv.gz")
+        rows = [_row("Acme", "PC-1", "PC-1", "OK!")]
+        write_csv(filepath, rows)
+        assert list(read_csv(filepath)) == rows
+
+    @pytest.mark.parametrize(
+        "line, message",
+        [("Acme,PC-1\n", "line 3: expected at least 4"), ("A,B,C,Fine\n", "line 3")],
+    )
+    def test_bad_rows_name_the_line(self, tmp_path, line, message):
+        filepath = tmp_path / "bad.csv"
+        filepath.write_text(
+            ",".join(HEADERS) + "\nAcme,PC-1,PC-1,OK!\n" + line, encoding="utf-8"
+        )
+        with pytest.raises(ValueError, match=message):
+            read_csv(str(filepath))
+
+
+class TestDiffWriters:
+    def _report(self):
+        old = [_row("Acme", "PC-1", "PC-1", "OK!")]
+        new = [_row("Acme", "PC-1", "", "Missing in Huntress")]
+        return diff_rows(old, new)
+
+    def test_diff_csv(self, tmp_path):
+        filepath = tmp_path / "diff.csv"
+        write_diff_csv(str(filepath), self._report())
+        with open(filepath, "r", encoding="utf-8") as f:
+            lines = list(csv.reader(f))
+        assert lines[0] == list(DIFF_HEADERS)
+        assert lines[1][0] == "status"
+        assert lines[1][5:7] == ["OK!", "Missing in Huntress"]
+
+    def test_diff_json(self, tmp_path):
+        filepath = tmp_path / "diff.json"
+        write_diff_json(str(filepath), self._report())
+        data = json.loads(filepath.read_text(encoding="utf-8"))
+        assert data["counts"]["changed"] == 1
+        assert data["changes"][0]["new_status"] == "Missing in Huntress"
+
+
+class TestWritePresenceCsv:
+    def test_one_column_per_source(self, tmp_path):
+        comparison = InventoryComparison(
+            sources=["Syncro", "Huntress", "AD"],
+            rows=[PresenceRow("pc-1", "Acme", ("PC-1", "", "PC-1"), 0b101)],
+            counts={"Syncro": 1, "Huntress": 0, "AD": 1},
+        )
+        path = tmp_path / "nway.csv"
+
+        write_presence_csv(str(path), comparison)
+
+        with open(path, newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f)) == [
+                ["Organization", "Hostname", "Syncro", "Huntress", "AD", "Status"],
+                ["Acme", "pc-1", "PC-1", "", "PC-1", "Missing in Huntress"],
+            ]
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_OK
+from services.columnar import ColumnarRows
+from services.comparison import ComparisonResult, ComparisonRow
+from services.snapshots import SnapshotError, SnapshotStore
+
+
+@pytest.fixture
+def result():
+    return ComparisonResult(
+        syncro_assets=[{"name": "PC-1"}, {"name": "PC-2"}],
+        huntress_agents=[{"hostname": "PC-1"}],
+        rows=[
+            ComparisonRow("PC-2", "", STATUS_MISSING_HUNTRESS, "Globex"),
+            ComparisonRow("PC-1", "PC-1", STATUS_OK, "Acme"),
+        ],
+        syncro_count=2,
+        huntress_count=1,
+        stats={"fetch_seconds": 1.5},
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SnapshotStore(str(tmp_path / "snapshots.db")) as store:
+        yield store
+
+
+class TestSnapshotStore:
+    def test_round_trip_preserves_rows_and_order(self, store, result):
+        snapshot_id = store.save(result)
+        loaded = store.load(snapshot_id)
+
+        assert isinstance(loaded.rows, ColumnarRows)
+        assert list(loaded.rows) == result.rows
+        assert loaded.syncro_count == 2
+        assert loaded.huntress_count == 1
+        assert loaded.created_at == result.created_at
+        assert loaded.stats == {"fetch_seconds": 1.5}
+
+    def test_round_trip_preserves_flags(self, store, result):
+        result.rows[0].flags = 3
+        loaded = store.load(store.save(result))
+        assert list(loaded.rows.flags) == [3, 0]
+
+    def test_adds_flags_column_to_old_databases(self, tmp_path):
+        import sqlite3
+
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE snapshot_rows (snapshot_id INTEGER NOT NULL,"
+            " position INTEGER NOT NULL, org_code INTEGER NOT NULL,"
+            " status_code INTEGER NOT NULL, syncro_name TEXT NOT NULL,"
+            " huntress_name TEXT NOT NULL, key TEXT NOT NULL,"
+            " PRIMARY KEY (snapshot_id, position)) WITHOUT ROWID"
+        )
+        conn.close()
+
+        with SnapshotStore(path) as store:
+            columns = [
+                r[1] for r in store._conn.execute("PRAGMA table_info(snapshot_rows)")
+            ]
+        assert "flags" in columns
+
+    def test_payloads_loaded_only_on_request(self, store, result):
+        snapshot_id = store.save(result)
+        assert store.load(snapshot_id).syncro_assets == []
+        loaded = store.load(snapshot_id, with_payloads=True)
+        assert loaded.syncro_assets == result.syncro_assets
+        assert loaded.huntress_agents == result.huntress_agents
+
+    def test_payload_chunks_stream_the_json(self, store, result):
+        snapshot_id = store.save(result)
+        text = "".join(store.payload_chunks(None, "syncro", chunk_size=4))
+        assert json.loads(text) == result.syncro_assets
+        assert list(store.payload_chunks(snapshot_id, "other")) == []
+
+    def test_list_newest_first_and_latest(self, store, result):
+        first = store.save(result, label="monday")
+        second = store.save(result)
+
+        infos = store.list_snapshots()
+        assert [i.id for i in infos] == [second, first]
+        assert infos[1].label == "monday"
+        assert infos[0].row_count == 2
+        assert store.load().created_at == result.created_at
+        assert store.latest_id() == second
+
+    def test_empty_result_round_trips(self, store):
+        empty = ComparisonResult([], [], [], 0, 0)
+        assert len(store.load(store.save(empty)).rows) == 0
+
+    def test_missing_snapshot_raises(self, store):
+        with pytest.raises(SnapshotError):
+            store.load()
+        with pytest.raises(SnapshotError):
+            store.load(42)
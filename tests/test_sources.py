@@ -0,0 +1,123 @@
+from unittest.mock import Mock
+
+import pytest
+
+from const import STATUS_OK
+from services.comparison import ComparisonService, describe_presence, presence_join
+from services.sources import (
+    CsvSource,
+    HuntressSource,
+    InventorySource,
+    SyncroSource,
+    parse_source_spec,
+)
+
+
+class StaticSource(InventorySource):
+    key_field = "host"
+
+    def __init__(self, name, hosts):
+        self.name = name
+        self._records = [{"host": host} for host in hosts]
+
+    def fetch(self):
+        return self._records
+
+
+class TestPresenceJoin:
+    def test_builds_one_mask_per_key(self):
+        presence = presence_join([{"a": 1, "b": 1}, {"b": 1}, {"b": 1, "c": 1}])
+        assert presence == {"a": 0b001, "b": 0b111, "c": 0b100}
+
+    def test_describe_presence(self):
+        sources = ["Syncro", "Huntress", "AD"]
+        assert describe_presence(0b111, sources) == STATUS_OK
+        assert describe_presence(0b001, sources) == "Missing in Huntress, AD"
+
+
+class TestInventorySource:
+    def test_fetch_is_abstract(self):
+        class NoFetch(InventorySource):
+            name = "Broken"
+
+        with pytest.raises(TypeError):
+            NoFetch()
+
+
+class TestCompareSources:
+    def test_three_way_rows(self):
+        service = ComparisonService(Mock(), Mock())
+        comparison = service.compare_sources(
+            [
+                StaticSource("Syncro", ["PC-1", "PC-2"]),
+                StaticSource("Huntress", ["pc-1"]),
+                StaticSource("AD", ["PC-1", "PC-3"]),
+            ]
+        )
+
+        by_key = {row.key: row for row in comparison.rows}
+        assert by_key["pc-1"].presence == 0b111
+        assert by_key["pc-1"].names == ("PC-1", "pc-1", "PC-1")
+        assert comparison.status(by_key["pc-2"]) == "Missing in Huntress, AD"
+        assert comparison.status(by_key["pc-3"]) == "Missing in Syncro, Huntress"
+        assert comparison.counts == {"Syncro": 2, "Huntress": 1, "AD": 2}
+        # Mismatches first by default.
+        assert comparison.rows[-1].key == "pc-1"
+
+    def test_default_sources_wrap_the_clients(self):
+        syncro, huntress = Mock(), Mock()
+        syncro.get_all_assets.return_value = [
+            {"name": "PC-1", "customer": {"business_name": "Acme"}}
+        ]
+        huntress.get_all_agents.return_value = [
+            {"hostname": "PC-1", "organization_id": 10}
+        ]
+        huntress.get_all_organizations.return_value = [{"id": 10, "name": "Acme"}]
+        service = ComparisonService(syncro, huntress)
+
+        sources = service.default_sources()
+        comparison = service.compare_sources(sources)
+
+        assert [type(s) for s in sources] == [SyncroSource, HuntressSource]
+        assert [(r.organization, r.presence) for r in comparison.rows] == [
+            ("Acme", 0b11)
+        ]
+
+    def test_huntress_org_names_degrade_to_blank(self):
+        client = Mock()
+        client.get_all_agents.return_value = [
+            {"hostname": "PC-1", "organization_id": 1}
+        ]
+        client.get_all_organizations.side_effect = RuntimeError("403")
+        source = HuntressSource(client)
+
+        records = source.fetch()
+
+        assert source.organization(records[0]) == ""
+
+
+class TestCsvSource:
+    def test_detects_columns_and_strips_domain(self, tmp_path):
+        path = tmp_path / "ad.csv"
+        path.write_text(
+            "DNSHostName,Company\npc-1.corp.local,Acme\nPC-2,Globex\n",
+            encoding="utf-8",
+        )
+        source = CsvSource("AD", str(path))
+
+        records = source.fetch()
+
+        assert [r[source.key_field] for r in records] == ["pc-1", "PC-2"]
+        assert source.organization(records[1]) == "Globex"
+
+    def test_missing_hostname_column_raises(self, tmp_path):
+        path = tmp_path / "bad.csv"
+        path.write_text("Serial\n123\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            CsvSource("AV", str(path)).fetch()
+
+    def test_parse_source_spec(self):
+        source = parse_source_spec("AD=computers.csv")
+        assert (source.name, source.path) == ("AD", "computers.csv")
+        with pytest.raises(ValueError):
+            parse_source_spec("computers.csv")
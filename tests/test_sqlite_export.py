@@ -0,0 +1,111 @@
+import json
+import sqlite3
+
+import pytest
+
+from const import STATUS_MISSING_HUNTRESS, STATUS_MISSING_SYNCRO, STATUS_OK
+from services.comparison import (
+    FLAG_STALE_SYNCRO,
+    ComparisonResult,
+    ComparisonRow,
+    describe_flags,
+)
+from utils.sqlite_export import export_sqlite
+
+
+@pytest.fixture
+def result():
+    stale = ComparisonRow("OLD-PC", "", STATUS_MISSING_HUNTRESS, "Acme")
+    stale.flags = FLAG_STALE_SYNCRO
+    return ComparisonResult(
+        syncro_assets=[
+            {
+                "id": 1,
+                "name": "PC-1",
+                "customer_id": 7,
+                "customer": {"business_name": "Acme"},
+            },
+            {"id": 2, "name": "OLD-PC", "customer_id": 7, "last_seen": None},
+        ],
+        huntress_agents=[
+            {"id": 10, "hostname": "pc-1", "organization_id": 3},
+            {"id": 11, "hostname": "GHOST", "organization_id": 3},
+        ],
+        rows=[
+            ComparisonRow("PC-1", "pc-1", STATUS_OK, "Acme"),
+            stale,
+            ComparisonRow("", "GHOST", STATUS_MISSING_SYNCRO, "Globex"),
+        ],
+        syncro_count=2,
+        huntress_count=2,
+        stats={"fetch_seconds": 1.5},
+    )
+
+
+def _query(path, sql, *params):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+class TestExportSqlite:
+    def test_writes_rows_sources_and_run(self, result, tmp_path):
+        path = str(tmp_path / "runs.db")
+
+        counts = export_sqlite(path, result, {"ghost"})
+
+        assert counts == {
+            "run_id": 1,
+            "rows": 3,
+            "syncro_assets": 2,
+            "huntress_agents": 2,
+        }
+        assert _query(
+            path,
+            "SELECT organization, status, key, ignored, notes FROM rows"
+            " ORDER BY key",
+        ) == [
+            ("Globex", STATUS_MISSING_SYNCRO, "ghost", 1, ""),
+            (
+                "Acme",
+                STATUS_MISSING_HUNTRESS,
+                "old-pc",
+                0,
+                describe_flags(FLAG_STALE_SYNCRO),
+            ),
+            ("Acme", STATUS_OK, "pc-1", 0, ""),
+        ]
+        assert _query(path, "SELECT key, organization FROM syncro_assets") == [
+            ("pc-1", "Acme"),
+            ("old-pc", ""),
+        ]
+        assert _query(path, "SELECT id, key FROM huntress_agents") == [
+            (10, "pc-1"),
+            (11, "ghost"),
+        ]
+        (run,) = _query(path, "SELECT syncro_count, row_count, stats FROM runs")
+        assert run[:2] == (2, 3)
+        assert json.loads(run[2]) == {"fetch_seconds": 1.5}
+
+    def test_runs_accumulate_and_latest_views_pick_the_newest(self, result, tmp_path):
+        path = str(tmp_path / "runs.db")
+        export_sqlite(path, result)
+        result.rows = result.rows[:1]
+        assert export_sqlite(path, result)["run_id"] == 2
+
+        assert _query(path, "SELECT COUNT(*) FROM rows") == [(4,)]
+        assert _query(path, "SELECT run_id, key FROM latest_rows") == [(2, "pc-1")]
+
+    def test_status_queries_use_an_index(self, result, tmp_path):
+        path = str(tmp_path / "runs.db")
+        export_sqlite(path, result)
+        plan = _query(
+            path,
+            "EXPLAIN QUERY PLAN SELECT organization, COUNT(*) FROM rows"
+            " WHERE run_id = ? AND status = ? GROUP BY organization",
+            1,
+            STATUS_MISSING_HUNTRESS,
+        )
+        assert any("idx_rows_status" in step[-1] for step in plan)
@@ -59,6 +59,34 @@ class TestGetAssets:
         request_url = responses.calls[0].request.url
         assert "page=3" in request_url
 
+    @responses.activate
+    def test_customer_filter(self, syncro_client):
+        """customer_id is passed through as a server-side filter."""
+        responses.add(
+            responses.GET,
+            "https://testcompany.syncromsp.com/api/v1/customer_assets",
+            json={"assets": [], "meta": {"total_pages": 1}},
+            status=200,
+        )
+
+        syncro_client.get_all_assets(customer_id=42)
+
+        assert all("customer_id=42" in c.request.url for c in responses.calls)
+
+    @responses.activate
+    def test_get_customers_by_business_name(self, syncro_client):
+        responses.add(
+            responses.GET,
+            "https://testcompany.syncromsp.com/api/v1/customers",
+            json={"customers": [{"id": 7, "business_name": "Acme"}]},
+            status=200,
+        )
+
+        result = syncro_client.get_customers(business_name="Acme")
+
+        assert result == [{"id": 7, "business_name": "Acme"}]
+        assert "business_name=Acme" in responses.calls[0].request.url
+
 
 class TestGetAllAssets:
     @responses.activate
@@ -92,6 +120,21 @@ class TestGetAllAssets:
 
         assert len(result) == 2
 
+    @responses.activate
+    def test_calls_on_page_per_page(self, syncro_client):
+        responses.add(
+            responses.GET,
+            "https://testcompany.syncromsp.com/api/v1/customer_assets",
+            json={"assets": [{"id": 1}], "meta": {"total_pages": 3}},
+            status=200,
+        )
+        pages = []
+
+        assets = syncro_client.get_all_assets(on_page=pages.append)
+
+        assert len(pages) == 3
+        assert [a for page in pages for a in page] == assets
+
     @responses.activate
     def test_respects_max_pages(self, syncro_client):
         """Test that get_all_assets stops at max_pages even if API has more."""
@@ -0,0 +1,227 @@
+"""Debug dumps of the raw API payloads, written on a background thread."""
+
+import gzip
+import json
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from const import DEBUG_DUMP_DIR, DEFAULT_SETTINGS
+
+# Dump file names: <UTC run stamp>-<source>.jsonl.gz. Rotation only ever
+# touches files matching this pattern.
+DUMP_SUFFIX = ".jsonl.gz"
+_DUMP_NAME = re.compile(r"^(\d{8}T\d{6}(?:-\d+)?)-([\w-]+)\.jsonl\.gz$")
+# Indented JSON arrays written by the CLI's Debug mode before dumps rotated.
+LEGACY_DUMPS = {
+    "syncro": "agentDumpSyncro.json",
+    "huntress": "agentDumpHuntress.json",
+}
+# Characters read per chunk when streaming a JSON array.
+_READ_SIZE = 1 << 16
+# Fast gzip level: dumps are large and written once, read rarely.
+DUMP_COMPRESSLEVEL = 1
+# Defaults for the DebugDumpKeep / DebugDumpMaxMB settings.
+DEFAULT_KEEP = DEFAULT_SETTINGS["DebugDumpKeep"]
+DEFAULT_MAX_MB = DEFAULT_SETTINGS["DebugDumpMaxMB"]
+
+
+def write_dump(path: str, records: Iterable) -> int:
+    """Stream ``records`` to ``path`` as gzip JSON Lines; returns the count.
+
+    Written to a temporary file and renamed, so a dump is either complete
+    or absent.
+    """
+    count = 0
+    tmp_path = path + ".tmp"
+    try:
+        with gzip.open(
+            tmp_path, "wt", encoding="utf-8", compresslevel=DUMP_COMPRESSLEVEL
+        ) as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":"), default=str))
+                f.write("\n")
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """Yield the elements of a JSON array arriving as text ``chunks``.
+
+    Elements are decoded one at a time as the text arrives, so a large
+    array is never held (or parsed) whole.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, started = "", 0, False
+    for chunk in chunks:
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element is cut off at the end of this chunk.
+                break
+            # A number at the very end may continue in the next chunk.
+            if end == len(buffer) and not isinstance(value, (dict, list, str)):
+                break
+            yield value
+            pos = end
+    raise ValueError("Truncated or invalid JSON array")
+
+
+def read_dump(path: str) -> Iterator[Any]:
+    """Stream the records of a dump: JSON Lines (gzip or plain), or a JSON
+    array (the legacy ``agentDump*.json`` files)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            yield from iter_json_array(iter(lambda: f.read(_READ_SIZE), ""))
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def dump_runs(directory: str) -> Dict[str, Dict[str, str]]:
+    """Dump runs in ``directory``: run stamp -> source -> path."""
+    runs: Dict[str, Dict[str, str]] = {}
+    for name in os.listdir(directory):
+        match = _DUMP_NAME.match(name)
+        if match:
+            runs.setdefault(match.group(1), {})[match.group(2)] = os.path.join(
+                directory, name
+            )
+    return runs
+
+
+def latest_dump(directory: str) -> Dict[str, str]:
+    """Source -> path of the newest dump run in ``directory``.
+
+    Falls back to the legacy ``agentDump*.json`` files; empty when there
+    is neither.
+    """
+    runs = dump_runs(directory)
+    if runs:
+        return runs[max(runs)]
+    return {
+        source: os.path.join(directory, name)
+        for source, name in LEGACY_DUMPS.items()
+        if os.path.exists(os.path.join(directory, name))
+    }
+
+
+def _run_stamp(directory: str) -> str:
+    """A UTC timestamp for a new run, numbered if one already exists."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    taken = dump_runs(directory)
+    name, n = stamp, 1
+    while name in taken:
+        n += 1
+        name = f"{stamp}-{n}"
+    return name
+
+
+def rotate_dumps(
+    directory: str, keep: int = DEFAULT_KEEP, max_bytes: Optional[int] = None
+) -> List[str]:
+    """Delete the oldest dump runs beyond ``keep`` runs or ``max_bytes`` total.
+
+    The newest run is always kept. Returns the removed paths.
+    """
+    runs = dump_runs(directory)
+    removed = []
+    kept_bytes = 0
+    # Stamps sort chronologically: walk newest first, so once a run is over
+    # either budget it and every older run go.
+    for index, stamp in enumerate(sorted(runs, reverse=True)):
+        kept_bytes += sum(os.path.getsize(path) for path in runs[stamp].values())
+        if index == 0:
+            continue
+        if index >= keep or (max_bytes is not None and kept_bytes > max_bytes):
+            for path in runs[stamp].values():
+                os.remove(path)
+                removed.append(path)
+    return removed
+
+
+class DumpWriter:
+    """Writes debug dumps on a single background thread.
+
+    ``submit`` returns at once with a ``Future`` for the written paths; the
+    payloads are serialized (compact JSON Lines, gzip) off the caller's
+    thread and old runs are then rotated out by count and total size
+    (unless ``rotate`` is False, for folders the user picked). Used by the
+    CLI's ``Debug`` mode and the GUI debug dialog.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEBUG_DUMP_DIR,
+        keep: int = DEFAULT_KEEP,
+        max_mb: Optional[float] = DEFAULT_MAX_MB,
+        rotate: bool = True,
+    ):
+        self.directory = directory
+        self.keep = keep
+        self.rotate = rotate
+        self.max_bytes = None if not max_mb else int(max_mb * 1024 * 1024)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dump")
+
+    @classmethod
+    def from_settings(
+        cls, settings: Dict, directory: str = DEBUG_DUMP_DIR, rotate: bool = True
+    ) -> "DumpWriter":
+        return cls(
+            directory,
+            keep=int(settings.get("DebugDumpKeep") or DEFAULT_KEEP),
+            max_mb=settings.get("DebugDumpMaxMB", DEFAULT_MAX_MB),
+            rotate=rotate,
+        )
+
+    def submit(self, payloads: Dict[str, list]) -> "Future[List[str]]":
+        """Dump each ``source -> records`` payload as one run."""
+        # Shallow copies: the caller may keep using (and changing) its lists.
+        payloads = {source: list(records) for source, records in payloads.items()}
+        return self._executor.submit(self._write, payloads)
+
+    def _write(self, payloads: Dict[str, list]) -> List[str]:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = _run_stamp(self.directory)
+        paths = []
+        for source, records in payloads.items():
+            path = os.path.join(self.directory, f"{stamp}-{source}{DUMP_SUFFIX}")
+            write_dump(path, records)
+            paths.append(path)
+        if self.rotate:
+            rotate_dumps(self.directory, self.keep, self.max_bytes)
+        return paths
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting dumps; ``wait`` blocks until pending ones finish."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "DumpWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
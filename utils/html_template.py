@@ -0,0 +1,218 @@
+"""Page template for the self-contained HTML report (``write_html``).
+
+The report is one static file: ``REPORT_HEAD``, the row data as columnar
+JSON inside a ``<script type="application/json">`` block, then
+``REPORT_TAIL``. The script renders the summary cards and per-organization
+breakdown from the columns and draws only the table rows in view, so
+100k-row reports stay responsive.
+"""
+
+REPORT_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Syncro / Huntress Comparison</title>
+<style>
+body { font: 14px system-ui, sans-serif; margin: 1.5em; color: #222; }
+h1 { font-size: 1.4em; margin: 0 0 .2em; }
+.muted { color: #777; }
+.cards { display: flex; gap: 1em; flex-wrap: wrap; margin: 1em 0; }
+.card { border: 1px solid #ddd; border-radius: 6px; padding: .6em 1em;
+  min-width: 9em; }
+.card b { display: block; font-size: 1.6em; }
+.ok { color: #1a7f37; }
+.bad { color: #cf222e; }
+.ign { color: #999; }
+details { margin: 1em 0; }
+#orgs { border-collapse: collapse; }
+#orgs td, #orgs th { padding: .2em .8em; border-bottom: 1px solid #eee;
+  text-align: right; }
+#orgs td:first-child, #orgs th:first-child { text-align: left; }
+#orgs tbody tr { cursor: pointer; }
+#orgs tbody tr:hover { background: #f4f6f8; }
+.controls { display: flex; gap: .6em; align-items: center; margin: .6em 0; }
+.controls input[type=search] { width: 20em; }
+.grid { display: grid; grid-template-columns: 2fr 2fr 2fr 1.4fr 2fr; }
+.grid > div { padding: 0 .5em; white-space: nowrap; overflow: hidden;
+  text-overflow: ellipsis; line-height: 24px; }
+#head { font-weight: bold; border-bottom: 2px solid #ccc; }
+#head > div { cursor: pointer; user-select: none; }
+#viewport { height: 70vh; overflow-y: auto; position: relative;
+  border: 1px solid #ddd; }
+#spacer { position: relative; }
+#rows { position: absolute; left: 0; right: 0; top: 0; }
+#rows .grid { height: 24px; border-bottom: 1px solid #f0f0f0; }
+#rows .grid.dim { color: #999; }
+</style>
+</head>
+<body>
+<h1>Syncro / Huntress Comparison</h1>
+<div class="muted" id="generated"></div>
+<div class="cards" id="cards"></div>
+<details open>
+<summary>By organization</summary>
+<table id="orgs">
+<thead><tr><th>Organization</th><th>OK</th><th>Missing in Huntress</th>
+<th>Missing in Syncro</th><th>Ignored</th></tr></thead>
+<tbody></tbody>
+</table>
+</details>
+<div class="controls">
+<input type="search" id="search" placeholder="Search hosts and organizations">
+<select id="org"><option value="-1">All organizations</option></select>
+<select id="status"><option value="-1">All statuses</option></select>
+<label><input type="checkbox" id="ignored" checked> Show ignored</label>
+<span class="muted" id="shown"></span>
+</div>
+<div class="grid" id="head">
+<div data-col="0">Organization</div><div data-col="1">Syncro Asset</div>
+<div data-col="2">Huntress Asset</div><div data-col="3">Status</div>
+<div data-col="4">Notes</div>
+</div>
+<div id="viewport"><div id="spacer"><div id="rows"></div></div></div>
+<script type="application/json" id="data">"""
+
+REPORT_TAIL = """</script>
+<script>
+(function () {
+  "use strict";
+  var D = JSON.parse(document.getElementById("data").textContent);
+  var N = D.org.length, ROW = 24;
+  var $ = function (id) { return document.getElementById(id); };
+  var esc = function (s) {
+    return s.replace(/[&<>"]/g, function (c) {
+      return { "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;" }[c];
+    });
+  };
+  var text = [
+    function (i) { return D.orgs[D.org[i]]; },
+    function (i) { return D.syncro[i]; },
+    function (i) { return D.huntress[i]; },
+    function (i) { return D.statuses[D.status[i]]; },
+    function (i) { return D.notes[D.note[i]]; }
+  ];
+
+  $("generated").textContent = "Generated " + D.generated + " \\u00b7 " +
+    N + " rows";
+
+  // Summary cards and per-organization counts, one pass over the codes.
+  var totals = D.statuses.map(function () { return 0; }), ignored = 0;
+  var byOrg = D.orgs.map(function () {
+    return D.statuses.map(function () { return 0; }).concat([0]);
+  });
+  for (var i = 0; i < N; i++) {
+    var counts = byOrg[D.org[i]];
+    if (D.ignored[i]) { ignored++; counts[D.statuses.length]++; }
+    else { totals[D.status[i]]++; counts[D.status[i]]++; }
+  }
+  var cards = D.statuses.map(function (s, code) {
+    return '<div class="card"><b class="' + (code === D.ok ? "ok" : "bad") +
+      '">' + totals[code] + "</b>" + esc(s) + "</div>";
+  });
+  cards.push('<div class="card"><b class="ign">' + ignored +
+    "</b>Ignored</div>");
+  $("cards").innerHTML = cards.join("");
+
+  var orgOrder = D.orgs.map(function (_, code) { return code; })
+    .filter(function (code) {
+      return byOrg[code].some(function (n) { return n > 0; });
+    })
+    .sort(function (a, b) { return D.orgs[a].localeCompare(D.orgs[b]); });
+  $("orgs").tBodies[0].innerHTML = orgOrder.map(function (code) {
+    return '<tr data-org="' + code + '"><td>' +
+      esc(D.orgs[code] || "(none)") + "</td><td>" +
+      byOrg[code].join("</td><td>") + "</td></tr>";
+  }).join("");
+  $("org").innerHTML += orgOrder.map(function (code) {
+    return '<option value="' + code + '">' + esc(D.orgs[code] || "(none)") +
+      "</option>";
+  }).join("");
+  $("status").innerHTML += D.statuses.map(function (s, code) {
+    return '<option value="' + code + '">' + esc(s) + "</option>";
+  }).join("");
+
+  // Filtering and sorting work on an index array; rows are never copied.
+  var haystack = null, view = new Int32Array(0), sortCol = -1, sortDir = 1;
+  var collator = new Intl.Collator(undefined, { sensitivity: "base" });
+
+  function apply() {
+    var query = $("search").value.trim().toLowerCase();
+    var org = +$("org").value, status = +$("status").value;
+    var showIgnored = $("ignored").checked;
+    if (query && haystack === null) {
+      haystack = new Array(N);
+      for (var i = 0; i < N; i++) {
+        haystack[i] = (D.orgs[D.org[i]] + "\\u0001" + D.syncro[i] + "\\u0001" +
+          D.huntress[i]).toLowerCase();
+      }
+    }
+    var picked = new Int32Array(N), n = 0;
+    for (var j = 0; j < N; j++) {
+      if (org >= 0 && D.org[j] !== org) continue;
+      if (status >= 0 && D.status[j] !== status) continue;
+      if (!showIgnored && D.ignored[j]) continue;
+      if (query && haystack[j].indexOf(query) < 0) continue;
+      picked[n++] = j;
+    }
+    view = picked.subarray(0, n);
+    if (sortCol >= 0) {
+      var key = text[sortCol];
+      view = Int32Array.from(view).sort(function (a, b) {
+        return sortDir * collator.compare(key(a), key(b)) || a - b;
+      });
+    }
+    $("shown").textContent = n + " of " + N + " rows";
+    $("spacer").style.height = n * ROW + "px";
+    render();
+  }
+
+  function render() {
+    var viewport = $("viewport");
+    var first = Math.max(0, Math.floor(viewport.scrollTop / ROW) - 5);
+    var last = Math.min(view.length,
+      first + Math.ceil(viewport.clientHeight / ROW) + 10);
+    var html = [];
+    for (var k = first; k < last; k++) {
+      var i = view[k];
+      var cls = D.status[i] === D.ok ? "ok" : "bad";
+      html.push('<div class="grid' + (D.ignored[i] ? " dim" : "") + '">' +
+        "<div>" + esc(text[0](i)) + "</div><div>" + esc(text[1](i)) +
+        "</div><div>" + esc(text[2](i)) + '</div><div class="' + cls + '">' +
+        esc(text[3](i)) + "</div><div>" + esc(text[4](i)) + "</div></div>");
+    }
+    $("rows").style.transform = "translateY(" + first * ROW + "px)";
+    $("rows").innerHTML = html.join("");
+  }
+
+  $("viewport").addEventListener("scroll", function () {
+    window.requestAnimationFrame(render);
+  });
+  var pending = null;
+  $("search").addEventListener("input", function () {
+    clearTimeout(pending);
+    pending = setTimeout(apply, 150);
+  });
+  ["org", "status", "ignored"].forEach(function (id) {
+    $(id).addEventListener("change", apply);
+  });
+  $("head").addEventListener("click", function (e) {
+    var col = e.target.getAttribute("data-col");
+    if (col === null) return;
+    sortDir = +col === sortCol ? -sortDir : 1;
+    sortCol = +col;
+    apply();
+  });
+  $("orgs").addEventListener("click", function (e) {
+    var row = e.target.closest("tr[data-org]");
+    if (!row) return;
+    $("org").value = row.getAttribute("data-org");
+    apply();
+  });
+  window.addEventListener("resize", render);
+  apply();
+})();
+</script>
+</body>
+</html>
+"""
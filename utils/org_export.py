@@ -0,0 +1,144 @@
+"""Split one comparison result into a report file per organization."""
+
+import csv
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Container, Dict, List, Optional
+
+from services.aggregates import OrgAggregates, OrgCounts
+from services.columnar import ColumnarRows
+from services.comparison import RowSequence
+from utils.output import (
+    COMPRESSION_EXTENSIONS,
+    EXPORT_WRITERS,
+    ORG_SUMMARY_HEADERS,
+    export_rows,
+    stream_ascii_table,
+)
+
+# File extension per export format.
+FORMAT_EXTENSIONS = {
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+    "html": ".html",
+    "ascii": ".txt",
+}
+INDEX_FILENAME = "index.csv"
+INDEX_HEADERS = ORG_SUMMARY_HEADERS + ("Rows", "File", "Bytes")
+# Stem for rows without an organization.
+UNASSIGNED_STEM = "unassigned"
+
+
+@dataclass
+class OrgExport:
+    """One written organization file."""
+
+    organization: str
+    path: str
+    rows: int
+    bytes: int
+    counts: OrgCounts
+
+
+def partition_by_org(rows: RowSequence) -> Dict[str, RowSequence]:
+    """Group ``rows`` by organization in one pass (order kept per group)."""
+    if isinstance(rows, ColumnarRows):
+        return rows.partition_by_org()
+    groups: Dict[str, list] = {}
+    for row in rows:
+        groups.setdefault(row.organization, []).append(row)
+    return groups
+
+
+def org_filename_stem(organization: str) -> str:
+    """A filesystem-safe file name stem for ``organization``."""
+    stem = re.sub(r"[^\w.-]+", "_", organization.strip()).strip("._")
+    return stem or UNASSIGNED_STEM
+
+
+def _file_names(organizations: List[str], extension: str) -> Dict[str, str]:
+    """Unique file names, numbering orgs whose stems collide."""
+    names: Dict[str, str] = {}
+    used = set()
+    for organization in sorted(organizations, key=str.casefold):
+        stem = org_filename_stem(organization)
+        name, n = stem, 1
+        while name.casefold() in used:
+            n += 1
+            name = f"{stem}-{n}"
+        used.add(name.casefold())
+        names[organization] = name + extension
+    return names
+
+
+def export_by_org(
+    directory: str,
+    fmt: str,
+    rows: RowSequence,
+    ignored_keys: Optional[Container[str]] = None,
+    compression: Optional[str] = None,
+    max_workers: int = 4,
+) -> List[OrgExport]:
+    """Write one ``fmt`` file per organization into ``directory``.
+
+    The rows are partitioned once and the per-organization files are
+    written on a pool of ``max_workers`` threads (compression and Parquet
+    encoding release the GIL). ``INDEX_FILENAME`` lists each organization's
+    status counts, row count, file and size. Returns the exports, sorted by
+    organization; the first failed write is raised.
+    """
+    if fmt not in EXPORT_WRITERS and fmt != "ascii":
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    extension = FORMAT_EXTENSIONS[fmt]
+    if compression and fmt != "parquet":
+        extension += next(
+            ext for ext, codec in COMPRESSION_EXTENSIONS.items() if codec == compression
+        )
+    os.makedirs(directory, exist_ok=True)
+    partitions = partition_by_org(rows)
+    names = _file_names(list(partitions), extension)
+
+    def write(organization: str) -> OrgExport:
+        part = partitions[organization]
+        path = os.path.join(directory, names[organization])
+        if fmt == "ascii":
+            count, size = stream_ascii_table(
+                path, part, ignored_keys=ignored_keys, compression=compression
+            )
+        else:
+            count, size = export_rows(fmt, path, part, ignored_keys, compression)
+        counts = OrgAggregates.build(part, ignored_keys).by_org.get(
+            organization, OrgCounts()
+        )
+        return OrgExport(organization, path, count, size, counts)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(write, org) for org in names]
+        exports = [future.result() for future in futures]
+
+    write_org_index(os.path.join(directory, INDEX_FILENAME), exports)
+    return exports
+
+
+def write_org_index(filename: str, exports: List[OrgExport]) -> None:
+    """Write the per-organization index (``INDEX_HEADERS``) to CSV."""
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(INDEX_HEADERS)
+        for export in exports:
+            counts = export.counts
+            writer.writerow(
+                [
+                    export.organization,
+                    counts.ok,
+                    counts.missing_huntress,
+                    counts.missing_syncro,
+                    counts.ignored,
+                    export.rows,
+                    os.path.basename(export.path),
+                    export.bytes,
+                ]
+            )
@@ -1,15 +1,87 @@
 import csv
-from typing import List, Optional, Set
+import gzip
+import io
+import json
+import os
+import shlex
+import subprocess
+import sys
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from itertools import islice
+from typing import (
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 from const import STATUS_OK
-from services.comparison import ComparisonRow, row_key
+from services.aggregates import OrgAggregates
+from services.columnar import STATUS_TO_CODE, ColumnarRows
+from services.comparison import (
+    FLAG_LABELS,
+    ComparisonRow,
+    InventoryComparison,
+    PresenceRow,
+    RowSequence,
+    describe_flags,
+    row_key,
+)
+from services.diff import DriftReport
+from services.ignore_rules import IgnoreRules
+from utils.html_template import REPORT_HEAD, REPORT_TAIL
 
 # Constants
 HEADERS = ("Organization", "Syncro Asset", "Huntress Asset", "Status")
+ORG_SUMMARY_HEADERS = (
+    "Organization",
+    "OK",
+    "Missing in Huntress",
+    "Missing in Syncro",
+    "Ignored",
+)
+# Output compression chosen by file extension.
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+# Write buffer for streamed exports.
+STREAM_BUFFER_SIZE = 1 << 20
+# ASCII tables: rows joined per write, and the column width used when rows
+# cannot be pre-scanned (one-shot iterators) and no cap is given.
+ASCII_CHUNK_ROWS = 1024
+ASCII_DEFAULT_WIDTH = 40
+# Above this many rows the console table skips rich (which measures and lays
+# out the whole table before printing) for the streaming plain renderer.
+PLAIN_TABLE_THRESHOLD = 2000
+# Pager for --pager when $PAGER is unset (-R passes the ANSI colors through).
+DEFAULT_PAGER = "less -R"
+_ANSI_RESET = "\x1b[0m"
+_ANSI_HEADER = "\x1b[1;35m"
+_ANSI_OK = "\x1b[32m"
+_ANSI_ERROR = "\x1b[31m"
+_ANSI_NOTES = "\x1b[33m"
+_ANSI_DIM = "\x1b[2m"
+# Columns file exports add after HEADERS.
+EXTRA_HEADERS = ("Ignored", "Notes")
+DIFF_HEADERS = (
+    "Change",
+    "Key",
+    "Organization",
+    "Syncro Asset",
+    "Huntress Asset",
+    "Old Status",
+    "New Status",
+    "Old Organization",
+)
 
 console = Console()
 
@@ -40,75 +112,590 @@ def _values(row: ComparisonRow) -> tuple:
     return (row.organization, row.syncro_name, row.huntress_name, row.status)
 
 
-def _is_ignored(row: ComparisonRow, ignored_keys: Optional[Set[str]]) -> bool:
+def _extra_values(ignored: bool, flags: int) -> Tuple[str, str]:
+    """Ignored and Notes cells for a row."""
+    return ("yes" if ignored else "", describe_flags(flags))
+
+
+def _is_ignored(row: ComparisonRow, ignored_keys: Optional[Container[str]]) -> bool:
     return bool(ignored_keys) and row_key(row) in ignored_keys
 
 
+def _records(
+    rows: RowSequence, ignored_keys: Optional[Container[str]]
+) -> Iterator[Tuple[tuple, bool, int]]:
+    """Yield ``(display values, ignored, flags)`` per row.
+
+    ``ColumnarRows`` are read column-wise, without building row objects, and
+    their precomputed ``ignored`` bitmap wins over ``ignored_keys``.
+    """
+    if isinstance(rows, ColumnarRows):
+        if rows.ignored is not None:
+            ignored = map(bool, rows.ignored)
+        elif ignored_keys:
+            ignored = (key in ignored_keys for key in rows.keys)
+        else:
+            ignored = (False for _ in rows.keys)
+        return zip(rows.iter_values(), ignored, rows.flags)
+    return ((_values(row), _is_ignored(row, ignored_keys), row.flags) for row in rows)
+
+
+def compression_for(filename: str) -> Optional[str]:
+    """Compression implied by ``filename``'s extension (None for plain)."""
+    lowered = filename.lower()
+    for extension, compression in COMPRESSION_EXTENSIONS.items():
+        if lowered.endswith(extension):
+            return compression
+    return None
+
+
+class _ByteCounter(io.RawIOBase):
+    """Pass-through binary writer counting the bytes that reach ``raw``."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.count = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.raw.write(data)
+        self.count += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self.raw.flush()
+
+
+def _zstandard():
+    """The ``zstandard`` module, or a ``ValueError`` naming the package."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError(
+            "zstd compression needs the 'zstandard' package (pip install zstandard)"
+        )
+    return zstandard
+
+
+@contextmanager
+def _open_text_stream(destination: str, compression: Optional[str] = None):
+    """Yield ``(text stream, byte counter)`` for ``destination``.
+
+    ``"-"`` is stdout (left open). Output goes through a
+    ``STREAM_BUFFER_SIZE`` buffer and, optionally, a gzip or zstd compressor;
+    the counter sees the bytes actually written.
+    """
+    if compression is None:
+        compression = compression_for(destination)
+    if compression not in (None, "gzip", "zstd"):
+        raise ValueError(f"Unknown compression: {compression!r}")
+    with ExitStack() as stack:
+        if destination == "-":
+            raw = sys.stdout.buffer
+        else:
+            raw = stack.enter_context(open(destination, "wb"))
+        counter = _ByteCounter(raw)
+        buffered = io.BufferedWriter(counter, STREAM_BUFFER_SIZE)
+        # Runs last: push whatever the compressor / text layer left behind.
+        stack.callback(buffered.flush)
+        binary = buffered
+        if compression == "gzip":
+            binary = stack.enter_context(gzip.GzipFile(fileobj=buffered, mode="wb"))
+        elif compression == "zstd":
+            binary = stack.enter_context(
+                _zstandard().ZstdCompressor().stream_writer(buffered, closefd=False)
+            )
+        text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        try:
+            yield text, counter
+        finally:
+            # Flush into the binary layers without closing them (or stdout).
+            text.detach()
+
+
+@contextmanager
+def _open_text_input(source: str, compression: Optional[str] = None):
+    """Yield a text stream reading ``source``, decompressing gzip or zstd
+    (from the extension unless ``compression`` is given) as it reads."""
+    if compression is None:
+        compression = compression_for(source)
+    if compression not in (None, "gzip", "zstd"):
+        raise ValueError(f"Unknown compression: {compression!r}")
+    with ExitStack() as stack:
+        binary = stack.enter_context(open(source, "rb"))
+        if compression == "gzip":
+            binary = stack.enter_context(gzip.GzipFile(fileobj=binary, mode="rb"))
+        elif compression == "zstd":
+            binary = stack.enter_context(
+                _zstandard().ZstdDecompressor().stream_reader(binary)
+            )
+        yield stack.enter_context(
+            io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        )
+
+
+def stream_csv(
+    destination: str,
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]] = None,
+    compression: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Stream rows to CSV and return ``(rows, bytes)`` written.
+
+    ``rows`` may be any row iterable (a generator is consumed once, never
+    held in memory). ``destination`` ``"-"`` writes to stdout; ``.csv.gz`` /
+    ``.csv.zst`` (or ``compression="gzip"``/``"zstd"``) compress the output.
+    Unlike ``write_csv``, write errors propagate.
+    """
+    count = 0
+    with _open_text_stream(destination, compression) as (text, counter):
+        writer = csv.writer(text)
+        writer.writerow(HEADERS + EXTRA_HEADERS)
+        for values, ignored, flags in _records(rows, ignored_keys):
+            writer.writerow(values + _extra_values(ignored, flags))
+            count += 1
+    return count, counter.count
+
+
+def _json_records(
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]],
+) -> Iterator[Dict]:
+    """One JSON-ready dict per row: display values, key, ignored and flags."""
+    if isinstance(rows, ColumnarRows):
+        keyed = zip(_records(rows, ignored_keys), rows.keys)
+    else:
+        keyed = (
+            ((_values(row), _is_ignored(row, ignored_keys), row.flags), row_key(row))
+            for row in rows
+        )
+    for (values, ignored, flags), key in keyed:
+        organization, syncro, huntress, status = values
+        yield {
+            "organization": organization,
+            "syncro": syncro,
+            "huntress": huntress,
+            "status": status,
+            "key": key,
+            "matched": status == STATUS_OK,
+            "ignored": bool(ignored),
+            "flags": flags,
+            "notes": [label for flag, label in FLAG_LABELS if flags & flag],
+        }
+
+
+def stream_jsonl(
+    destination: str,
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]] = None,
+    compression: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Stream rows as JSON Lines (one object per row); see ``stream_csv``."""
+    count = 0
+    with _open_text_stream(destination, compression) as (text, counter):
+        for record in _json_records(rows, ignored_keys):
+            text.write(json.dumps(record, ensure_ascii=False))
+            text.write("\n")
+            count += 1
+    return count, counter.count
+
+
+def write_parquet(
+    destination: str,
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]] = None,
+    compression: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Write rows to a Parquet file and return ``(rows, bytes)``.
+
+    Organization and status are dictionary-encoded straight from the
+    ``ColumnarRows`` codes. ``compression`` is a Parquet codec name (snappy
+    by default). Needs the optional ``pyarrow`` package.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError(
+            "Parquet output needs the 'pyarrow' package (pip install pyarrow)"
+        )
+    if destination == "-":
+        raise ValueError("Parquet output cannot be written to stdout")
+
+    from services.columnar import STATUS_CODES
+
+    # The dictionary lists only the organizations these rows use.
+    store = ColumnarRows.from_rows(rows).compact_orgs()
+    if store.ignored is not None:
+        ignored = [bool(flag) for flag in store.ignored]
+    else:
+        ignored = [bool(ignored_keys) and key in ignored_keys for key in store.keys]
+    table = pa.table(
+        {
+            "organization": pa.DictionaryArray.from_arrays(
+                pa.array(store.org_codes, pa.uint32()), pa.array(store.orgs)
+            ),
+            "syncro": pa.array(store.syncro_names, pa.string()),
+            "huntress": pa.array(store.huntress_names, pa.string()),
+            "status": pa.DictionaryArray.from_arrays(
+                pa.array(store.status_codes, pa.uint8()), pa.array(STATUS_CODES)
+            ),
+            "key": pa.array(store.keys, pa.string()),
+            "ignored": pa.array(ignored, pa.bool_()),
+            "flags": pa.array(store.flags, pa.uint8()),
+        }
+    )
+    pq.write_table(table, destination, compression=compression or "snappy")
+    return len(store), os.path.getsize(destination)
+
+
+def _json_column(values) -> str:
+    """Compact JSON for one report column, safe inside a ``<script>``."""
+    return json.dumps(values, ensure_ascii=False, separators=(",", ":")).replace(
+        "</", "<\\/"
+    )
+
+
+def write_html(
+    destination: str,
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]] = None,
+    compression: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Write a self-contained HTML report and return ``(rows, bytes)``.
+
+    The page (``utils.html_template``) has summary cards, a per-organization
+    breakdown and a searchable, sortable table that only draws the rows in
+    view. Rows are embedded as columnar JSON: organizations, statuses and
+    notes are dictionary-encoded, names are plain string arrays.
+    """
+    from services.columnar import STATUS_CODES
+
+    # Only the organizations these rows use: a per-organization report must
+    # not name other clients.
+    store = ColumnarRows.from_rows(rows).compact_orgs()
+    if store.ignored is not None:
+        ignored = list(store.ignored)
+    else:
+        ignored = [
+            int(bool(ignored_keys) and key in ignored_keys) for key in store.keys
+        ]
+    note_codes: Dict[int, int] = {}
+    notes = [note_codes.setdefault(flags, len(note_codes)) for flags in store.flags]
+
+    columns = (
+        ("generated", datetime.now().isoformat(sep=" ", timespec="seconds")),
+        ("ok", STATUS_CODES.index(STATUS_OK)),
+        ("orgs", store.orgs),
+        ("statuses", list(STATUS_CODES)),
+        ("notes", [describe_flags(flags) for flags in note_codes]),
+        ("org", list(store.org_codes)),
+        ("status", list(store.status_codes)),
+        ("syncro", store.syncro_names),
+        ("huntress", store.huntress_names),
+        ("ignored", ignored),
+        ("note", notes),
+    )
+    with _open_text_stream(destination, compression) as (text, counter):
+        text.write(REPORT_HEAD)
+        text.write("{")
+        for n, (name, values) in enumerate(columns):
+            text.write(f'{"," if n else ""}"{name}":{_json_column(values)}\n')
+        text.write("}")
+        text.write(REPORT_TAIL)
+    return len(store), counter.count
+
+
+# Row writers sharing the ``(destination, rows, ignored_keys, compression)
+# -> (rows, bytes)`` interface, by ``--format`` name.
+EXPORT_WRITERS = {
+    "csv": stream_csv,
+    "jsonl": stream_jsonl,
+    "parquet": write_parquet,
+    "html": write_html,
+}
+
+
+def export_rows(
+    fmt: str,
+    destination: str,
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]] = None,
+    compression: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Write ``rows`` with the ``EXPORT_WRITERS`` entry for ``fmt``."""
+    try:
+        writer = EXPORT_WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    return writer(destination, rows, ignored_keys, compression)
+
+
 def write_csv(
     filename: str,
-    rows: List[ComparisonRow],
-    ignored_keys: Optional[Set[str]] = None,
+    rows: RowSequence,
+    ignored_keys: Optional[Container[str]] = None,
 ) -> None:
-    """Write results to CSV file (with an Ignored column)."""
+    """Write results to CSV file (with Ignored and Notes columns)."""
     try:
-        with open(filename, "w", newline="", encoding="utf-8") as csvf:
-            writer = csv.writer(csvf)
-            writer.writerow(HEADERS + ("Ignored",))
-            for row in rows:
-                flag = "yes" if _is_ignored(row, ignored_keys) else ""
-                writer.writerow(_values(row) + (flag,))
+        stream_csv(filename, rows, ignored_keys)
     except IOError as e:
         console.print(f"[red]Failed to write CSV: {e}[/red]")
 
 
+def _columnar_widths(rows: ColumnarRows) -> List[int]:
+    """ASCII table column widths read off the columns (no row values built).
+
+    Organizations, statuses and notes come from the distinct codes, so only
+    the two name columns are scanned.
+    """
+    from services.columnar import STATUS_CODES
+
+    return [
+        max((len(rows.orgs[code]) for code in set(rows.org_codes)), default=0),
+        max(map(len, rows.syncro_names), default=0),
+        max(map(len, rows.huntress_names), default=0),
+        max((len(STATUS_CODES[code]) for code in set(rows.status_codes)), default=0),
+        0,  # "yes" never exceeds the "Ignored" header
+        max((len(describe_flags(flags)) for flags in set(rows.flags)), default=0),
+    ]
+
+
+def _content_widths(
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]],
+) -> Optional[List[int]]:
+    """Widest value per ``HEADERS + EXTRA_HEADERS`` column, headers excluded.
+
+    Read off the columns of a ``ColumnarRows`` store, else found by one
+    streaming pre-pass. None for a one-shot iterator, which cannot be read
+    twice.
+    """
+    if isinstance(rows, ColumnarRows):
+        return _columnar_widths(rows)
+    if iter(rows) is rows:
+        return None
+    widths = [0] * (len(HEADERS) + len(EXTRA_HEADERS))
+    for values, ignored, flags in _records(rows, ignored_keys):
+        cells = values + _extra_values(ignored, flags)
+        widths = [max(w, len(cell)) for w, cell in zip(widths, cells)]
+    return widths
+
+
+def _ascii_widths(
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    ignored_keys: Optional[Container[str]],
+    max_width: Optional[int],
+) -> List[int]:
+    """Column widths for ``stream_ascii_table`` (see there)."""
+    headers = HEADERS + EXTRA_HEADERS
+    widths = _content_widths(rows, ignored_keys)
+    if widths is None:
+        # A one-shot iterator: use the cap for every column.
+        widths = [max_width or ASCII_DEFAULT_WIDTH] * len(headers)
+    widths = [max(w, len(h)) for h, w in zip(headers, widths)]
+    if max_width:
+        widths = [min(w, max(max_width, len(h))) for h, w in zip(headers, widths)]
+    return widths
+
+
+def _fit(value: str, width: int) -> str:
+    """Pad ``value`` to ``width``, truncating it (ending in ``~``) if longer."""
+    if len(value) > width:
+        return value[: width - 1] + "~"
+    return value.ljust(width)
+
+
+def stream_ascii_table(
+    destination: str,
+    rows: Union[RowSequence, Iterable[ComparisonRow]],
+    syncro_count: int = 0,
+    huntress_count: int = 0,
+    ignored_keys: Optional[Container[str]] = None,
+    widths: Optional[List[int]] = None,
+    max_width: Optional[int] = None,
+    compression: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Write an aligned ASCII table with constant extra memory.
+
+    Column widths are ``widths`` when given, else read off a
+    ``ColumnarRows`` store's columns, else found by a streaming pre-pass
+    over re-iterable rows. A one-shot iterator, which cannot be pre-scanned,
+    gets ``max_width`` (or ``ASCII_DEFAULT_WIDTH``) for every column.
+    ``max_width`` also caps computed widths; longer cells are truncated.
+    Lines are written in ``ASCII_CHUNK_ROWS`` chunks through the buffered
+    stream (``"-"`` is stdout). Returns ``(rows, bytes)`` written.
+    """
+    headers = HEADERS + EXTRA_HEADERS
+    if widths is None:
+        widths = _ascii_widths(rows, ignored_keys, max_width)
+    count = 0
+    with _open_text_stream(destination, compression) as (text, counter):
+        text.write("Asset Counts\n")
+        text.write(f"  Syncro:   {syncro_count}\n")
+        text.write(f"  Huntress: {huntress_count}\n\n")
+        text.write(" | ".join(_fit(h, w) for h, w in zip(headers, widths)) + "\n")
+        text.write("-+-".join("-" * w for w in widths) + "\n")
+
+        chunk: List[str] = []
+        for values, ignored, flags in _records(rows, ignored_keys):
+            cells = values + _extra_values(ignored, flags)
+            chunk.append(" | ".join(_fit(c, w) for c, w in zip(cells, widths)) + "\n")
+            count += 1
+            if len(chunk) >= ASCII_CHUNK_ROWS:
+                text.write("".join(chunk))
+                chunk = []
+        text.write("".join(chunk))
+    return count, counter.count
+
+
 def write_ascii_table(
     filename: str,
-    rows: List[ComparisonRow],
+    rows: RowSequence,
     syncro_count: int = 0,
     huntress_count: int = 0,
-    ignored_keys: Optional[Set[str]] = None,
+    ignored_keys: Optional[Container[str]] = None,
 ) -> None:
     """Write results to ASCII table file."""
     try:
-        headers = HEADERS + ("Ignored",)
-        table_rows = [
-            _values(row) + ("yes" if _is_ignored(row, ignored_keys) else "",)
-            for row in rows
-        ]
+        stream_ascii_table(filename, rows, syncro_count, huntress_count, ignored_keys)
+    except IOError as e:
+        console.print(f"[red]Failed to write ASCII table: {e}[/red]")
 
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("Asset Counts\n")
-            f.write(f"  Syncro:   {syncro_count}\n")
-            f.write(f"  Huntress: {huntress_count}\n\n")
 
-            # Simple column width calc
-            widths = (
-                [max(len(str(val)) for val in col) for col in zip(headers, *table_rows)]
-                if table_rows
-                else [len(h) for h in headers]
+@contextmanager
+def _console_stream(
+    pager: bool, file: Optional[TextIO] = None
+) -> Iterator[Tuple[TextIO, bool]]:
+    """Yield ``(stream, is_terminal)`` for the plain console table.
+
+    With ``pager`` and a terminal on stdout, rows are fed to ``$PAGER``
+    (default ``DEFAULT_PAGER``) as they are rendered; quitting the pager
+    early just stops the output.
+    """
+    out = sys.stdout if file is None else file
+    terminal = out.isatty()
+    process = None
+    if pager and terminal:
+        command = shlex.split(os.environ.get("PAGER") or DEFAULT_PAGER)
+        try:
+            process = subprocess.Popen(
+                command, stdin=subprocess.PIPE, encoding="utf-8", errors="replace"
             )
-            widths = [max(w, len(h)) for h, w in zip(headers, widths)]
+        except OSError as e:
+            console.print(f"[yellow]Pager unavailable ({e}), printing[/yellow]")
+    if process is None:
+        yield out, terminal
+        out.flush()
+        return
+    try:
+        yield process.stdin, True
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        process.wait()
 
-            header = " | ".join(h.ljust(w) for h, w in zip(headers, widths))
-            separator = "-+-".join("-" * w for w in widths)
 
-            f.write(f"{header}\n{separator}\n")
-            for row in table_rows:
-                line = " | ".join(str(val).ljust(w) for val, w in zip(row, widths))
-                f.write(f"{line}\n")
+def _ansi_line(cells: List[str], ignored: bool, status: str) -> str:
+    if ignored:
+        return _ANSI_DIM + " | ".join(cells) + _ANSI_RESET
+    color = _ANSI_OK if status == STATUS_OK else _ANSI_ERROR
+    cells = cells[:]
+    cells[3] = color + cells[3] + _ANSI_RESET
+    if len(cells) > 4:
+        cells[4] = _ANSI_NOTES + cells[4] + _ANSI_RESET
+    return " | ".join(cells)
 
-    except IOError as e:
-        console.print(f"[red]Failed to write ASCII table: {e}[/red]")
+
+def print_plain_table(
+    rows: RowSequence,
+    use_color: bool = True,
+    syncro_count: int = 0,
+    huntress_count: int = 0,
+    ignored_keys: Optional[Container[str]] = None,
+    limit: Optional[int] = None,
+    pager: bool = False,
+    max_width: Optional[int] = None,
+    file: Optional[TextIO] = None,
+) -> int:
+    """Print the results table as plain text, streaming it row by row.
+
+    The fast path for large results: widths are precomputed (see
+    ``_content_widths``), rows are formatted straight to the stream in
+    ``ASCII_CHUNK_ROWS`` chunks, and ANSI colors are used only on a terminal.
+    ``limit`` caps the rows printed; ``pager`` pipes the table to a pager.
+    Returns the number of rows printed.
+    """
+    content = _content_widths(rows, ignored_keys)
+    show_notes = bool(content[-1])
+    headers = HEADERS + (EXTRA_HEADERS[-1:] if show_notes else ())
+    content = content[: len(HEADERS)] + (content[-1:] if show_notes else [])
+    widths = [max(w, len(h)) for h, w in zip(headers, content)]
+    if max_width:
+        widths = [min(w, max(max_width, len(h))) for h, w in zip(headers, widths)]
+
+    printed = 0
+    with _console_stream(pager, file) as (out, terminal):
+        color = use_color and terminal
+        header = " | ".join(_fit(h, w) for h, w in zip(headers, widths))
+        out.write((_ANSI_HEADER + header + _ANSI_RESET if color else header) + "\n")
+        out.write("-+-".join("-" * w for w in widths) + "\n")
+
+        chunk: List[str] = []
+        for values, ignored, flags in islice(_records(rows, ignored_keys), limit):
+            cells = values + ((describe_flags(flags),) if show_notes else ())
+            cells = [_fit(c, w) for c, w in zip(cells, widths)]
+            line = _ansi_line(cells, ignored, values[3]) if color else " | ".join(cells)
+            chunk.append(line + "\n")
+            printed += 1
+            if len(chunk) >= ASCII_CHUNK_ROWS:
+                out.write("".join(chunk))
+                chunk = []
+        out.write("".join(chunk))
+
+        remaining = len(rows) - printed
+        if remaining > 0:
+            out.write(f"... {remaining} more rows (raise --limit or use -o)\n")
+        out.write(f"\nAsset Counts\n  Syncro:   {syncro_count}\n")
+        out.write(f"  Huntress: {huntress_count}\n")
+    return printed
 
 
 def print_colored_table(
-    rows: List[ComparisonRow],
+    rows: RowSequence,
     use_color: bool = True,
     syncro_count: int = 0,
     huntress_count: int = 0,
-    ignored_keys: Optional[Set[str]] = None,
+    ignored_keys: Optional[Container[str]] = None,
+    limit: Optional[int] = None,
+    pager: bool = False,
 ) -> None:
-    """Print styled table to console using rich."""
+    """Print styled table to console using rich.
+
+    A Notes column (duplicates / stale entries) is added when any row has one.
+    More than ``PLAIN_TABLE_THRESHOLD`` rows, or ``pager``, switch to
+    ``print_plain_table``; ``limit`` caps the rows printed.
+    """
+    if pager or len(rows) > PLAIN_TABLE_THRESHOLD:
+        print_plain_table(
+            rows,
+            use_color,
+            syncro_count,
+            huntress_count,
+            ignored_keys=ignored_keys,
+            limit=limit,
+            pager=pager,
+        )
+        return
+
+    records = list(islice(_records(rows, ignored_keys), limit))
+    show_notes = any(flags for _, _, flags in records)
     if not use_color:
         # Fallback for no-color request
         table = Table(show_header=True, header_style="bold")
@@ -117,28 +704,266 @@ def print_colored_table(
 
     for header in HEADERS:
         table.add_column(header)
+    if show_notes:
+        table.add_column("Notes", style="yellow" if use_color else None)
 
-    for row in rows:
-        ignored = _is_ignored(row, ignored_keys)
-        status_style = "green" if row.status == STATUS_OK else "red"
+    for (organization, syncro, huntress, status), ignored, flags in records:
+        status_style = "green" if status == STATUS_OK else "red"
         if not use_color:
             status_style = None
 
         status_cell = (
-            f"[{status_style}]{row.status}[/{status_style}]"
-            if status_style
-            else row.status
+            f"[{status_style}]{status}[/{status_style}]" if status_style else status
         )
         row_style = "dim" if ignored else None
+        notes = (describe_flags(flags),) if show_notes else ()
         table.add_row(
-            row.organization,
-            row.syncro_name,
-            row.huntress_name,
+            organization,
+            syncro,
+            huntress,
             status_cell,
+            *notes,
             style=row_style,
         )
 
     console.print(table)
+    if len(rows) > len(records):
+        console.print(
+            f"... {len(rows) - len(records)} more rows (raise --limit or use -o)"
+        )
     console.print("\n[bold]Asset Counts[/bold]")
     console.print(f"  Syncro:   {syncro_count}")
     console.print(f"  Huntress: {huntress_count}")
+
+
+def presence_headers(comparison: InventoryComparison) -> List[str]:
+    """Columns of an N-way table: one per source between hostname and status."""
+    return ["Organization", "Hostname", *comparison.sources, "Status"]
+
+
+def _presence_values(comparison: InventoryComparison, row: PresenceRow) -> List[str]:
+    return [row.organization, row.key, *row.names, comparison.status(row)]
+
+
+def write_presence_csv(
+    filename: str,
+    comparison: InventoryComparison,
+    rows: Optional[List[PresenceRow]] = None,
+) -> None:
+    """Write an N-way comparison (``rows`` defaults to all of them) to CSV."""
+    try:
+        with open(filename, "w", newline="", encoding="utf-8") as csvf:
+            writer = csv.writer(csvf)
+            writer.writerow(presence_headers(comparison))
+            for row in comparison.rows if rows is None else rows:
+                writer.writerow(_presence_values(comparison, row))
+    except IOError as e:
+        console.print(f"[red]Failed to write CSV: {e}[/red]")
+
+
+def print_presence_table(
+    comparison: InventoryComparison,
+    rows: Optional[List[PresenceRow]] = None,
+    use_color: bool = True,
+) -> None:
+    """Print an N-way comparison, then each source's host count."""
+    table = Table(
+        show_header=True, header_style="bold magenta" if use_color else "bold"
+    )
+    for header in presence_headers(comparison):
+        table.add_column(header)
+    for row in comparison.rows if rows is None else rows:
+        *values, status = _presence_values(comparison, row)
+        if use_color:
+            style = "green" if status == STATUS_OK else "red"
+            status = f"[{style}]{status}[/{style}]"
+        table.add_row(*values, status)
+
+    console.print(table)
+    console.print("\n[bold]Asset Counts[/bold]")
+    width = max((len(name) for name in comparison.counts), default=0) + 1
+    for name, count in comparison.counts.items():
+        console.print(f"  {name + ':':<{width}} {count}")
+
+
+def print_duplicates(duplicates: Dict[str, Dict[str, list]]) -> None:
+    """Print every duplicated hostname with its record count and ids."""
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Source")
+    table.add_column("Hostname")
+    table.add_column("Records", justify="right")
+    table.add_column("IDs")
+    for source, keys in duplicates.items():
+        for key in sorted(keys):
+            ids = keys[key]
+            table.add_row(
+                source.capitalize(),
+                key,
+                str(len(ids)),
+                ", ".join(str(i) for i in ids if i is not None),
+            )
+    console.print(table)
+
+
+def print_ignore_hits(rules: IgnoreRules) -> None:
+    """Print how many rows each ignore rule matched (expired rules marked)."""
+    if not rules.rules:
+        return
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Ignore Rule")
+    table.add_column("Expires")
+    table.add_column("Hits", justify="right")
+    for rule in rules.rules:
+        expires = rule.expires.isoformat() if rule.expires else ""
+        table.add_row(rule.pattern, expires, str(rule.hits))
+    console.print(table)
+
+
+def print_run_stats(stats: Dict) -> None:
+    """Print a result's timing / profiling counters, one per line."""
+    if not stats:
+        return
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Stat")
+    table.add_column("Value", justify="right")
+    for name, value in stats.items():
+        table.add_row(name, str(value))
+    console.print(table)
+
+
+def print_org_summary(
+    aggregates: OrgAggregates,
+    use_color: bool = True,
+    include: Optional[Set[str]] = None,
+) -> None:
+    """Print one line of status counts per organization, plus totals.
+
+    Organizations in ``aggregates.excluded`` (or outside ``include``, when
+    given) are left out.
+    """
+    table = Table(
+        show_header=True, header_style="bold magenta" if use_color else "bold"
+    )
+    for header in ORG_SUMMARY_HEADERS:
+        table.add_column(
+            header, justify="left" if header == "Organization" else "right"
+        )
+
+    missing_style = "red" if use_color else None
+    for organization in sorted(aggregates.by_org, key=str.casefold):
+        if organization in aggregates.excluded:
+            continue
+        if include and organization not in include:
+            continue
+        counts = aggregates.by_org[organization]
+        problems = counts.missing_huntress or counts.missing_syncro
+        table.add_row(
+            organization or "(none)",
+            str(counts.ok),
+            str(counts.missing_huntress),
+            str(counts.missing_syncro),
+            str(counts.ignored),
+            style=missing_style if problems else None,
+        )
+
+    totals = aggregates.totals(include)
+    table.add_section()
+    table.add_row(
+        "Total",
+        str(totals.ok),
+        str(totals.missing_huntress),
+        str(totals.missing_syncro),
+        str(totals.ignored),
+        style="bold",
+    )
+    console.print(table)
+
+
+def read_csv(filename: str) -> ColumnarRows:
+    """Read rows back from a CSV written by ``write_csv`` (optionally
+    gzip / zstd compressed, by extension).
+
+    Raises ``ValueError`` naming the line for a wrong header, a short row or
+    an unknown status.
+    """
+    rows = ColumnarRows()
+    with _open_text_input(filename) as csvf:
+        reader = csv.reader(csvf)
+        header = next(reader, None)
+        if header is None or tuple(header[: len(HEADERS)]) != HEADERS:
+            raise ValueError(f"{filename} is not a comparison CSV export")
+        notes_at = header.index("Notes") if "Notes" in header else None
+        for record in reader:
+            if not record:
+                continue
+            if len(record) < len(HEADERS):
+                raise ValueError(
+                    f"{filename}, line {reader.line_num}: expected at least "
+                    f"{len(HEADERS)} columns, got {len(record)}"
+                )
+            organization, syncro, huntress, status = record[: len(HEADERS)]
+            if status not in STATUS_TO_CODE:
+                raise ValueError(
+                    f"{filename}, line {reader.line_num}: unknown status {status!r}"
+                )
+            flags = 0
+            if notes_at is not None and notes_at < len(record):
+                notes = record[notes_at]
+                flags = sum(bit for bit, label in FLAG_LABELS if label in notes)
+            rows.append(syncro, huntress, status, organization, flags=flags)
+    return rows
+
+
+def _diff_records(report: DriftReport) -> Iterator[tuple]:
+    """Project drift changes to DIFF_HEADERS-ordered values."""
+    for change in report.changes:
+        current = change.after or change.before
+        yield (
+            change.label,
+            change.key,
+            current[0],
+            current[1],
+            current[2],
+            change.before[3] if change.before else "",
+            change.after[3] if change.after else "",
+            change.before[0] if change.before else "",
+        )
+
+
+def write_diff_csv(filename: str, report: DriftReport) -> None:
+    """Write drift changes to a CSV file."""
+    with open(filename, "w", newline="", encoding="utf-8") as csvf:
+        writer = csv.writer(csvf)
+        writer.writerow(DIFF_HEADERS)
+        writer.writerows(_diff_records(report))
+
+
+def write_diff_json(filename: str, report: DriftReport) -> None:
+    """Write drift changes and counts to a JSON file."""
+    keys = [h.lower().replace(" ", "_") for h in DIFF_HEADERS]
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "counts": report.counts(),
+                "changes": [dict(zip(keys, rec)) for rec in _diff_records(report)],
+            },
+            f,
+        )
+
+
+def print_diff_table(report: DriftReport, use_color: bool = True) -> None:
+    """Print drift changes and a per-kind summary to the console."""
+    table = Table(
+        show_header=True, header_style="bold magenta" if use_color else "bold"
+    )
+    for header in DIFF_HEADERS:
+        table.add_column(header)
+    styles = {"appeared": "green", "disappeared": "red"}
+    for record in _diff_records(report):
+        style = styles.get(record[0], "yellow") if use_color else None
+        table.add_row(*record, style=style)
+
+    console.print(table)
+    console.print("\n[bold]Changes[/bold]")
+    for kind, count in report.counts().items():
+        console.print(f"  {kind.capitalize()}: {count}")
@@ -0,0 +1,188 @@
+"""Export comparison runs to an indexed SQLite database for ad-hoc queries."""
+
+import json
+import sqlite3
+from typing import Container, Dict, Optional
+
+from services.columnar import STATUS_CODES, ColumnarRows
+from services.comparison import (
+    ComparisonResult,
+    describe_flags,
+    extract_org,
+    normalize,
+)
+
+# Each export appends a run; every other table is keyed by ``run_id`` and
+# the ``latest_*`` views select the newest run. Indexes lead with ``run_id``
+# so per-run filters and GROUP BYs on organization / status / key are
+# index lookups.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    exported_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
+    syncro_count INTEGER NOT NULL,
+    huntress_count INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    stats TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rows (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    organization TEXT NOT NULL,
+    syncro_name TEXT NOT NULL,
+    huntress_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    key TEXT NOT NULL,
+    ignored INTEGER NOT NULL,
+    flags INTEGER NOT NULL,
+    notes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rows_org ON rows (run_id, organization);
+CREATE INDEX IF NOT EXISTS idx_rows_status ON rows (run_id, status, organization);
+CREATE INDEX IF NOT EXISTS idx_rows_key ON rows (run_id, key);
+
+CREATE TABLE IF NOT EXISTS syncro_assets (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    id INTEGER,
+    name TEXT,
+    key TEXT,
+    customer_id INTEGER,
+    organization TEXT NOT NULL,
+    last_seen TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_syncro_assets_key ON syncro_assets (run_id, key);
+CREATE INDEX IF NOT EXISTS idx_syncro_assets_org
+    ON syncro_assets (run_id, organization);
+
+CREATE TABLE IF NOT EXISTS huntress_agents (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    id INTEGER,
+    hostname TEXT,
+    key TEXT,
+    organization_id INTEGER,
+    last_callback_at TEXT,
+    last_survey_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_huntress_agents_key ON huntress_agents (run_id, key);
+CREATE INDEX IF NOT EXISTS idx_huntress_agents_org
+    ON huntress_agents (run_id, organization_id);
+
+CREATE VIEW IF NOT EXISTS latest_rows AS
+    SELECT * FROM rows WHERE run_id = (SELECT MAX(id) FROM runs);
+CREATE VIEW IF NOT EXISTS latest_syncro_assets AS
+    SELECT * FROM syncro_assets WHERE run_id = (SELECT MAX(id) FROM runs);
+CREATE VIEW IF NOT EXISTS latest_huntress_agents AS
+    SELECT * FROM huntress_agents WHERE run_id = (SELECT MAX(id) FROM runs);
+"""
+
+
+def _scalar(value):
+    """SQLite-storable form of a projected API field (nested values as JSON)."""
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def export_sqlite(
+    path: str,
+    result: ComparisonResult,
+    ignored_keys: Optional[Container[str]] = None,
+) -> Dict[str, int]:
+    """Append ``result`` to the SQLite database at ``path`` as a new run.
+
+    Writes every row (with its ``ignored`` state, so queries filter on it),
+    the source assets and agents projected to the fields the comparison
+    reads (``api.decoding``) plus their normalized keys, and the run's
+    metadata. All inserts are ``executemany`` batches in one transaction.
+    Returns the run id and the number of records written per table.
+    """
+    rows = ColumnarRows.from_rows(result.rows)
+    if rows.ignored is not None:
+        ignored = rows.ignored
+    else:
+        ignored = [bool(ignored_keys) and key in ignored_keys for key in rows.keys]
+    notes = {flags: describe_flags(flags) for flags in set(rows.flags)}
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(_SCHEMA)
+        with conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (created_at, syncro_count, huntress_count,"
+                " row_count, stats) VALUES (?, ?, ?, ?, ?)",
+                (
+                    result.created_at,
+                    result.syncro_count,
+                    result.huntress_count,
+                    len(rows),
+                    json.dumps(result.stats),
+                ),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        rows.orgs[org],
+                        syncro,
+                        huntress,
+                        STATUS_CODES[status],
+                        key,
+                        int(bool(flag)),
+                        flags,
+                        notes[flags],
+                    )
+                    for org, syncro, huntress, status, key, flag, flags in zip(
+                        rows.org_codes,
+                        rows.syncro_names,
+                        rows.huntress_names,
+                        rows.status_codes,
+                        rows.keys,
+                        ignored,
+                        rows.flags,
+                    )
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO syncro_assets VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        _scalar(asset.get("id")),
+                        asset.get("name"),
+                        normalize(asset.get("name") or ""),
+                        _scalar(asset.get("customer_id")),
+                        extract_org(asset),
+                        _scalar(asset.get("last_seen")),
+                        _scalar(asset.get("updated_at")),
+                    )
+                    for asset in result.syncro_assets
+                    if isinstance(asset, dict)
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO huntress_agents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        _scalar(agent.get("id")),
+                        agent.get("hostname"),
+                        normalize(agent.get("hostname") or ""),
+                        _scalar(agent.get("organization_id")),
+                        _scalar(agent.get("last_callback_at")),
+                        _scalar(agent.get("last_survey_at")),
+                    )
+                    for agent in result.huntress_agents
+                    if isinstance(agent, dict)
+                ),
+            )
+    finally:
+        conn.close()
+    return {
+        "run_id": run_id,
+        "rows": len(rows),
+        "syncro_assets": len(result.syncro_assets),
+        "huntress_agents": len(result.huntress_agents),
+    }